@@ -22,19 +22,51 @@
 # THE SOFTWARE.
 #
 import logging
+import sys
+from importlib import import_module
 
-from .adapter import Adapter, FakeAdapter
+from .adapter import Adapter, AdapterLock, FakeAdapter
+from .socket import SocketAdapter
 
 log = logging.getLogger(__name__)
 log.addHandler(logging.NullHandler())
 
-try:
-    from pymeasure.adapters.visa import VISAAdapter
-except ImportError:
-    log.warning("PyVISA library could not be loaded")
+# The adapters that depend on PyVISA, PySerial or asyncio are imported when
+# they are first used, since importing those libraries is slow
+_LAZY = {
+    'VISAAdapter': '.visa',
+    'SerialAdapter': '.serial',
+    'PrologixAdapter': '.prologix',
+    'AsyncAdapter': '.asynchronous',
+    'ThreadedAdapter': '.asynchronous',
+    'AsyncSerialAdapter': '.asynchronous',
+    'AsyncVISAAdapter': '.asynchronous',
+    'AsyncTCPAdapter': '.asynchronous',
+}
 
-try:
-    from pymeasure.adapters.serial import SerialAdapter
-    from pymeasure.adapters.prologix import PrologixAdapter
-except ImportError:
-    log.warning("PySerial library could not be loaded")
+
+if sys.version_info < (3, 7):
+    # Module attributes can only be looked up lazily from Python 3.7, and
+    # the asynchronous adapters require it
+    try:
+        from .visa import VISAAdapter
+    except ImportError:
+        log.warning("PyVISA library could not be loaded")
+
+    try:
+        from .serial import SerialAdapter
+        from .prologix import PrologixAdapter
+    except ImportError:
+        log.warning("PySerial library could not be loaded")
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        value = getattr(import_module(_LAZY[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError("module '%s' has no attribute '%s'" % (__name__, name))
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY))
@@ -22,18 +22,136 @@
 # THE SOFTWARE.
 #
 
+import threading
+import time
+
 import numpy as np
 from copy import copy
 
 
+def parse_values(response, separator=',', cast=float):
+    """ Returns a list of the values in the response of an instrument
+
+    :param response: The response string
+    :param separator: A separator character to split the string into a list
+    :param cast: A type to cast the result
+    :returns: A list of the desired type, or strings where the casting fails
+    """
+    results = str(response).strip()
+    results = results.split(separator)
+    for i, result in enumerate(results):
+        try:
+            results[i] = cast(result)
+        except Exception:
+            pass  # Keep as string
+    return results
+
+
+class AdapterLock(object):
+    """ A re-entrant lock that serializes the communication over a
+    connection, so that a command and its response are not interleaved with
+    those of another thread. A thread that holds the lock can acquire it
+    again, so a sequence of queries can be made atomic.
+
+    .. code-block:: python
+
+        with adapter.lock:
+            adapter.write("TRIG")
+            data = adapter.binary_values("DATA?")
+
+    When :attr:`timed` is True, the lock records how often it is acquired
+    and how long threads wait for it, to find instruments that are a
+    bottleneck for parallel threads.
+
+    :param timed: Whether to record the time spent waiting for the lock
+    """
+
+    def __init__(self, timed=False):
+        self._lock = threading.RLock()
+        self.timed = timed
+        self.reset()
+
+    def reset(self):
+        """ Resets the recorded acquisitions and wait times """
+        self.acquisitions = 0
+        self.contentions = 0
+        self.total_wait = 0.
+        self.max_wait = 0.
+
+    @property
+    def mean_wait(self):
+        """ The mean time in seconds spent waiting for the lock """
+        if self.acquisitions == 0:
+            return 0.
+        return self.total_wait / self.acquisitions
+
+    def acquire(self, blocking=True, timeout=-1):
+        """ Acquires the lock, and returns whether it was acquired
+
+        :param blocking: Whether to wait for the lock
+        :param timeout: Maximum time in seconds to wait, or -1 for no limit
+        """
+        if not self.timed:
+            return self._lock.acquire(blocking, timeout)
+        wait = 0.
+        acquired = self._lock.acquire(False)
+        if not acquired and blocking:
+            start = time.perf_counter()
+            acquired = self._lock.acquire(True, timeout)
+            wait = time.perf_counter() - start
+        if acquired:
+            # The counters are only changed by the thread holding the lock
+            self.acquisitions += 1
+            if wait:
+                self.contentions += 1
+                self.total_wait += wait
+                self.max_wait = max(self.max_wait, wait)
+        return acquired
+
+    def release(self):
+        """ Releases the lock """
+        self._lock.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *args):
+        self._lock.release()
+
+    def __repr__(self):
+        return "<AdapterLock(acquisitions=%d,contentions=%d,mean_wait=%g)>" % (
+            self.acquisitions, self.contentions, self.mean_wait)
+
+
 class Adapter(object):
     """ Base class for Adapter child classes, which adapt between the Instrument 
     object and the connection, to allow flexible use of different connection 
     techniques.
 
+    The queries of an adapter hold its :attr:`lock` between writing the
+    command and reading the response, so that an instrument can be shared
+    by several threads, such as a measurement and a status poller.
+
     This class should only be inhereted from.
     """
 
+    @property
+    def lock(self):
+        """ The :class:`.AdapterLock` that serializes the communication over
+        the connection, which is created when it is first used. Adapters that
+        share a connection should share their lock, by assigning it.
+        """
+        lock = self.__dict__.get('_lock')
+        if lock is None:
+            # setdefault is atomic, so threads can not create different locks
+            lock = self.__dict__.setdefault('_lock', AdapterLock())
+        return lock
+
+    @lock.setter
+    def lock(self, lock):
+        self._lock = lock
+
     def write(self, command):
         """ Writes a command to the instrument
 
@@ -48,8 +166,9 @@ class Adapter(object):
         :param command: SCPI command string to be sent to the instrument
         :returns: String ASCII response of the instrument
         """
-        self.write(command)
-        return self.read()
+        with self.lock:
+            self.write(command)
+            return self.read()
 
     def read(self):
         """ Reads until the buffer is empty and returns the resulting
@@ -68,14 +187,7 @@ class Adapter(object):
         :param cast: A type to cast the result
         :returns: A list of the desired type, or strings where the casting fails
         """
-        results = str(self.ask(command)).strip()
-        results = results.split(separator)
-        for i, result in enumerate(results):
-            try:
-                results[i] = cast(result)
-            except Exception:
-                pass  # Keep as string
-        return results
+        return parse_values(self.ask(command), separator, cast)
 
     def binary_values(self, command, header_bytes=0, dtype=np.float32):
         """ Returns a numpy array from a query for binary data 
@@ -112,16 +224,18 @@ class FakeAdapter(Adapter):
         """ Returns the last commands given after the
         last read call.
         """
-        result = copy(self._buffer)
-        # Reset the buffer
-        self._buffer = ""
+        with self.lock:
+            result = copy(self._buffer)
+            # Reset the buffer
+            self._buffer = ""
         return result
 
     def write(self, command):
         """ Writes the command to a buffer, so that it can
         be read back.
         """
-        self._buffer += command
+        with self.lock:
+            self._buffer += command
 
     def __repr__(self):
         return "<FakeAdapter>"
@@ -0,0 +1,328 @@
+#
+# This file is part of the PyMeasure package.
+#
+# Copyright (c) 2013-2017 PyMeasure Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+import numpy as np
+
+from .adapter import parse_values
+from .socket import ResponseBuffer, configure_socket
+
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+
+class AsyncAdapter(object):
+    """ Base class of the adapters with coroutine methods, through which
+    the queries to many instruments overlap on one event loop, instead of
+    waiting for each other.
+
+    .. code-block:: python
+
+        async def measure(meters):
+            return await asyncio.gather(*(meter.async_get('voltage') for meter in meters))
+
+        voltages = asyncio.run(measure(meters))
+
+    The write and read of a query hold the :attr:`lock`, so that they are
+    not interleaved with those of other queries on the same adapter. The
+    asynchronous adapters require Python 3.7, and their module is only
+    imported when they are used.
+
+    This class should only be inherited from.
+    """
+
+    _loop = None
+    _lock = None
+
+    @property
+    def lock(self):
+        """ The asyncio.Lock that keeps the write and read of a query
+        together, for the running event loop
+        """
+        self.check_loop()
+        return self._lock
+
+    def check_loop(self):
+        """ Creates the lock, and calls :meth:`.loop_changed`, when the
+        adapter is first used from another event loop
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._lock = asyncio.Lock()
+            self.loop_changed()
+
+    def loop_changed(self):
+        """ Called when the adapter is first used from another event loop """
+        pass
+
+    async def write(self, command):
+        """ Writes a command to the instrument
+
+        :param command: SCPI command string to be sent to the instrument
+        """
+        raise NameError("AsyncAdapter (sub)class has not implemented writing")
+
+    async def read(self):
+        """ Reads and returns the ASCII response of the instrument """
+        raise NameError("AsyncAdapter (sub)class has not implemented reading")
+
+    async def ask(self, command):
+        """ Writes the command to the instrument and returns the resulting
+        ASCII response
+
+        :param command: SCPI command string to be sent to the instrument
+        :returns: String ASCII response of the instrument
+        """
+        async with self.lock:
+            await self.write(command)
+            return await self.read()
+
+    async def values(self, command, separator=',', cast=float):
+        """ Writes a command to the instrument and returns a list of formatted
+        values from the result
+
+        :param command: SCPI command to be sent to the instrument
+        :param separator: A separator character to split the string into a list
+        :param cast: A type to cast the result
+        :returns: A list of the desired type, or strings where the casting fails
+        """
+        return parse_values(await self.ask(command), separator, cast)
+
+    async def binary_values(self, command, header_bytes=0, dtype=np.float32):
+        """ Returns a numpy array from a query for binary data
+
+        :param command: SCPI command to be sent to the instrument
+        :param header_bytes: Integer number of bytes to ignore in header
+        :param dtype: The NumPy data type to format the values with
+        :returns: NumPy array of values
+        """
+        raise NameError("AsyncAdapter (sub)class has not implemented the "
+                        "binary_values method")
+
+    async def run(self, function, *args, **kwargs):
+        """ Calls a blocking function, such as the check_errors method of an
+        instrument, and returns its result. The base class calls it directly.
+        """
+        return function(*args, **kwargs)
+
+    async def close(self):
+        """ Closes the connection """
+        pass
+
+
+class ThreadedAdapter(AsyncAdapter):
+    """ Makes a blocking :class:`Adapter<pymeasure.adapters.Adapter>`
+    asynchronous, by calling it on a thread of its own. The calls to one
+    adapter are made one at a time, while those to different adapters run
+    at the same time.
+
+    :param adapter: The blocking Adapter
+    """
+
+    def __init__(self, adapter):
+        self.adapter = adapter
+        self.executor = ThreadPoolExecutor(max_workers=1)
+
+    async def run(self, function, *args, **kwargs):
+        """ Calls a blocking function on the thread of the adapter and
+        returns its result
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, partial(function, *args, **kwargs))
+
+    async def write(self, command):
+        await self.run(self.adapter.write, command)
+
+    async def read(self):
+        return await self.run(self.adapter.read)
+
+    async def ask(self, command):
+        return await self.run(self.adapter.ask, command)
+
+    async def values(self, command, separator=',', cast=float):
+        return await self.run(self.adapter.values, command, separator, cast)
+
+    async def binary_values(self, command, header_bytes=0, dtype=np.float32):
+        return await self.run(self.adapter.binary_values, command, header_bytes, dtype)
+
+    async def close(self):
+        self.executor.shutdown(wait=False)
+
+    def __repr__(self):
+        return "<ThreadedAdapter(adapter=%r)>" % self.adapter
+
+
+class AsyncSerialAdapter(ThreadedAdapter):
+    """ Asynchronous adapter for serial communication, which calls a
+    :class:`SerialAdapter<pymeasure.adapters.SerialAdapter>` on a thread
+
+    :param port: Serial port
+    :param kwargs: Any valid key-word argument for serial.Serial
+    """
+
+    def __init__(self, port, **kwargs):
+        from .serial import SerialAdapter
+        super().__init__(SerialAdapter(port, **kwargs))
+
+
+class AsyncVISAAdapter(ThreadedAdapter):
+    """ Asynchronous adapter for the VISA library, which calls a
+    :class:`VISAAdapter<pymeasure.adapters.VISAAdapter>` on a thread, as
+    PyVISA only offers blocking calls
+
+    :param resourceName: VISA resource name that identifies the address
+    :param kwargs: Any valid key-word arguments for constructing a PyVISA instrument
+    """
+
+    def __init__(self, resourceName, **kwargs):
+        from .visa import VISAAdapter
+        super().__init__(VISAAdapter(resourceName, **kwargs))
+
+
+class AsyncTCPAdapter(AsyncAdapter):
+    """ Asynchronous adapter for instruments that accept SCPI commands over
+    a raw TCP socket, such as LAN instruments on port 5025. The connection
+    is opened when it is first used, and again if the event loop changes.
+    The responses are framed as by the
+    :class:`SocketAdapter<pymeasure.adapters.SocketAdapter>`. If a response
+    times out, is cancelled or is not framed as expected, the connection is
+    closed, so that a late response is not read as that of the next command.
+
+    :param host: The host name or IP address of the instrument
+    :param port: The TCP port
+    :param timeout: Time in seconds to wait for a connection or a response
+    :param write_termination: The characters appended to each command
+    :param read_termination: The characters that end each response
+    :param encoding: The encoding of the commands and responses
+    """
+
+    CHUNK_SIZE = 1 << 16
+
+    def __init__(self, host, port=5025, timeout=10., write_termination='\n',
+                 read_termination='\n', encoding='ascii'):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.write_termination = write_termination
+        self.read_termination = read_termination.encode(encoding)
+        self.encoding = encoding
+        self._reader = None
+        self._writer = None
+        self._buffer = ResponseBuffer(self.read_termination, encoding)
+
+    def loop_changed(self):
+        # The streams belong to the previous event loop
+        self._reader = self._writer = None
+        self._buffer.clear()
+
+    async def connect(self):
+        """ Opens the connection, unless it is already open """
+        self.check_loop()
+        if self._writer is not None and not self._writer.is_closing():
+            return
+        self._reader, self._writer = await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port), self.timeout)
+        self._buffer.clear()
+        connection = self._writer.get_extra_info('socket')
+        if connection is not None:
+            configure_socket(connection)
+        log.debug("%r connected", self)
+
+    def _disconnect(self):
+        """ Closes the connection without waiting, and drops the bytes that
+        were received
+        """
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = self._writer = None
+        self._buffer.clear()
+
+    async def _receive(self, parse):
+        """ Receives bytes until parse returns a result from the buffer """
+        await self.connect()
+        try:
+            result = parse()
+            while result is None:
+                chunk = await asyncio.wait_for(self._reader.read(self.CHUNK_SIZE), self.timeout)
+                if not chunk:
+                    raise ConnectionResetError("The connection was closed by %s" % self.host)
+                self._buffer.feed(chunk)
+                result = parse()
+        except BaseException:
+            # Including timeouts and cancellation, after which a late
+            # response would be read as that of the next command
+            self._disconnect()
+            raise
+        return result
+
+    async def write(self, command):
+        await self.connect()
+        self._writer.write((command + self.write_termination).encode(self.encoding))
+        await self._writer.drain()
+
+    async def read(self):
+        return await self._receive(self._buffer.response)
+
+    async def read_bytes(self, count):
+        """ Reads and returns a number of bytes """
+        return await self._receive(partial(self._buffer.read_bytes, count))
+
+    async def read_block(self):
+        """ Reads an IEEE 488.2 definite length block, which starts with #,
+        the number of digits of the length and the length, and returns the
+        bytes of its data
+        """
+        return await self._receive(self._buffer.block)
+
+    async def binary_values(self, command, header_bytes=0, dtype=np.float32):
+        """ Returns a numpy array of the data of a definite length block that
+        is returned by a query
+
+        :param command: SCPI command to be sent to the instrument
+        :param header_bytes: Integer number of bytes to ignore at the start
+                             of the data
+        :param dtype: The NumPy data type to format the values with
+        :returns: NumPy array of values
+        """
+        async with self.lock:
+            await self.write(command)
+            data = await self.read_block()
+        return np.frombuffer(data[header_bytes:], dtype=dtype)
+
+    async def close(self):
+        if self._writer is not None:
+            writer = self._writer
+            self._disconnect()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+
+    def __repr__(self):
+        return "<AsyncTCPAdapter(host='%s',port=%d)>" % (self.host, self.port)
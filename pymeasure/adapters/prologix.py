@@ -36,7 +36,9 @@ class PrologixAdapter(SerialAdapter):
     Each PrologixAdapter is constructed based on a serial port or
     connection and the GPIB address to be communicated to.
     Serial connection sharing is achieved by using the :meth:`.gpib`
-    method to spawn new PrologixAdapters for different GPIB addresses.
+    method to spawn new PrologixAdapters for different GPIB addresses,
+    which share the :attr:`lock` of the connection, so that they can be
+    used from different threads.
 
     :param port: The Serial port name or a serial.Serial object
     :param address: Integer GPIB address of the desired instrument
@@ -82,10 +84,11 @@ class PrologixAdapter(SerialAdapter):
         :param command: SCPI command string to be sent to instrument
         """
 
-        self.write(command)
-        if self.rw_delay is not None:
-            time.sleep(self.rw_delay)
-        return self.read()
+        with self.lock:
+            self.write(command)
+            if self.rw_delay is not None:
+                time.sleep(self.rw_delay)
+            return self.read()
 
     def write(self, command):
         """ Writes the command to the GPIB address stored in the
@@ -93,19 +96,21 @@ class PrologixAdapter(SerialAdapter):
 
         :param command: SCPI command string to be sent to the instrument
         """
-        if self.address is not None:
-            address_command = "++addr %d\n" % self.address
-            self.connection.write(address_command.encode())
-        command += "\n"
-        self.connection.write(command.encode())
+        with self.lock:
+            if self.address is not None:
+                address_command = "++addr %d\n" % self.address
+                self.connection.write(address_command.encode())
+            command += "\n"
+            self.connection.write(command.encode())
 
     def read(self):
         """ Reads the response of the instrument until timeout
 
         :returns: String ASCII response of the instrument
         """
-        self.write("++read")
-        return b"\n".join(self.connection.readlines()).decode()
+        with self.lock:
+            self.write("++read")
+            return b"\n".join(self.connection.readlines()).decode()
 
     def gpib(self, address, rw_delay=None):
         """ Returns and PrologixAdapter object that references the GPIB
@@ -117,7 +122,9 @@ class PrologixAdapter(SerialAdapter):
         :returns: PrologixAdapter for specific GPIB address
         """
         rw_delay = rw_delay or self.rw_delay
-        return PrologixAdapter(self.connection, address, rw_delay=rw_delay)
+        adapter = PrologixAdapter(self.connection, address, rw_delay=rw_delay)
+        adapter.lock = self.lock
+        return adapter
 
     def wait_for_srq(self, timeout=25, delay=0.1):
         """ Blocks until a SRQ, and leaves the bit high
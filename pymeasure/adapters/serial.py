@@ -57,7 +57,8 @@ class SerialAdapter(Adapter):
 
         :param command: SCPI command string to be sent to the instrument
         """
-        self.connection.write(command.encode())  # encode added for Python 3
+        with self.lock:
+            self.connection.write(command.encode())  # encode added for Python 3
 
     def read(self):
         """ Reads until the buffer is empty and returns the resulting
@@ -65,7 +66,8 @@ class SerialAdapter(Adapter):
 
         :returns: String ASCII response of the instrument.
         """
-        return b"\n".join(self.connection.readlines()).decode()
+        with self.lock:
+            return b"\n".join(self.connection.readlines()).decode()
 
     def binary_values(self, command, header_bytes=0, dtype=np.float32):
         """ Returns a numpy array from a query for binary data 
@@ -75,8 +77,9 @@ class SerialAdapter(Adapter):
         :param dtype: The NumPy data type to format the values with
         :returns: NumPy array of values
         """
-        self.connection.write(command.encode())
-        binary = self.connection.read().decode()
+        with self.lock:
+            self.connection.write(command.encode())
+            binary = self.connection.read().decode()
         header, data = binary[:header_bytes], binary[header_bytes:]
         return np.fromstring(data, dtype=dtype)
 
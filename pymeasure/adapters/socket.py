@@ -0,0 +1,281 @@
+#
+# This file is part of the PyMeasure package.
+#
+# Copyright (c) 2013-2017 PyMeasure Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+
+import logging
+import socket
+
+import numpy as np
+
+from .adapter import Adapter
+
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+
+def configure_socket(connection):
+    """ Disables Nagle's algorithm on a TCP connection, so that each command
+    is sent at once, and enables keep-alive messages, so that a lost
+    connection is noticed
+    """
+    connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    connection.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+
+
+class ResponseBuffer(object):
+    """ Splits the bytes received from an instrument into responses that
+    end with the read termination, and IEEE 488.2 definite length blocks,
+    independently of how the bytes are received
+
+    :param termination: The bytes that end each response
+    :param encoding: The encoding of the responses
+    """
+
+    def __init__(self, termination=b'\n', encoding='ascii'):
+        self.termination = termination
+        self.encoding = encoding
+        self.clear()
+
+    def clear(self):
+        """ Drops the bytes that were received """
+        self.data = b''
+        self._searched = 0
+
+    def feed(self, data):
+        """ Adds bytes that were received """
+        self.data += data
+
+    def _take(self, count):
+        taken, self.data = self.data[:count], self.data[count:]
+        self._searched = 0
+        return taken
+
+    def response(self):
+        """ Returns the next response, without the termination, or None if
+        it was not received completely
+        """
+        end = self.data.find(self.termination, self._searched)
+        if end < 0:
+            # The termination may start in the last bytes
+            self._searched = max(len(self.data) - len(self.termination) + 1, 0)
+            return None
+        response = self._take(end + len(self.termination))
+        return response[:end].decode(self.encoding)
+
+    def read_bytes(self, count):
+        """ Returns the next count bytes, or None if they were not received """
+        if len(self.data) < count:
+            return None
+        return self._take(count)
+
+    def block(self):
+        """ Returns the data of the next definite length block, which starts
+        with #, the number of digits of the length and the length, and ends
+        with the termination, or None if it was not received completely
+
+        :raises ValueError: If the received bytes do not start a block
+        """
+        if len(self.data) < 2:
+            return None
+        if self.data[:1] != b'#' or not self.data[1:2].isdigit():
+            raise ValueError("Expected a binary block, but received %r" % self.data[:2])
+        digits = int(self.data[1:2])
+        if len(self.data) < 2 + digits:
+            return None
+        start = 2 + digits
+        end = start + int(self.data[2:start])
+        if len(self.data) < end + len(self.termination):
+            return None
+        block = self._take(end + len(self.termination))
+        return block[start:end]
+
+
+class SocketAdapter(Adapter):
+    """ Adapter class for instruments that accept SCPI commands over a raw
+    TCP socket, such as LAN instruments on port 5025, without the VISA
+    library. The connection is opened when it is first used and kept open,
+    with Nagle's algorithm disabled, so that each query is a single round
+    trip. If the instrument closes the connection, it is opened again and
+    the command is sent once more.
+
+    .. code-block:: python
+
+        adapter = SocketAdapter('192.168.0.10')
+        instrument = Keithley2400(adapter)
+
+    :param host: The host name or IP address of the instrument
+    :param port: The TCP port
+    :param timeout: Time in seconds to wait for a connection or a response
+    :param write_termination: The characters appended to each command
+    :param read_termination: The characters that end each response
+    :param encoding: The encoding of the commands and responses
+    :param retries: Number of times to reconnect and send a command again
+                    when the connection is lost
+    """
+
+    CHUNK_SIZE = 1 << 16
+
+    def __init__(self, host, port=5025, timeout=10., write_termination='\n',
+                 read_termination='\n', encoding='ascii', retries=1):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.write_termination = write_termination
+        self.read_termination = read_termination.encode(encoding)
+        self.encoding = encoding
+        self.retries = retries
+        self.connection = None
+        self._buffer = ResponseBuffer(self.read_termination, encoding)
+
+    def __del__(self):
+        """ Ensures the connection is closed upon deletion
+        """
+        self.close()
+
+    def connect(self):
+        """ Opens the connection, unless it is already open """
+        if self.connection is not None:
+            return
+        self.connection = socket.create_connection((self.host, self.port), self.timeout)
+        configure_socket(self.connection)
+        self._buffer.clear()
+        log.debug("%r connected", self)
+
+    def close(self):
+        """ Closes the connection, which is opened again when it is used """
+        with self.lock:
+            if self.connection is not None:
+                self.connection.close()
+                self.connection = None
+            self._buffer.clear()
+
+    def _send(self, data):
+        for attempt in range(self.retries + 1):
+            try:
+                self.connect()
+                self.connection.sendall(data)
+                return
+            except ConnectionError:
+                self.close()
+                if attempt == self.retries:
+                    raise
+                log.info("%r lost the connection, and reconnects", self)
+
+    def _receive(self):
+        try:
+            chunk = self.connection.recv(self.CHUNK_SIZE)
+        except OSError:
+            # A late response would be read as that of the next command
+            self.close()
+            raise
+        if not chunk:
+            self.close()
+            raise ConnectionResetError("The connection was closed by %s" % self.host)
+        self._buffer.feed(chunk)
+
+    def write(self, command):
+        """ Writes a command to the instrument
+
+        :param command: SCPI command string to be sent to the instrument
+        """
+        with self.lock:
+            self._send((command + self.write_termination).encode(self.encoding))
+
+    def read(self):
+        """ Reads up to the read termination and returns the ASCII response
+
+        :returns: String ASCII response of the instrument.
+        """
+        with self.lock:
+            self.connect()
+            response = self._buffer.response()
+            while response is None:
+                self._receive()
+                response = self._buffer.response()
+            return response
+
+    def read_bytes(self, count):
+        """ Reads and returns a number of bytes
+
+        :param count: The number of bytes
+        """
+        with self.lock:
+            self.connect()
+            data = self._buffer.read_bytes(count)
+            while data is None:
+                self._receive()
+                data = self._buffer.read_bytes(count)
+        return data
+
+    def read_block(self):
+        """ Reads an IEEE 488.2 definite length block, which starts with #,
+        the number of digits of the length and the length, and returns the
+        bytes of its data
+        """
+        with self.lock:
+            self.connect()
+            try:
+                data = self._buffer.block()
+                while data is None:
+                    self._receive()
+                    data = self._buffer.block()
+            except ValueError:
+                self.close()
+                raise
+        return data
+
+    def ask(self, command):
+        """ Writes the command to the instrument and returns the resulting
+        ASCII response. The command is sent again if the connection was
+        lost before the response arrived.
+
+        :param command: SCPI command string to be sent to the instrument
+        :returns: String ASCII response of the instrument
+        """
+        with self.lock:
+            for attempt in range(self.retries + 1):
+                try:
+                    self.write(command)
+                    return self.read()
+                except ConnectionError:
+                    if attempt == self.retries:
+                        raise
+                    log.info("%r lost the connection, and asks again", self)
+
+    def binary_values(self, command, header_bytes=0, dtype=np.float32):
+        """ Returns a numpy array of the data of a definite length block that
+        is returned by a query
+
+        :param command: SCPI command to be sent to the instrument
+        :param header_bytes: Integer number of bytes to ignore at the start
+                             of the data
+        :param dtype: The NumPy data type to format the values with
+        :returns: NumPy array of values
+        """
+        with self.lock:
+            self.write(command)
+            data = self.read_block()
+        return np.frombuffer(data[header_bytes:], dtype=dtype)
+
+    def __repr__(self):
+        return "<SocketAdapter(host='%s',port=%d)>" % (self.host, self.port)
@@ -81,7 +81,8 @@ class VISAAdapter(Adapter):
 
         :param command: SCPI command string to be sent to the instrument
         """
-        self.connection.write(command)
+        with self.lock:
+            self.connection.write(command)
 
     def read(self):
         """ Reads until the buffer is empty and returns the resulting
@@ -89,7 +90,8 @@ class VISAAdapter(Adapter):
 
         :returns: String ASCII response of the instrument.
         """
-        return self.connection.read()
+        with self.lock:
+            return self.connection.read()
 
     def ask(self, command):
         """ Writes the command to the instrument and returns the resulting
@@ -98,7 +100,8 @@ class VISAAdapter(Adapter):
         :param command: SCPI command string to be sent to the instrument
         :returns: String ASCII response of the instrument
         """
-        return self.connection.query(command)
+        with self.lock:
+            return self.connection.query(command)
 
     def ask_values(self, command):
         """ Writes a command to the instrument and returns a list of formatted
@@ -108,7 +111,8 @@ class VISAAdapter(Adapter):
         :param command: SCPI command to be sent to the instrument
         :returns: Formatted response of the instrument.
         """
-        return self.connection.query_values(command)
+        with self.lock:
+            return self.connection.query_values(command)
 
     def binary_values(self, command, header_bytes=0, dtype=np.float32):
         """ Returns a numpy array from a query for binary data
@@ -118,8 +122,9 @@ class VISAAdapter(Adapter):
         :param dtype: The NumPy data type to format the values with
         :returns: NumPy array of values
         """
-        self.connection.write(command)
-        binary = self.connection.read_raw()
+        with self.lock:
+            self.connection.write(command)
+            binary = self.connection.read_raw()
         header, data = binary[:header_bytes], binary[header_bytes:]
         return np.fromstring(data, dtype=dtype)
 
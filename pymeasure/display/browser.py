@@ -33,49 +33,303 @@ log = logging.getLogger(__name__)
 log.addHandler(logging.NullHandler())
 
 
-class BrowserItem(QtGui.QTreeWidgetItem):
-    def __init__(self, results, curve, parent=None):
-        super().__init__(parent)
+class BrowserItem(object):
+    """ Holds the state of one :class:`Experiment<pymeasure.display.manager.Experiment>`
+    row in the :class:`.Browser`. The item mirrors the parts of the
+    QTreeWidgetItem interface that are used for experiments, while its
+    icon and parameter texts are only created once the row is shown.
+
+    :param results: :class:`.Results` object of the experiment
+    :param curve: :class:`.ResultsCurve` object of the experiment
+    """
+
+    def __init__(self, results, curve):
+        self.results = results
+        self.model = None
+        self._color = QtGui.QColor(curve.opts['pen'].color())
+        self._icon = None
+        self._check_state = QtCore.Qt.Checked
+        self._status = results.procedure.status
+        self._progress = 0
+        self._texts = {1: basename(results.data_filename)}
+        self._parameters = None
 
-        pixelmap = QtGui.QPixmap(24, 24)
-        pixelmap.fill(curve.opts['pen'].color())
-        self.setIcon(0, QtGui.QIcon(pixelmap))
-        self.setFlags(self.flags() | QtCore.Qt.ItemIsUserCheckable)
-        self.setCheckState(0, QtCore.Qt.Checked)
-        self.setText(1, basename(results.data_filename))
+    def _changed(self, first, last=None):
+        if self.model is not None:
+            self.model.item_changed(self, first, first if last is None else last)
 
-        self.setStatus(results.procedure.status)
+    def icon(self, column=0):
+        if self._icon is None:
+            pixelmap = QtGui.QPixmap(24, 24)
+            pixelmap.fill(self._color)
+            self._icon = QtGui.QIcon(pixelmap)
+        return self._icon
 
-        self.progressbar = QtGui.QProgressBar()
-        self.progressbar.setRange(0, 100)
-        self.progressbar.setValue(0)
+    def setIcon(self, column, icon):
+        self._icon = icon
+        self._changed(column)
+
+    def text(self, column):
+        return self._texts.get(column, '')
+
+    def setText(self, column, text):
+        self._texts[column] = text
+        self._changed(column)
+
+    def parameter_text(self, name):
+        """ Returns the text of a Parameter of the procedure, which is
+        only looked up once it is requested
+        """
+        if self._parameters is None:
+            self._parameters = self.results.procedure.parameter_objects()
+        if name in self._parameters:
+            return str(self._parameters[name])
+        return ''
+
+    def checkState(self, column=0):
+        return self._check_state
+
+    def setCheckState(self, column, state):
+        if state != self._check_state:
+            self._check_state = state
+            self._changed(column)
+            if self.model is not None:
+                self.model.checked.emit(self, column)
+
+    def status(self):
+        return self._status
 
     def setStatus(self, status):
-        status_label = {
-            Procedure.QUEUED: 'Queued', Procedure.RUNNING: 'Running',
-            Procedure.FAILED: 'Failed', Procedure.ABORTED: 'Aborted',
-            Procedure.FINISHED: 'Finished'}
-        self.setText(3, status_label[status])
-
-        if status == Procedure.FAILED or status == Procedure.ABORTED:
-            # Set progress bar color to red
-            return  # Commented this out
-            self.progressbar.setStyleSheet("""
-            QProgressBar {
-                border: 1px solid #AAAAAA;
-                border-radius: 5px;
-                text-align: center;
-            }
-            QProgressBar::chunk {
-                background-color: red;
-            }
-            """)
+        self._status = status
+        self._changed(3)
+
+    def progress(self):
+        return self._progress
 
     def setProgress(self, progress):
-        self.progressbar.setValue(progress)
+        self._progress = progress
+        self._changed(2)
+
+
+class BrowserModel(QtCore.QAbstractItemModel):
+    """ Flat item model of :class:`.BrowserItem` objects. Rows are stored
+    in a list with a reverse index, so that appending items and updating
+    their status or progress does not depend on the number of rows.
+    Inserting while sorted by a column of fixed values keeps the order
+    by a binary search. The reverse index of the rows after an insertion
+    or removal is only updated when it is next used, so that a series of
+    changes renumbers the rows once.
+
+    :param header_labels: List of column labels
+    :param display_parameters: List of Parameter names shown after the
+                               fixed columns
+    """
+
+    checked = QtCore.QSignal(object, int)
+
+    # Columns with values that do not change after an item is added
+    FIXED_COLUMNS = 4
+
+    def __init__(self, header_labels, display_parameters, parent=None):
+        super().__init__(parent)
+        self.header_labels = header_labels
+        self.display_parameters = display_parameters
+        self.items = []
+        self._keys = []
+        self._rows = {}
+        self._stale = 0
+        self._count = 0
+        self._sort_column = None
+        self._sort_order = QtCore.Qt.AscendingOrder
+
+    def item(self, row):
+        return self.items[row]
+
+    def row(self, item):
+        if self._stale < len(self.items):
+            for row in range(self._stale, len(self.items)):
+                self._rows[self.items[row]] = row
+            self._stale = len(self.items)
+        return self._rows[item]
+
+    def index(self, row, column, parent=QtCore.QModelIndex()):
+        if parent.isValid() or not self.hasIndex(row, column, parent):
+            return QtCore.QModelIndex()
+        return self.createIndex(row, column)
+
+    def parent(self, index=None):
+        return QtCore.QModelIndex()
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self.items)
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return len(self.header_labels)
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        if orientation == QtCore.Qt.Horizontal and role == QtCore.Qt.DisplayRole:
+            return self.header_labels[section]
+        return None
+
+    def flags(self, index):
+        flags = QtCore.Qt.ItemIsEnabled | QtCore.Qt.ItemIsSelectable
+        if index.column() == 0:
+            flags |= QtCore.Qt.ItemIsUserCheckable
+        return flags
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        item = self.items[index.row()]
+        column = index.column()
+        if role == QtCore.Qt.DisplayRole:
+            return self._text(item, column)
+        elif role == QtCore.Qt.DecorationRole and column == 0:
+            return item.icon()
+        elif role == QtCore.Qt.CheckStateRole and column == 0:
+            return item.checkState()
+        elif role == QtCore.Qt.UserRole and column == 2:
+            return item.progress()
+        return None
 
+    def setData(self, index, value, role=QtCore.Qt.EditRole):
+        if index.isValid() and role == QtCore.Qt.CheckStateRole:
+            self.items[index.row()].setCheckState(index.column(), value)
+            return True
+        return False
 
-class Browser(QtGui.QTreeWidget):
+    def _text(self, item, column):
+        if column == 2:
+            return None  # Drawn by the ProgressDelegate
+        elif column == 3:
+            return Procedure.STATUS_STRINGS[item.status()]
+        text = item.text(column)
+        if column >= self.FIXED_COLUMNS and not text:
+            return item.parameter_text(
+                self.display_parameters[column - self.FIXED_COLUMNS])
+        return text
+
+    def _key(self, item, column):
+        if column == 0:
+            return item._sequence
+        elif column == 2:
+            return item.progress()
+        return self._text(item, column)
+
+    def item_changed(self, item, first, last):
+        row = self.row(item)
+        self.dataChanged.emit(self.index(row, first), self.index(row, last))
+
+    def _insertion_row(self, key):
+        """ Returns the row at which a key keeps the current sort order """
+        low, high = 0, len(self._keys)
+        descending = self._sort_order == QtCore.Qt.DescendingOrder
+        while low < high:
+            middle = (low + high) // 2
+            if (self._keys[middle] > key) if descending else (self._keys[middle] <= key):
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def append(self, item):
+        """ Adds an item, which is placed in the current sort order if the
+        rows are sorted by a column that does not change
+        """
+        item.model = self
+        item._sequence = self._count
+        self._count += 1
+        if self._sort_column is None:
+            key, row = None, len(self.items)
+        else:
+            key = self._key(item, self._sort_column)
+            row = self._insertion_row(key)
+        self.beginInsertRows(QtCore.QModelIndex(), row, row)
+        self.items.insert(row, item)
+        self._keys.insert(row, key)
+        self._reindex(row)
+        self.endInsertRows()
+
+    def remove(self, item):
+        row = self.row(item)
+        self.beginRemoveRows(QtCore.QModelIndex(), row, row)
+        del self.items[row]
+        del self._keys[row]
+        del self._rows[item]
+        self._reindex(row)
+        self.endRemoveRows()
+        item.model = None
+
+    def _reindex(self, start=0):
+        # The rows from start on are renumbered when they are next used
+        self._stale = min(self._stale, start)
+
+    def _change_layout(self, items):
+        """ Replaces the items with a new order of the same items, and moves
+        the persistent indices with them
+        """
+        self.layoutAboutToBeChanged.emit()
+        persistent = [(index, self.items[index.row()]) for index in self.persistentIndexList()]
+        self.items = items
+        self._reindex()
+        for index, item in persistent:
+            self.changePersistentIndex(
+                index, self.index(self.row(item), index.column()))
+        self.layoutChanged.emit()
+
+    def reorder(self, items):
+        """ Reorders items, so that they take the positions they occupied in
+        the new order. The items are also given the sequence numbers they
+        occupied, so that sorting by the first column follows the new order.
+
+        :param items: The items in the new order
+        """
+        sequences = sorted(item._sequence for item in items)
+        for sequence, item in zip(sequences, items):
+            item._sequence = sequence
+        if self._sort_column is not None:
+            self.sort(self._sort_column, self._sort_order)
+            return
+        new_items = list(self.items)
+        rows = sorted(self.row(item) for item in items)
+        for row, item in zip(rows, items):
+            new_items[row] = item
+        self._change_layout(new_items)
+
+    def sort(self, column, order=QtCore.Qt.AscendingOrder):
+        keys = [(self._key(item, column), item) for item in self.items]
+        keys.sort(key=lambda pair: pair[0], reverse=(order == QtCore.Qt.DescendingOrder))
+        if column in (2, 3):
+            # Progress and status change over time, so new rows are appended
+            self._sort_column = None
+            self._keys = [None] * len(self.items)
+        else:
+            self._sort_column = column
+            self._keys = [key for key, item in keys]
+        self._sort_order = order
+        self._change_layout([item for key, item in keys])
+
+
+class ProgressDelegate(QtGui.QStyledItemDelegate):
+    """ Draws the progress of an experiment as a progress bar, instead
+    of constructing a QProgressBar widget for each row
+    """
+
+    def paint(self, painter, option, index):
+        progress = index.data(QtCore.Qt.UserRole)
+        if progress is None:
+            return super().paint(painter, option, index)
+        bar = QtGui.QStyleOptionProgressBar()
+        bar.rect = option.rect.adjusted(1, 1, -1, -1)
+        bar.minimum = 0
+        bar.maximum = 100
+        bar.progress = int(progress)
+        bar.text = "%d%%" % int(progress)
+        bar.textVisible = True
+        QtGui.QApplication.style().drawControl(QtGui.QStyle.CE_ProgressBar, bar, painter)
+
+
+class Browser(QtGui.QTreeView):
     """Graphical list view of :class:`Experiment<pymeasure.display.manager.Experiment>`
     objects allowing the user to view the status of queued Experiments as well as 
     loading and displaying data from previous runs.
@@ -83,8 +337,13 @@ class Browser(QtGui.QTreeWidget):
     In order that different Experiments be displayed within the same Browser,
     they must have entries in `DATA_COLUMNS` corresponding to the
     `measured_quantities` of the Browser.
+
+    The Browser is a view on a :class:`.BrowserModel`, so that only the
+    visible rows are drawn, even for thousands of queued experiments.
     """
 
+    itemChanged = QtCore.QSignal(object, int)
+
     def __init__(self, procedure_class, display_parameters,
                  measured_quantities, sort_by_filename=False, parent=None):
         super().__init__(parent)
@@ -96,11 +355,17 @@ class Browser(QtGui.QTreeWidget):
         for parameter in self.display_parameters:
             header_labels.append(getattr(self.procedure_class, parameter).name)
 
-        self.setColumnCount(len(header_labels))
-        self.setHeaderLabels(header_labels)
+        self._model = BrowserModel(header_labels, self.display_parameters, parent=self)
+        self._model.checked.connect(self.itemChanged)
+        self.setModel(self._model)
+        self.setRootIsDecorated(False)
+        self.setUniformRowHeights(True)
+        self.setItemDelegateForColumn(2, ProgressDelegate(self))
         self.setSortingEnabled(True)
         if sort_by_filename:
-            self.sortItems(1, QtCore.Qt.AscendingOrder)
+            self.sortByColumn(1, QtCore.Qt.AscendingOrder)
+        else:
+            self.sortByColumn(0, QtCore.Qt.AscendingOrder)
 
         for i, width in enumerate([80, 140]):
             self.header().resizeSection(i, width)
@@ -109,24 +374,38 @@ class Browser(QtGui.QTreeWidget):
         """Add a :class:`Experiment<pymeasure.display.manager.Experiment>` object
         to the Browser. This function checks to make sure that the Experiment
         measures the appropriate quantities to warrant its inclusion, and then 
-        adds a BrowserItem to the Browser, filling all relevant columns with 
-        Parameter data.
+        adds its BrowserItem to the Browser. The Parameter data of the
+        columns is filled in once the row is shown.
         """
-        experiment_parameters = experiment.procedure.parameter_objects()
-        experiment_parameter_names = list(experiment_parameters.keys())
-
         for measured_quantity in self.measured_quantities:
             if measured_quantity not in experiment.procedure.DATA_COLUMNS:
                 raise Exception("Procedure does not measure the"
                                 " %s quantity." % measured_quantity)
 
-        # Set the relevant fields within the BrowserItem if
-        # that Parameter is implemented
         item = experiment.browser_item
-        for i, column in enumerate(self.display_parameters):
-            if column in experiment_parameter_names:
-                item.setText(i + 4, str(experiment_parameters[column]))
-
-        self.addTopLevelItem(item)
-        self.setItemWidget(item, 2, item.progressbar)
+        self._model.append(item)
         return item
+
+    def remove(self, experiment):
+        """ Removes the BrowserItem of an Experiment from the Browser """
+        self._model.remove(experiment.browser_item)
+
+    def reorder(self, experiments):
+        """ Reorders the rows of Experiments, so that they take the positions
+        they occupied in the new order, as :meth:`.ExperimentQueue.reorder`
+        does for the queue
+
+        :param experiments: The Experiments in the new order
+        """
+        self._model.reorder([experiment.browser_item for experiment in experiments])
+
+    def items(self):
+        """ Returns a list of the BrowserItems in display order """
+        return list(self._model.items)
+
+    def itemAt(self, position):
+        """ Returns the BrowserItem at a position in the viewport, or None """
+        index = self.indexAt(position)
+        if not index.isValid():
+            return None
+        return self._model.item(index.row())
@@ -23,6 +23,7 @@
 #
 
 import logging
+import os
 
 import pyqtgraph as pg
 import numpy as np
@@ -33,11 +34,35 @@ log = logging.getLogger(__name__)
 log.addHandler(logging.NullHandler())
 
 
+def _file_state(filename):
+    """ Returns the size and modification time of a file, or None if it
+    can not be accessed
+    """
+    try:
+        stat = os.stat(filename)
+    except (OSError, TypeError):
+        return None
+    return stat.st_size, stat.st_mtime
+
+
+def _results_state(results):
+    """ Returns the state of the data file of the results, and the number
+    of rows in their shared buffer, which changes before the file is flushed
+    """
+    buffer = getattr(results, 'buffer', None)
+    count = buffer.count if buffer is not None else None
+    return _file_state(results.data_filename), count
+
+
 class ResultsCurve(pg.PlotDataItem):
     """ Creates a curve loaded dynamically from a file through the Results
     object and supports error bars. The data can be forced to fully reload
     on each update, useful for cases when the data is changing across the full
     file instead of just appending.
+
+    While :attr:`loading` is True, the data is provided through
+    :meth:`.update_data` (e.g. by a :class:`.ResultsLoader`) and
+    :meth:`.update` does not read the file.
     """
 
     def __init__(self, results, x, y, xerr=None, yerr=None,
@@ -50,12 +75,45 @@ class ResultsCurve(pg.PlotDataItem):
         if xerr or yerr:
             self._errorBars = pg.ErrorBarItem(pen=kwargs.get('pen', None))
             self.xerr, self.yerr = xerr, yerr
+        self._file_state = None
+        self._last_data = None
+        self.loading = False
+
+    def _stat(self):
+        """ Returns the state of the data file and of the shared buffer of
+        the results
+        """
+        return _results_state(self.results)
+
+    def is_stale(self):
+        """ Returns True if the data file or the shared buffer has changed
+        since the last update, which only requires a single stat call
+        """
+        if self._file_state is None:
+            return True
+        return self._stat() != self._file_state
 
     def update(self):
         """Updates the data by polling the results"""
+        if self.loading:
+            if self._last_data is not None:
+                self.update_data(self._last_data)
+            return
+        # Record the file state before reading, so that data written
+        # during the read marks the curve as stale for the next update
+        self._file_state = self._stat()
         if self.force_reload:
             self.results.reload()
-        data = self.results.data  # get the current snapshot
+        # Only the plotted columns are read, which for finished runs are
+        # kept by the Results, so that changing the axes does not parse the file
+        columns = [self.x, self.y]
+        if hasattr(self, '_errorBars'):
+            columns += [column for column in (self.xerr, self.yerr) if column]
+        self.update_data(self.results.read(columns))  # get the current snapshot
+
+    def update_data(self, data):
+        """Updates the curve from a DataFrame snapshot of the results"""
+        self._last_data = data
 
         # Set x-y data
         self.setData(data[self.x], data[self.y])
@@ -76,6 +134,57 @@ class ResultsCurve(pg.PlotDataItem):
 # TODO: Add method for changing x and y
 
 
+class ResultsImage(pg.ImageItem):
+    """ Creates an image of the z column of the results as a function of
+    the x and y columns, which are binned onto the pixels of a
+    :class:`~pymeasure.experiment.grid.BinnedGrid`. On each update only the
+    rows that were added since the last update are binned.
+
+    The image is refreshed by :meth:`.update_results`, since
+    :meth:`update` is used by the ImageItem to schedule repaints.
+
+    :param results: The :class:`~pymeasure.experiment.results.Results`
+    :param x: The column name of the x coordinates
+    :param y: The column name of the y coordinates
+    :param z: The column name of the pixel values
+    :param grid: The :class:`~pymeasure.experiment.grid.BinnedGrid` to fill
+    """
+
+    def __init__(self, results, x, y, z, grid, **kwargs):
+        super().__init__(**kwargs)
+        self.results = results
+        self.x, self.y, self.z = x, y, z
+        self.grid = grid
+        self._rows = 0
+        self._file_state = None
+
+    def is_stale(self):
+        """ Returns True if the data file or the shared buffer has changed
+        since the last update
+        """
+        if self._file_state is None:
+            return True
+        return _results_state(self.results) != self._file_state
+
+    def update_results(self):
+        """ Bins the new rows of the results and redraws the image """
+        self._file_state = _results_state(self.results)
+        data = self.results.data
+        if len(data) < self._rows:  # The data has been reloaded
+            self.grid.clear()
+            self._rows = 0
+        self.update_data(data.iloc[self._rows:])
+        self._rows = len(data)
+
+    def update_data(self, data):
+        """ Bins additional rows of data and redraws the image """
+        if len(data) > 0:
+            self.grid.add(data[self.x], data[self.y], data[self.z])
+        if self.grid.levels is not None:
+            self.setImage(self.grid.values, autoLevels=False, levels=self.grid.levels)
+            self.setRect(QtCore.QRectF(*self.grid.rect))
+
+
 class BufferCurve(pg.PlotDataItem):
     """ Creates a curve based on a predefined buffer size and allows
     data to be added dynamically, in additon to supporting error bars
@@ -31,14 +31,6 @@ from ..experiment.procedure import Procedure
 log = logging.getLogger(__name__)
 log.addHandler(logging.NullHandler())
 
-try:
-    import zmq
-    import cloudpickle
-except ImportError:
-    zmq = None
-    cloudpickle = None
-    log.warning("ZMQ and cloudpickle are required for TCP communication")
-
 
 class QListener(StoppableQThread):
     """Base class for QThreads that need to listen for messages
@@ -58,6 +50,9 @@ class QListener(StoppableQThread):
 
         self.port = port
         self.topic = topic
+        import zmq  # Imported when needed, since it is slow to import
+        import cloudpickle
+        self._loads = cloudpickle.loads
         self.context = zmq.Context()
         log.debug("%s has ZMQ Context: %r" % (self.__class__.__name__, self.context))
         self.subscriber = self.context.socket(zmq.SUB)
@@ -71,7 +66,7 @@ class QListener(StoppableQThread):
         self.timeout = timeout
 
     def receive(self, flags=0):
-        topic, record = self.subscriber.recv_serialized(deserialize=cloudpickle.loads, flags=flags)
+        topic, record = self.subscriber.recv_serialized(deserialize=self._loads, flags=flags)
         return topic, record
 
     def message_waiting(self):
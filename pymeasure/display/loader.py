@@ -0,0 +1,163 @@
+#
+# This file is part of the PyMeasure package.
+#
+# Copyright (c) 2013-2017 PyMeasure Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+
+import logging
+import os
+import time
+from threading import Event
+
+import pandas as pd
+
+from .Qt import QtCore
+from ..experiment.compression import open_data
+from ..experiment.results import Results
+
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+
+class LoaderTask(QtCore.QRunnable):
+    """ Loads a single Results file on a thread of a QThreadPool, and
+    reports through the signals of its :class:`.ResultsLoader`
+    """
+
+    def __init__(self, loader, filename, max_rows=None):
+        super().__init__()
+        self.loader = loader
+        self.filename = filename
+        self.max_rows = max_rows
+        self._should_stop = Event()
+
+    def stop(self):
+        self._should_stop.set()
+
+    def should_stop(self):
+        return self._should_stop.is_set()
+
+    def run(self):
+        try:
+            self._load()
+        except Exception as e:
+            log.exception("Failed to load %s", self.filename)
+            self.loader.failed.emit(self.filename, str(e))
+        finally:
+            self.loader._done.emit(self)
+
+    def _load(self):
+        results = Results.load(self.filename)
+        self.loader.opened.emit(results)
+        if self.max_rows is not None:
+            self.loader.loaded.emit(results, results.sample(self.max_rows))
+            return
+
+        size = max(os.path.getsize(self.filename), 1)
+        chunks = []
+        last_emit = time.perf_counter()
+        with open_data(self.filename) as f:
+            reader = pd.read_csv(f, comment=Results.COMMENT,
+                                 chunksize=self.loader.chunk_size,
+                                 **results.parser_options())
+            for chunk in reader:
+                if self.should_stop():
+                    log.info("Loading of %s was cancelled", self.filename)
+                    self.loader.cancelled.emit(self.filename)
+                    return
+                chunks.append(chunk)
+                self.loader.progress.emit(results, 100. * f.raw.tell() / size)
+                if time.perf_counter() - last_emit > self.loader.update_interval:
+                    # Consolidate, so that each chunk is only copied a
+                    # bounded number of times
+                    chunks = [results.concat(chunks)]
+                    self.loader.chunk.emit(results, chunks[0])
+                    last_emit = time.perf_counter()
+            offset = f.raw.tell()
+        if chunks:
+            data = results.concat(chunks)
+        else:
+            data = results.empty_data()
+        results.set_data(data, offset)
+        self.loader.loaded.emit(results, data)
+
+
+class ResultsLoader(QtCore.QObject):
+    """ Loads Results files in the background on a pool of threads, so
+    that opening large files does not block the user interface.
+
+    For each file, :attr:`opened` is emitted once the header is parsed,
+    followed by :attr:`progress` and :attr:`chunk` signals as the data is
+    read, and finally :attr:`loaded` with the full data. A preview with a
+    bounded number of rows is loaded by passing ``max_rows`` to
+    :meth:`.load`, which reads a decimated sample of the file instead.
+
+    :param threads: Maximum number of files that are loaded at once
+    :param chunk_size: Number of rows parsed at a time
+    :param update_interval: Minimum time in seconds between chunk signals
+    """
+
+    opened = QtCore.QSignal(object)
+    progress = QtCore.QSignal(object, float)
+    chunk = QtCore.QSignal(object, object)
+    loaded = QtCore.QSignal(object, object)
+    failed = QtCore.QSignal(str, str)
+    cancelled = QtCore.QSignal(str)
+    _done = QtCore.QSignal(object)
+
+    def __init__(self, threads=2, chunk_size=100000, update_interval=0.5, parent=None):
+        super().__init__(parent)
+        self.chunk_size = chunk_size
+        self.update_interval = update_interval
+        self.pool = QtCore.QThreadPool(self)
+        self.pool.setMaxThreadCount(threads)
+        self._tasks = {}
+        self._done.connect(self._remove_task)
+
+    def load(self, filename, max_rows=None):
+        """ Starts loading a Results file in the background
+
+        :param filename: The data filename
+        :param max_rows: Maximum number of rows to read as a preview, or
+                         None to read the full data
+        """
+        filename = os.path.abspath(filename)
+        task = LoaderTask(self, filename, max_rows)
+        task.setAutoDelete(False)
+        self._tasks[filename] = task
+        self.pool.start(task)
+
+    def is_loading(self, filename):
+        return os.path.abspath(filename) in self._tasks
+
+    def cancel(self, filename):
+        """ Stops loading a file, if it is still being loaded """
+        task = self._tasks.get(os.path.abspath(filename))
+        if task is not None:
+            task.stop()
+
+    def cancel_all(self):
+        for task in self._tasks.values():
+            task.stop()
+
+    def _remove_task(self, task):
+        if self._tasks.get(task.filename) is task:
+            del self._tasks[task.filename]
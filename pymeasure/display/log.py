@@ -24,6 +24,7 @@
 
 import logging
 
+from collections import deque
 from logging import Handler
 
 from .Qt import QtCore
@@ -33,11 +34,59 @@ log.addHandler(logging.NullHandler())
 
 
 class LogHandler(QtCore.QObject, Handler):
+    """ Logging handler that buffers records and periodically emits them
+    as a single block of text through the :attr:`record` signal, so that
+    a large number of log records does not flood the Qt event loop.
+
+    The message of a record is merged with its arguments when it is
+    logged, as by a QueueHandler, so that later changes of the arguments do
+    not change it. The rest of the record is only formatted when it is
+    flushed, and at most max_records are kept between flushes, dropping the
+    oldest ones.
+
+    :param interval: Time in milliseconds between flushes
+    :param max_records: Maximum number of records buffered between flushes
+    """
     record = QtCore.QSignal(object)
 
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, interval=100, max_records=1000):
         QtCore.QObject.__init__(self, parent)
         Handler.__init__(self)
+        self.records = deque(maxlen=max_records)
+        self.dropped = 0
+        self.timer = QtCore.QTimer(self)
+        self.timer.timeout.connect(self.flush_records)
+        self.timer.start(interval)
 
     def emit(self, record):
-        self.record.emit(self.format(record))
+        # Called from any thread with the handler lock held
+        try:
+            record.msg = record.getMessage()
+            record.args = None
+        except Exception:
+            self.handleError(record)
+            return
+        if len(self.records) == self.records.maxlen:
+            self.dropped += 1
+        self.records.append(record)
+
+    def flush_records(self):
+        """ Formats the buffered records and emits them as one block """
+        self.acquire()
+        try:
+            records = list(self.records)
+            self.records.clear()
+            dropped, self.dropped = self.dropped, 0
+        finally:
+            self.release()
+        if not records:
+            return
+        lines = []
+        if dropped:
+            lines.append("... %d log records dropped ..." % dropped)
+        for record in records:
+            try:
+                lines.append(self.format(record))
+            except Exception:
+                self.handleError(record)
+        self.record.emit("\n".join(lines))
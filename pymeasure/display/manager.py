@@ -24,11 +24,14 @@
 
 import logging
 
+from collections import OrderedDict
 from os.path import basename
 
 from .Qt import QtCore
 from .listeners import Monitor
 from ..experiment import Procedure
+from ..experiment.ordering import optimize_order, path_time
+from ..experiment.sharedbuffer import RowBuffer
 from ..experiment.workers import Worker
 
 log = logging.getLogger(__name__)
@@ -56,45 +59,113 @@ class Experiment(QtCore.QObject):
 
 class ExperimentQueue(QtCore.QObject):
     """ Represents a Queue of Experiments and allows queries to
-    be easily preformed
+    be easily preformed. The Experiments are kept in insertion order
+    and indexed by filename, status and browser item, so that lookups
+    and removals do not scan the queue
     """
 
     def __init__(self):
         super().__init__()
-        self.queue = []
+        self._queue = OrderedDict()
+        self._list = []
+        self._by_filename = {}
+        self._by_browser_item = {}
+        self._by_status = {}
+        self._status = {}
+
+    def _index_status(self, experiment, status):
+        previous = self._status.pop(experiment, None)
+        if previous is not None:
+            del self._by_status[previous][experiment]
+        if status is not None:
+            self._status[experiment] = status
+            self._by_status.setdefault(status, OrderedDict())[experiment] = None
+
+    @property
+    def queue(self):
+        """ The list of Experiments in the order of the queue """
+        if self._list is None:
+            self._list = list(self._queue)
+        return self._list
 
     def append(self, experiment):
-        self.queue.append(experiment)
+        self._queue[experiment] = None
+        self._list = None
+        self._by_filename[basename(experiment.data_filename)] = experiment
+        self._by_browser_item[experiment.browser_item] = experiment
+        self._index_status(experiment, experiment.procedure.status)
 
     def remove(self, experiment):
-        if experiment not in self.queue:
+        if experiment not in self:
             raise Exception("Attempting to remove an Experiment that is "
                             "not in the ExperimentQueue")
         else:
             if experiment.procedure.status == Procedure.RUNNING:
                 raise Exception("Attempting to remove a running experiment")
             else:
-                self.queue.pop(self.queue.index(experiment))
+                del self._queue[experiment]
+                self._list = None
+                del self._by_filename[basename(experiment.data_filename)]
+                del self._by_browser_item[experiment.browser_item]
+                self._index_status(experiment, None)
+
+    def reorder(self, experiments):
+        """ Reorders experiments within the queue, so that they take the
+        positions they occupied in the new order
+
+        :param experiments: The experiments in the new order
+        """
+        queue = list(self._queue)
+        position = {id(experiment): index for index, experiment in enumerate(queue)}
+        indices = sorted(position[id(experiment)] for experiment in experiments)
+        for index, experiment in zip(indices, experiments):
+            queue[index] = experiment
+        self._queue = OrderedDict((experiment, None) for experiment in queue)
+        self._list = None
+        # Rebuild the status index, which determines the order of next()
+        self._by_status = {}
+        for experiment in queue:
+            status = self._status[experiment]
+            self._by_status.setdefault(status, OrderedDict())[experiment] = None
+
+    def update_status(self, experiment):
+        """ Updates the status index after the status of the
+        Procedure of an Experiment has changed
+        """
+        if experiment in self._status:
+            self._index_status(experiment, experiment.procedure.status)
+
+    def with_status(self, status):
+        """ Returns a list of the Experiments with a given status
+        """
+        return list(self._by_status.get(status, ()))
 
     def __contains__(self, value):
         if isinstance(value, Experiment):
-            return value in self.queue
+            return value in self._status
         if isinstance(value, str):
-            for experiment in self.queue:
-                if basename(experiment.data_filename) == basename(value):
-                    return True
-            return False
+            return basename(value) in self._by_filename
         return False
 
     def __getitem__(self, key):
         return self.queue[key]
 
+    def __iter__(self):
+        return iter(self.queue)
+
+    def __len__(self):
+        return len(self._queue)
+
     def next(self):
         """ Returns the next experiment on the queue
         """
-        for experiment in self.queue:
+        queued = self._by_status.get(Procedure.QUEUED, {})
+        while queued:
+            experiment = next(iter(queued))
             if experiment.procedure.status == Procedure.QUEUED:
                 return experiment
+            # The status changed without an update, so fix the index
+            self.update_status(experiment)
         raise StopIteration("There are no queued experiments")
 
     def has_next(self):
@@ -108,10 +179,33 @@ class ExperimentQueue(QtCore.QObject):
         return True
 
     def with_browser_item(self, item):
-        for experiment in self.queue:
-            if experiment.browser_item is item:
-                return experiment
-        return None
+        return self._by_browser_item.get(item, None)
+
+
+class OrderTask(QtCore.QRunnable):
+    """ Finds an order of queued experiments that reduces the time spent
+    changing parameters, on a thread of a QThreadPool, and passes itself
+    to the Manager once the order is found
+    """
+
+    def __init__(self, manager, experiments, costs, start=None):
+        super().__init__()
+        self.manager = manager
+        self.experiments = experiments
+        self.points = [experiment.procedure.parameter_values() for experiment in experiments]
+        self.costs = costs
+        self.start = start
+        self.order = None
+
+    def find_order(self):
+        try:
+            self.order = optimize_order(self.points, self.costs, self.start)
+        except Exception:
+            log.exception("Failed to optimize the order of the queue")
+
+    def run(self):
+        self.find_order()
+        self.manager._ordered.emit(self)
 
 
 class Manager(QtCore.QObject):
@@ -120,6 +214,12 @@ class Manager(QtCore.QObject):
     aborted. When instantiated, the Manager is linked to a :class:`.Browser`
     and a PyQtGraph `PlotItem` within the user interface, which are updated
     in accordance with the execution status of the Experiments.
+
+    The Worker of the running Experiment is a thread of this process, so
+    its rows are passed to the plot through a
+    :class:`~pymeasure.experiment.sharedbuffer.RowBuffer` of buffer_size
+    rows in memory, or by reading the data file if buffer_size is None,
+    which is the default.
     """
     _is_continuous = True
     _start_on_add = True
@@ -130,8 +230,11 @@ class Manager(QtCore.QObject):
     aborted = QtCore.QSignal(object)
     abort_returned = QtCore.QSignal(object)
     log = QtCore.QSignal(object)
+    optimized = QtCore.QSignal(float, float)
+    _ordered = QtCore.QSignal(object)
 
-    def __init__(self, plot, browser, port=5888, log_level=logging.INFO, parent=None):
+    def __init__(self, plot, browser, port=5888, log_level=logging.INFO, catalog=None,
+                 buffer_size=None, parent=None):
         super().__init__(parent)
 
         self.experiments = ExperimentQueue()
@@ -144,6 +247,11 @@ class Manager(QtCore.QObject):
         self.browser = browser
 
         self.port = port
+        self.catalog = catalog
+        self.buffer_size = buffer_size
+        self._buffer = None
+        self._order_task = None
+        self._ordered.connect(self._reorder)
 
     def is_running(self):
         """ Returns True if a procedure is currently running
@@ -164,6 +272,7 @@ class Manager(QtCore.QObject):
         if self.is_running():
             self._running_experiment.procedure.status = status
             self._running_experiment.browser_item.setStatus(status)
+            self.experiments.update_status(self._running_experiment)
 
     def _update_log(self, record):
         self.log.emit(record)
@@ -183,12 +292,66 @@ class Manager(QtCore.QObject):
         if self._start_on_add and not self.is_running():
             self.next()
 
+    def optimize_queue(self, costs, wait=True):
+        """ Reorders the queued experiments to reduce the time spent changing
+        parameters between them, starting from the running experiment. The
+        queue is only reordered if this reduces the time. The estimated
+        transition times in seconds before and after reordering are emitted
+        by :attr:`optimized`, and returned if wait is True.
+
+        :param costs: A list of :class:`~pymeasure.experiment.ordering.ParameterCost`
+        :param wait: If False, the order is found on a thread, so that the user
+                     interface is not blocked, and the experiments that are
+                     still queued are reordered once it is found
+        """
+        if self._order_task is not None:
+            log.info("The order of the queue is already being optimized")
+            return None
+        start = None
+        if self.is_running():
+            start = self._running_experiment.procedure.parameter_values()
+        task = OrderTask(self, self.experiments.with_status(Procedure.QUEUED), costs, start)
+        if wait:
+            task.find_order()
+            return self._reorder(task)
+        self._order_task = task
+        QtCore.QThreadPool.globalInstance().start(task)
+
+    def _reorder(self, task):
+        if task is self._order_task:
+            self._order_task = None
+        # Experiments may have started or been removed since the order was found
+        queued = [experiment for experiment in task.experiments
+                  if experiment in self.experiments and
+                  experiment.procedure.status == Procedure.QUEUED]
+        start = None
+        if self.is_running():
+            start = self._running_experiment.procedure.parameter_values()
+
+        def transition_time(experiments):
+            points = [experiment.procedure.parameter_values() for experiment in experiments]
+            return path_time(task.costs, points, start)
+
+        before = after = transition_time(queued)
+        if task.order is not None and len(queued) > 1:
+            remaining = set(queued)
+            experiments = [task.experiments[i] for i in task.order
+                           if task.experiments[i] in remaining]
+            after = transition_time(experiments)
+            if after < before:
+                self.experiments.reorder(experiments)
+                self.browser.reorder(experiments)
+                log.info("Reordered %d queued experiments", len(experiments))
+            else:
+                after = before
+        self.optimized.emit(before, after)
+        return before, after
+
     def remove(self, experiment):
         """ Removes an Experiment
         """
         self.experiments.remove(experiment)
-        self.browser.takeTopLevelItem(
-            self.browser.indexOfTopLevelItem(experiment.browser_item))
+        self.browser.remove(experiment)
         self.plot.removeItem(experiment.curve)
 
     def clear(self):
@@ -209,8 +372,11 @@ class Manager(QtCore.QObject):
                 log.debug("Manager is initiating the next experiment")
                 experiment = self.experiments.next()
                 self._running_experiment = experiment
+                if self.buffer_size:
+                    self._attach_buffer(experiment.results)
 
-                self._worker = Worker(experiment.results, port=self.port, log_level=self.log_level)
+                self._worker = Worker(experiment.results, port=self.port, log_level=self.log_level,
+                                      catalog=self.catalog)
 
                 self._monitor = Monitor(self._worker.monitor_queue)
                 self._monitor.worker_running.connect(self._running)
@@ -228,8 +394,20 @@ class Manager(QtCore.QObject):
         if self.is_running():
             self.running.emit(self._running_experiment)
 
+    def _attach_buffer(self, results):
+        """ Attaches a buffer to the results, so that the plot reads the
+        new rows without parsing the data file
+        """
+        buffer = RowBuffer(results.procedure.DATA_COLUMNS, self.buffer_size)
+        results.attach_buffer(buffer)
+        self._buffer = buffer
+
     def _clean_up(self):
         self._worker.join()
+        self._running_experiment.results.detach_buffer()
+        if self._buffer is not None:
+            self._buffer.close()
+            self._buffer = None
         del self._worker
         del self._monitor
         self._worker = None
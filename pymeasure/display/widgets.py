@@ -26,15 +26,16 @@ import logging
 
 import os
 import re
+import time
 import pyqtgraph as pg
 
 from .browser import Browser
-from .curves import ResultsCurve, Crosshairs
+from .curves import ResultsCurve, ResultsImage, Crosshairs
 from .inputs import BooleanInput, IntegerInput, ListInput, ScientificInput, StringInput
+from .loader import ResultsLoader
 from .log import LogHandler
 from .Qt import QtCore, QtGui
 from ..experiment import parameters, Procedure
-from ..experiment.results import Results
 
 log = logging.getLogger(__name__)
 log.addHandler(logging.NullHandler())
@@ -44,16 +45,27 @@ class PlotFrame(QtGui.QFrame):
     """ Combines a PyQtGraph Plot with Crosshairs. Refreshes
     the plot based on the refresh_time, and allows the axes
     to be changed on the fly, which updates the plotted data
+
+    Only curves whose data files have changed since their last update
+    are refreshed. The refresh interval adapts to the load: it backs off
+    towards the max_refresh_time while no new data arrives, and is
+    stretched so that updating the curves takes at most the LOAD_LIMIT
+    fraction of the GUI time.
+
+    :cvar LOAD_LIMIT: Maximum fraction of time spent updating curves
     """
 
     LABEL_STYLE = {'font-size': '10pt', 'font-family': 'Arial', 'color': '#000000'}
+    LOAD_LIMIT = 0.5
     updated = QtCore.QSignal()
     x_axis_changed = QtCore.QSignal(str)
     y_axis_changed = QtCore.QSignal(str)
 
-    def __init__(self, x_axis=None, y_axis=None, refresh_time=0.2, check_status=True, parent=None):
+    def __init__(self, x_axis=None, y_axis=None, refresh_time=0.2, check_status=True,
+                 parent=None, max_refresh_time=1.):
         super().__init__(parent)
         self.refresh_time = refresh_time
+        self.max_refresh_time = max(max_refresh_time, refresh_time)
         self.check_status = check_status
         self._setup_ui()
         self.change_x_axis(x_axis)
@@ -96,13 +108,31 @@ class PlotFrame(QtGui.QFrame):
         self.coordinates.setText("(%g, %g)" % (x, y))
 
     def update_curves(self):
+        start = time.perf_counter()
+        updated = False
         for item in self.plot.items:
-            if isinstance(item, ResultsCurve):
+            if isinstance(item, (ResultsCurve, ResultsImage)):
                 if self.check_status:
-                    if item.results.procedure.status == Procedure.RUNNING:
+                    if item.results.procedure.status != Procedure.RUNNING:
+                        continue
+                if item.is_stale():
+                    if isinstance(item, ResultsImage):
+                        item.update_results()
+                    else:
                         item.update()
-                else:
-                    item.update()
+                    updated = True
+        self._adapt_refresh_time(updated, time.perf_counter() - start)
+
+    def _adapt_refresh_time(self, updated, duration):
+        """ Adjusts the timer interval based on whether new data arrived
+        and how long the update took
+        """
+        interval = self.timer.interval() / 1e3
+        if updated:
+            interval = max(self.refresh_time, duration / self.LOAD_LIMIT)
+        else:
+            interval = min(2 * interval, self.max_refresh_time)
+        self.timer.setInterval(int(interval * 1e3))
 
     def parse_axis(self, axis):
         """ Returns the units of an axis by searching the string
@@ -221,6 +251,17 @@ class PlotWidget(QtGui.QWidget):
         curve.setSymbolBrush(None)
         return curve
 
+    def new_image(self, results, z, grid, **kwargs):
+        """ Returns a :class:`.ResultsImage` of the z column as a function of
+        the current x and y axes, which are binned onto the grid
+        """
+        return ResultsImage(results,
+                            x=self.plot_frame.x_axis,
+                            y=self.plot_frame.y_axis,
+                            z=z, grid=grid,
+                            **kwargs
+                            )
+
     def update_x_column(self, index):
         axis = self.columns_x.itemText(index)
         self.plot_frame.change_x_axis(axis)
@@ -333,34 +374,68 @@ class InputsWidget(QtGui.QWidget):
 
 
 class LogWidget(QtGui.QWidget):
-    def __init__(self, parent=None):
+    """ Displays the log records of a :class:`.LogHandler`, keeping at
+    most max_lines lines, from which the oldest are discarded.
+    Records below the level selected in the widget are filtered before
+    they are buffered or formatted.
+
+    :param max_lines: Maximum number of lines kept in the view
+    """
+
+    LEVELS = ['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL']
+
+    def __init__(self, parent=None, max_lines=10000):
         super().__init__(parent)
+        self.max_lines = max_lines
         self._setup_ui()
         self._layout()
 
     def _setup_ui(self):
         self.view = QtGui.QPlainTextEdit()
         self.view.setReadOnly(True)
-        self.handler = LogHandler()
+        self.view.setMaximumBlockCount(self.max_lines)
+        self.handler = LogHandler(parent=self)
         self.handler.setFormatter(logging.Formatter(
             fmt='%(asctime)s : %(message)s (%(levelname)s)',
             datefmt='%m/%d/%Y %I:%M:%S %p'
         ))
         self.handler.record.connect(self.view.appendPlainText)
 
+        self.level = QtGui.QComboBox(self)
+        self.level.addItems(self.LEVELS)
+        self.level.currentIndexChanged.connect(self.set_level)
+        self.level.setCurrentIndex(0)
+
     def _layout(self):
         vbox = QtGui.QVBoxLayout(self)
         vbox.setSpacing(0)
 
+        hbox = QtGui.QHBoxLayout()
+        hbox.addStretch()
+        hbox.addWidget(QtGui.QLabel("Level:"))
+        hbox.addWidget(self.level)
+
+        vbox.addLayout(hbox)
         vbox.addWidget(self.view)
         self.setLayout(vbox)
 
+    def set_level(self, index):
+        self.handler.setLevel(getattr(logging, self.LEVELS[index]))
+
 
 class ResultsDialog(QtGui.QFileDialog):
+    """ File dialog with a preview of the data and parameters of the
+    highlighted Results file. The preview is read in the background and
+    is limited to a decimated sample of PREVIEW_ROWS rows.
+    """
+
+    PREVIEW_ROWS = 10000
+
     def __init__(self, columns, x_axis=None, y_axis=None, parent=None):
         super().__init__(parent)
         self.columns = columns
         self.x_axis, self.y_axis = x_axis, y_axis
+        self._preview_filename = None
         self._setup_ui()
 
     def _setup_ui(self):
@@ -389,31 +464,41 @@ class ResultsDialog(QtGui.QFileDialog):
         self.setMinimumSize(900, 500)
         self.resize(900, 500)
 
+        self.loader = ResultsLoader(threads=1, parent=self)
+        self.loader.opened.connect(self.update_parameters)
+        self.loader.loaded.connect(self.update_curve)
+        self.finished.connect(self.loader.cancel_all)
+
         self.setFileMode(QtGui.QFileDialog.ExistingFiles)
         self.currentChanged.connect(self.update_plot)
 
     def update_plot(self, filename):
         self.plot.clear()
+        self.preview_param.clear()
+        if self._preview_filename is not None:
+            self.loader.cancel(self._preview_filename)
+            self._preview_filename = None
         if not os.path.isdir(filename) and filename != '':
-            try:
-                results = Results.load(str(filename))
-            except ValueError:
-                return
-            except Exception as e:
-                raise e
-
-            curve = ResultsCurve(results,
-                                 x=self.plot_widget.plot_frame.x_axis,
-                                 y=self.plot_widget.plot_frame.y_axis,
-                                 pen=pg.mkPen(color=(255, 0, 0), width=1.75),
-                                 antialias=True
-                                 )
-            curve.update()
-
-            self.plot.addItem(curve)
-
-            self.preview_param.clear()
-            for key, param in results.procedure.parameter_objects().items():
-                new_item = QtGui.QTreeWidgetItem([param.name, str(param)])
-                self.preview_param.addTopLevelItem(new_item)
-            self.preview_param.sortItems(0, QtCore.Qt.AscendingOrder)
+            self._preview_filename = os.path.abspath(str(filename))
+            self.loader.load(self._preview_filename, max_rows=self.PREVIEW_ROWS)
+
+    def update_parameters(self, results):
+        if results.data_filename != self._preview_filename:
+            return  # Another file has been highlighted in the meantime
+        for key, param in results.procedure.parameter_objects().items():
+            new_item = QtGui.QTreeWidgetItem([param.name, str(param)])
+            self.preview_param.addTopLevelItem(new_item)
+        self.preview_param.sortItems(0, QtCore.Qt.AscendingOrder)
+
+    def update_curve(self, results, data):
+        if results.data_filename != self._preview_filename:
+            return
+        curve = ResultsCurve(results,
+                             x=self.plot_widget.plot_frame.x_axis,
+                             y=self.plot_widget.plot_frame.y_axis,
+                             pen=pg.mkPen(color=(255, 0, 0), width=1.75),
+                             antialias=True
+                             )
+        curve.loading = True  # Only the sample is shown
+        curve.update_data(data)
+        self.plot.addItem(curve)
@@ -29,10 +29,10 @@ import pyqtgraph as pg
 
 from .browser import BrowserItem
 from .curves import ResultsCurve
+from .loader import ResultsLoader
 from .manager import Manager, Experiment
 from .Qt import QtCore, QtGui
 from .widgets import PlotWidget, BrowserWidget, InputsWidget, LogWidget, ResultsDialog
-from ..experiment.results import Results
 
 log = logging.getLogger(__name__)
 log.addHandler(logging.NullHandler())
@@ -112,6 +112,12 @@ class PlotterWindow(QtGui.QMainWindow):
             QtCore.QCoreApplication.instance().quit()
 
 
+def _format_duration(seconds):
+    minutes, seconds = divmod(int(round(seconds)), 60)
+    hours, minutes = divmod(minutes, 60)
+    return "%d:%02d:%02d" % (hours, minutes, seconds)
+
+
 class ManagedWindow(QtGui.QMainWindow):
     """
     Abstract base class.
@@ -138,12 +144,16 @@ class ManagedWindow(QtGui.QMainWindow):
 
     .. _pyqtgraph.PlotItem: http://www.pyqtgraph.org/documentation/graphicsItems/plotitem.html
 
+    If parameter_costs are given, as a list of
+    :class:`~pymeasure.experiment.ordering.ParameterCost`, an Optimize button
+    reorders the queued experiments to reduce the time spent changing those
+    parameters, and shows the estimated time saved.
 
     """
     EDITOR = 'gedit'
 
     def __init__(self, procedure_class, inputs=(), displays=(), x_axis=None, y_axis=None,
-                 log_channel='', log_level=logging.INFO, parent=None):
+                 log_channel='', log_level=logging.INFO, parent=None, parameter_costs=()):
         super().__init__(parent)
         app = QtCore.QCoreApplication.instance()
         app.aboutToQuit.connect(self.quit)
@@ -155,6 +165,7 @@ class ManagedWindow(QtGui.QMainWindow):
         log.setLevel(log_level)
         self.log.setLevel(log_level)
         self.x_axis, self.y_axis = x_axis, y_axis
+        self.parameter_costs = parameter_costs
         self._setup_ui()
         self._layout()
         self.setup_plot(self.plot)
@@ -171,6 +182,11 @@ class ManagedWindow(QtGui.QMainWindow):
         self.abort_button.setEnabled(False)
         self.abort_button.clicked.connect(self.abort)
 
+        self.optimize_button = QtGui.QPushButton('Optimize', self)
+        self.optimize_button.setToolTip("Reorder the queue to reduce the time spent changing parameters")
+        self.optimize_button.setVisible(bool(self.parameter_costs))
+        self.optimize_button.clicked.connect(self.optimize_queue)
+
         self.plot_widget = PlotWidget(self.procedure_class.DATA_COLUMNS, self.x_axis, self.y_axis)
         self.plot = self.plot_widget.plot
 
@@ -201,8 +217,17 @@ class ManagedWindow(QtGui.QMainWindow):
         self.manager.queued.connect(self.queued)
         self.manager.running.connect(self.running)
         self.manager.finished.connect(self.finished)
+        self.manager.optimized.connect(self.queue_optimized)
         self.manager.log.connect(self.log.handle)
 
+        self.loader = ResultsLoader(parent=self)
+        self.loader.opened.connect(self._loader_opened)
+        self.loader.progress.connect(self._loader_progress)
+        self.loader.chunk.connect(self._loader_chunk)
+        self.loader.loaded.connect(self._loader_loaded)
+        self.loader.failed.connect(self._loader_failed)
+        self._loading = {}
+
     def _layout(self):
         self.main = QtGui.QWidget(self)
 
@@ -214,6 +239,7 @@ class ManagedWindow(QtGui.QMainWindow):
         hbox.setContentsMargins(-1, 6, -1, 6)
         hbox.addWidget(self.queue_button)
         hbox.addWidget(self.abort_button)
+        hbox.addWidget(self.optimize_button)
         hbox.addStretch()
 
         inputs_vbox.addWidget(self.inputs)
@@ -245,6 +271,7 @@ class ManagedWindow(QtGui.QMainWindow):
         self.resize(1000, 800)
 
     def quit(self, evt=None):
+        self.loader.cancel_all()
         self.close()
 
     def browser_item_changed(self, item, column):
@@ -304,18 +331,16 @@ class ManagedWindow(QtGui.QMainWindow):
                                            QtGui.QMessageBox.Yes |
                                            QtGui.QMessageBox.No, QtGui.QMessageBox.No)
         if reply == QtGui.QMessageBox.Yes:
+            if self._loading.pop(experiment.data_filename, None) is not None:
+                self.loader.cancel(experiment.data_filename)
             self.manager.remove(experiment)
 
     def show_experiments(self):
-        root = self.browser.invisibleRootItem()
-        for i in range(root.childCount()):
-            item = root.child(i)
+        for item in self.browser.items():
             item.setCheckState(0, QtCore.Qt.Checked)
 
     def hide_experiments(self):
-        root = self.browser.invisibleRootItem()
-        for i in range(root.childCount()):
-            item = root.child(i)
+        for item in self.browser.items():
             item.setCheckState(0, QtCore.Qt.Unchecked)
 
     def clear_experiments(self):
@@ -326,19 +351,48 @@ class ManagedWindow(QtGui.QMainWindow):
         if dialog.exec_():
             filenames = dialog.selectedFiles()
             for filename in map(str, filenames):
-                if filename in self.manager.experiments:
+                if filename in self.manager.experiments or self.loader.is_loading(filename):
                     QtGui.QMessageBox.warning(self, "Load Error",
                                               "The file %s cannot be opened twice." % os.path.basename(
                                                   filename))
                 elif filename == '':
                     return
                 else:
-                    results = Results.load(filename)
-                    experiment = self.new_experiment(results)
-                    experiment.curve.update()
-                    experiment.browser_item.progressbar.setValue(100.)
-                    self.manager.load(experiment)
-                    log.info('Opened data file %s' % filename)
+                    # The data is read in the background and shown as it arrives
+                    self.loader.load(filename)
+
+    def _loader_opened(self, results):
+        experiment = self.new_experiment(results)
+        experiment.curve.loading = True
+        self._loading[results.data_filename] = experiment
+        self.manager.load(experiment)
+        log.info('Opened data file %s' % results.data_filename)
+
+    def _loader_progress(self, results, progress):
+        experiment = self._loading.get(results.data_filename)
+        if experiment is not None:
+            experiment.browser_item.setProgress(progress)
+
+    def _loader_chunk(self, results, data):
+        experiment = self._loading.get(results.data_filename)
+        if experiment is not None:
+            experiment.curve.update_data(data)
+
+    def _loader_loaded(self, results, data):
+        experiment = self._loading.pop(results.data_filename, None)
+        if experiment is not None:
+            experiment.curve.loading = False
+            experiment.curve.update_data(data)
+            experiment.browser_item.setProgress(100.)
+            log.info('Loaded data file %s' % results.data_filename)
+
+    def _loader_failed(self, filename, message):
+        experiment = self._loading.pop(filename, None)
+        if experiment is not None:
+            self.manager.remove(experiment)
+        QtGui.QMessageBox.warning(self, "Load Error",
+                                  "The file %s could not be opened: %s" % (
+                                      os.path.basename(filename), message))
 
     def change_color(self, experiment):
         color = QtGui.QColorDialog.getColor(
@@ -362,7 +416,7 @@ class ManagedWindow(QtGui.QMainWindow):
 
     def new_curve(self, results, color=None, **kwargs):
         if color is None:
-            color = pg.intColor(self.browser.topLevelItemCount() % 8)
+            color = pg.intColor(self.browser.model().rowCount() % 8)
         return self.plot_widget.new_curve(results, color=color, **kwargs)
 
     def new_experiment(self, results, curve=None):
@@ -456,6 +510,24 @@ class ManagedWindow(QtGui.QMainWindow):
     def running(self, experiment):
         self.browser_widget.clear_button.setEnabled(False)
 
+    def optimize_queue(self):
+        """ Starts reordering the queued experiments based on the
+        parameter_costs, on a thread so that the window stays responsive
+        """
+        self.optimize_button.setEnabled(False)
+        self.statusBar().showMessage("Optimizing the order of the queue")
+        self.manager.optimize_queue(self.parameter_costs, wait=False)
+
+    def queue_optimized(self, before, after):
+        """ Shows the estimated time saved by reordering the queue in the
+        status bar
+        """
+        self.optimize_button.setEnabled(True)
+        message = ("Estimated parameter transition time %s, reduced by %s" % (
+            _format_duration(after), _format_duration(before - after)))
+        log.info(message)
+        self.statusBar().showMessage(message)
+
     def abort_returned(self, experiment):
         if self.manager.experiments.has_next():
             self.abort_button.setText("Resume")
@@ -22,11 +22,38 @@
 # THE SOFTWARE.
 #
 
+import sys
+
 from .parameters import (Parameter, IntegerParameter, FloatParameter,
                         VectorParameter, ListParameter, BooleanParameter, Measurable)
 from .procedure import Procedure, UnknownProcedure
 from .results import Results, unique_filename
 from .workers import Worker
 from .listeners import Listener, Recorder
+from .catalog import Catalog
+from .dataset import Dataset
 from .config import get_config
-from .experiment import Experiment, get_array, get_array_steps, get_array_zero
\ No newline at end of file
+from .grid import BinnedGrid
+from .analysis import Stage, Derived, Rolling, Pipeline
+from .sweeps import Plan, Sweep, Product, Zip, Hysteresis
+from .adaptive import Adaptive1D, Adaptive2D
+
+# The Experiment for notebooks is imported when it is first used, since it
+# depends on IPython and matplotlib
+_LAZY = ('Experiment', 'get_array', 'get_array_steps', 'get_array_zero')
+
+
+if sys.version_info < (3, 7):
+    # Module attributes can only be looked up lazily from Python 3.7
+    from .experiment import Experiment, get_array, get_array_steps, get_array_zero
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        from . import experiment
+        return getattr(experiment, name)
+    raise AttributeError("module '%s' has no attribute '%s'" % (__name__, name))
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY))
\ No newline at end of file
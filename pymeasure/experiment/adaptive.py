@@ -0,0 +1,273 @@
+#
+# This file is part of the PyMeasure package.
+#
+# Copyright (c) 2013-2017 PyMeasure Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+
+import bisect
+import logging
+from collections import deque
+
+import numpy as np
+
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+
+class Sampler(object):
+    """ Base class of the adaptive samplers, which choose each setpoint
+    based on the values measured so far, so that more points are placed
+    where the measured column changes the most.
+
+    A sampler generates points as dictionaries of the setpoints by axis
+    name, and is told the measured value of each point, either directly
+    through :meth:`.tell` or by attaching it to a procedure, so that the
+    records it emits are fed to the sampler. It stops after the budget of
+    points, or when the largest loss is below the tolerance.
+
+    .. code-block:: python
+
+        def execute(self):
+            sampler = Adaptive1D('Frequency (Hz)', (1e3, 1e6), 'Amplitude (V)', budget=200)
+            sampler.attach(self)
+            for point in self.sweep(sampler):
+                self.lockin.frequency = point['Frequency (Hz)']
+                self.emit('results', {
+                    'Frequency (Hz)': point['Frequency (Hz)'],
+                    'Amplitude (V)': self.lockin.magnitude
+                })
+
+    Samplers can be passed to :meth:`Procedure.sweep <pymeasure.experiment.procedure.Procedure.sweep>`,
+    which emits the progress based on the budget.
+
+    :param names: The names of the axes
+    :param column: The name of the measured column that is refined
+    :param budget: The maximum number of points
+    :param tolerance: The loss below which no more points are sampled,
+                      or None to always use the full budget
+    :param settle: The time in seconds to wait before each point
+    """
+
+    def __init__(self, names, column, budget=100, tolerance=None, settle=0.):
+        self.names = tuple(names)
+        self.column = column
+        self.budget = budget
+        self.tolerance = tolerance
+        self.settle = settle
+        self.count = 0
+        self.pending = set()
+
+    def __len__(self):
+        return self.budget
+
+    def __iter__(self):
+        while True:
+            point = self.ask()
+            if point is None:
+                return
+            yield point
+
+    def steps(self):
+        """ Generates tuples of each point and the settle time """
+        for point in self:
+            yield point, self.settle
+
+    def ask(self):
+        """ Returns the next point, or None if the sampling has finished """
+        if self.count >= self.budget:
+            return None
+        values = self._ask()
+        if values is None:
+            return None
+        self.count += 1
+        self.pending.add(values)
+        return dict(zip(self.names, values))
+
+    def tell(self, point, value):
+        """ Records the measured value of a point
+
+        :param point: A dictionary of the setpoints by axis name
+        :param value: The measured value
+        """
+        values = tuple(float(point[name]) for name in self.names)
+        self.pending.discard(values)
+        self._tell(values, float(value))
+
+    def feed(self, record):
+        """ Records the measured value of an emitted record, if it contains
+        the setpoints and the measured column
+        """
+        if self.column in record and all(name in record for name in self.names):
+            self.tell(record, record[self.column])
+
+    def attach(self, procedure):
+        """ Feeds the records emitted by the procedure to the sampler. This
+        should be called in the startup or execute method, after the
+        procedure is connected to a worker.
+        """
+        emit = procedure.emit
+
+        def emit_and_feed(topic, record):
+            if topic == 'results':
+                self.feed(record)
+            emit(topic, record)
+
+        procedure.emit = emit_and_feed
+
+    def _ask(self):
+        raise NotImplementedError("Samplers must implement _ask")
+
+    def _tell(self, values, value):
+        raise NotImplementedError("Samplers must implement _tell")
+
+    def _finished(self, loss):
+        return self.tolerance is not None and loss < self.tolerance
+
+
+class Adaptive1D(Sampler):
+    """ Samples a single axis, starting from evenly spaced points and
+    then splitting the interval with the largest loss. The loss of an
+    interval is its length in the plane of the setpoint and measured
+    value, each scaled by their range, plus the curvature weighted area
+    of the triangles that it forms with the neighbouring points.
+    Untold points are assumed to lie on the line of their neighbours.
+
+    :param name: The name of the axis
+    :param bounds: Tuple of the lower and upper setpoints
+    :param column: The name of the measured column that is refined
+    :param initial: The number of evenly spaced initial points
+    :param min_step: The minimum distance between setpoints
+    :param curvature: The weight of the curvature in the loss
+    """
+
+    def __init__(self, name, bounds, column, initial=10, min_step=0., curvature=0.5, **kwargs):
+        super().__init__((name,), column, **kwargs)
+        self.bounds = (float(min(bounds)), float(max(bounds)))
+        self.min_step = min_step
+        self.curvature = curvature
+        self._queue = deque((x,) for x in np.linspace(*self.bounds, num=max(initial, 2)))
+        self.x, self.y = [], []
+
+    def _tell(self, values, value):
+        x = values[0]
+        index = bisect.bisect_left(self.x, x)
+        if index < len(self.x) and self.x[index] == x:
+            self.y[index] = value
+        else:
+            self.x.insert(index, x)
+            self.y.insert(index, value)
+
+    def losses(self):
+        """ Returns the setpoints and the losses of the intervals between them """
+        x = np.array(sorted(set(self.x) | set(v for v, in self.pending)))
+        if len(self.x) < 2 or len(x) < 2:
+            return x, np.array([])
+        y = np.interp(x, self.x, self.y)
+        xs = (x - x[0]) / ((x[-1] - x[0]) or 1.)
+        ys = (y - y.min()) / ((y.max() - y.min()) or 1.)
+        dx, dy = np.diff(xs), np.diff(ys)
+        loss = np.hypot(dx, dy)
+        if self.curvature and len(x) > 2:
+            # Areas of the triangles of consecutive points
+            area = 0.5 * np.abs(dx[:-1] * dy[1:] - dx[1:] * dy[:-1])
+            loss[:-1] += self.curvature * area
+            loss[1:] += self.curvature * area
+        loss[np.diff(x) < 2 * self.min_step] = 0.
+        return x, loss
+
+    def _ask(self):
+        if self._queue:
+            return self._queue.popleft()
+        x, loss = self.losses()
+        if len(loss) == 0 or loss.max() <= 0 or self._finished(loss.max()):
+            return None
+        index = int(np.argmax(loss))
+        return (0.5 * (x[index] + x[index + 1]),)
+
+
+class Adaptive2D(Sampler):
+    """ Samples two axes by refining a grid of rectangular cells. Cells
+    are split into four once the values at their corners are measured,
+    starting with the cell with the largest loss. The loss of a cell
+    grows with its size and with the spread of its corner values,
+    scaled by the range of all values, so that flat regions are only
+    refined after the regions with large changes.
+
+    :param names: Tuple of the names of the x and y axes
+    :param bounds: Tuple of the (lower, upper) setpoints of each axis
+    :param column: The name of the measured column that is refined
+    :param initial: Tuple of the number of initial cells along each axis
+    :param uniform: The weight of the cell size relative to the change
+    """
+
+    def __init__(self, names, bounds, column, initial=(4, 4), uniform=0.1, **kwargs):
+        super().__init__(names, column, **kwargs)
+        self.bounds = tuple((float(min(b)), float(max(b))) for b in bounds)
+        self.uniform = uniform
+        self.values = {}
+        xs = np.linspace(*self.bounds[0], num=initial[0] + 1)
+        ys = np.linspace(*self.bounds[1], num=initial[1] + 1)
+        self.cells = [(x0, x1, y0, y1) for x0, x1 in zip(xs, xs[1:])
+                      for y0, y1 in zip(ys, ys[1:])]
+        self._queue = deque((float(x), float(y)) for x in xs for y in ys)
+
+    def _tell(self, values, value):
+        self.values[values] = value
+
+    @staticmethod
+    def _corners(cell):
+        x0, x1, y0, y1 = cell
+        return (x0, y0), (x0, y1), (x1, y0), (x1, y1)
+
+    def losses(self):
+        """ Returns the cells whose corners are measured and their losses """
+        cells = [c for c in self.cells if all(p in self.values for p in self._corners(c))]
+        if not cells or not self.values:
+            return cells, np.array([])
+        z = np.array(list(self.values.values()))
+        scale = (z.max() - z.min()) or 1.
+        width = self.bounds[0][1] - self.bounds[0][0] or 1.
+        height = self.bounds[1][1] - self.bounds[1][0] or 1.
+        loss = []
+        for cell in cells:
+            corners = [self.values[p] for p in self._corners(cell)]
+            size = np.sqrt((cell[1] - cell[0]) * (cell[3] - cell[2]) / (width * height))
+            loss.append(size * ((max(corners) - min(corners)) / scale + self.uniform))
+        return cells, np.array(loss)
+
+    def _ask(self):
+        while not self._queue:
+            cells, loss = self.losses()
+            if len(loss) == 0 or self._finished(loss.max()):
+                return None
+            self._split(cells[int(np.argmax(loss))])
+        return self._queue.popleft()
+
+    def _split(self, cell):
+        x0, x1, y0, y1 = cell
+        xm, ym = 0.5 * (x0 + x1), 0.5 * (y0 + y1)
+        self.cells.remove(cell)
+        self.cells.extend([(x0, xm, y0, ym), (x0, xm, ym, y1),
+                           (xm, x1, y0, ym), (xm, x1, ym, y1)])
+        for point in [(xm, ym), (xm, y0), (xm, y1), (x0, ym), (x1, ym)]:
+            if point not in self.values and point not in self.pending \
+                    and point not in self._queue:
+                self._queue.append(point)
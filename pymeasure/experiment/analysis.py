@@ -0,0 +1,253 @@
+#
+# This file is part of the PyMeasure package.
+#
+# Copyright (c) 2013-2017 PyMeasure Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+
+import logging
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+
+class Stage(object):
+    """ Base class of an incremental analysis stage, which receives only
+    the blocks of rows that were appended to the data since the previous
+    block. Stages that depend on earlier rows keep the state they need
+    between blocks, and forget it when they are reset.
+
+    Inheriting classes should define the :meth:`.process` method, and
+    :meth:`.reset` if they keep state.
+    """
+
+    def process(self, block):
+        """ Returns the block of rows with the analysed columns added
+
+        :param block: A DataFrame of the new rows
+        """
+        raise NotImplementedError("Stages must implement process")
+
+    def reset(self):
+        """ Forgets the state of earlier blocks """
+        pass
+
+
+class Derived(Stage):
+    """ Adds a column that is calculated from the other columns of the
+    same row, for example the resistance from voltage and current.
+
+    .. code-block:: python
+
+        Derived('Resistance (Ohm)', lambda data: data['Voltage (V)'] / data['Current (A)'])
+
+    :param name: The name of the new column
+    :param function: Function of a DataFrame that returns the new column
+    """
+
+    def __init__(self, name, function):
+        self.name = name
+        self.function = function
+
+    def process(self, block):
+        block[self.name] = self.function(block)
+        return block
+
+
+class Rolling(Stage):
+    """ Adds a column with a rolling window function (e.g. a moving
+    average) of another column. The last window - 1 values are carried
+    over between blocks, so that the result is identical to applying the
+    window to all data at once.
+
+    :param column: The name of the column to filter
+    :param window: The number of rows in the window
+    :param method: The name of the pandas Rolling method (e.g. 'mean',
+                   'median', 'std')
+    :param name: The name of the new column, which defaults to the column
+                 name followed by the method
+    """
+
+    def __init__(self, column, window, method='mean', name=None):
+        self.column = column
+        self.window = int(window)
+        self.method = method
+        self.name = name or "%s %s" % (column, method)
+        self.reset()
+
+    def reset(self):
+        self._tail = pd.Series(dtype=float)
+
+    def process(self, block):
+        values = pd.concat([self._tail, block[self.column]], ignore_index=True)
+        rolling = values.rolling(self.window, min_periods=1)
+        result = getattr(rolling, self.method)()
+        block[self.name] = result.values[len(self._tail):]
+        if self.window > 1:
+            self._tail = values.iloc[-(self.window - 1):]
+        return block
+
+
+class FrameBuffer(object):
+    """ Collects blocks of rows in a column array for each column, whose
+    capacity is doubled when it is full, so that appending a block only
+    costs time proportional to its rows. The rows are returned as a
+    DataFrame of views of the arrays, which is not copied.
+
+    :param capacity: The initial number of rows of the arrays
+    """
+
+    def __init__(self, capacity=1024):
+        self.capacity = max(int(capacity), 1)
+        self.clear()
+
+    def clear(self):
+        """ Removes all rows """
+        self._arrays = None
+        self._dtypes = None
+        self._size = 0
+        self._frame = None
+
+    def __len__(self):
+        return self._size
+
+    def append(self, block):
+        """ Appends the rows of a DataFrame. If its columns differ from those
+        of the earlier blocks, all rows are copied once to new arrays.
+
+        :param block: A DataFrame of the new rows
+        """
+        if self._arrays is not None and list(block.columns) != list(self._arrays):
+            frame = pd.concat([self.frame, block], ignore_index=True)
+            self.clear()
+            block = frame
+        if self._arrays is None:
+            self._dtypes = block.dtypes
+            self._arrays = OrderedDict(
+                (column, np.empty(max(self.capacity, len(block)), dtype=self._dtype(column)))
+                for column in block.columns
+            )
+        size = self._size + len(block)
+        capacity = len(next(iter(self._arrays.values()), ()))
+        if size > capacity:
+            capacity = max(size, 2 * capacity)
+            for column, array in self._arrays.items():
+                self._arrays[column] = self._resized(array, capacity, array.dtype)
+        for column in block.columns:
+            values = np.asarray(block[column].values)
+            array = self._arrays[column]
+            dtype = np.result_type(array.dtype, values.dtype)
+            if dtype != array.dtype:  # For example integers followed by floats
+                array = self._arrays[column] = self._resized(array, len(array), dtype)
+            array[self._size:size] = values
+        self._size = size
+        self._frame = None
+
+    def _dtype(self, column):
+        dtype = self._dtypes[column]
+        return dtype if isinstance(dtype, np.dtype) else np.dtype(object)
+
+    def _resized(self, array, capacity, dtype):
+        resized = np.empty(capacity, dtype=dtype)
+        resized[:self._size] = array[:self._size]
+        return resized
+
+    @property
+    def frame(self):
+        """ A DataFrame of the rows """
+        if self._arrays is None:
+            return pd.DataFrame()
+        if self._frame is None:
+            frame = pd.DataFrame(OrderedDict(
+                (column, array[:self._size]) for column, array in self._arrays.items()
+            ), copy=False)
+            for column, dtype in self._dtypes.items():
+                if not isinstance(dtype, np.dtype):  # Extension types are stored as objects
+                    frame[column] = frame[column].astype(dtype)
+            self._frame = frame
+        return self._frame
+
+    def tail(self, start):
+        """ Returns a DataFrame of the rows from the start index onwards
+
+        :param start: The index of the first row
+        """
+        return self.frame.iloc[start:]
+
+
+class Pipeline(object):
+    """ Applies a sequence of :class:`.Stage` objects to blocks of new
+    rows. A Pipeline can be used as the analyse function of an
+    :class:`.Experiment`, which only passes the new rows on each update.
+
+    .. code-block:: python
+
+        pipeline = Pipeline(
+            Derived('Resistance (Ohm)', lambda data: data['Voltage (V)'] / data['Current (A)']),
+            Rolling('Resistance (Ohm)', window=10)
+        )
+        experiment = Experiment('Sample', procedure, analyse=pipeline)
+
+    Outside of an Experiment, :meth:`.update` analyses the new rows of
+    the full data and appends them to the analysed data in a
+    :class:`.FrameBuffer`.
+
+    :param stages: The stages, which are applied in order
+    """
+
+    def __init__(self, *stages):
+        self.stages = list(stages)
+        self._buffer = FrameBuffer()
+        self._rows = 0
+
+    def __call__(self, block):
+        for stage in self.stages:
+            block = stage.process(block)
+        return block
+
+    def reset(self):
+        """ Resets all stages and forgets the analysed data """
+        for stage in self.stages:
+            stage.reset()
+        self._buffer.clear()
+        self._rows = 0
+
+    @property
+    def data(self):
+        """ A DataFrame of the data analysed by :meth:`.update` """
+        return self._buffer.frame
+
+    def update(self, data):
+        """ Analyses the rows of the data that were added since the last
+        update and returns all analysed data
+
+        :param data: The full DataFrame, to which rows have been appended
+        """
+        if len(data) < self._rows:  # The data has been replaced
+            self.reset()
+        if len(data) > self._rows:
+            block = self(data.iloc[self._rows:].copy())
+            self._rows = len(data)
+            self._buffer.append(block)
+        return self.data
@@ -0,0 +1,329 @@
+#
+# This file is part of the PyMeasure package.
+#
+# Copyright (c) 2013-2017 PyMeasure Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+
+import logging
+import os
+import sqlite3
+from fnmatch import fnmatch
+from threading import RLock
+
+from .compression import open_data
+from .results import Results
+
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    filename TEXT PRIMARY KEY,
+    directory TEXT NOT NULL,
+    module TEXT,
+    procedure TEXT,
+    status INTEGER,
+    rows INTEGER,
+    size INTEGER,
+    mtime REAL
+);
+CREATE TABLE IF NOT EXISTS parameters (
+    filename TEXT NOT NULL,
+    name TEXT NOT NULL,
+    value TEXT,
+    number REAL,
+    units TEXT,
+    PRIMARY KEY (filename, name)
+);
+CREATE INDEX IF NOT EXISTS runs_directory ON runs (directory);
+CREATE INDEX IF NOT EXISTS runs_procedure ON runs (procedure);
+CREATE INDEX IF NOT EXISTS parameters_number ON parameters (name, number);
+"""
+
+
+def count_rows(data_filename):
+    """ Returns the number of data rows in a file, by counting the complete
+    lines that are not comments or the column labels
+
+    :param data_filename: Path of the data file
+    """
+    lines = comments = 0
+    last = b'\n'
+    with open_data(data_filename) as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            lines += block.count(b'\n')
+            comments += (last + block).count(b'\n' + Results.COMMENT.encode())
+            last = block[-1:]
+    return max(lines - comments - 1, 0)
+
+
+def _number(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class Catalog(object):
+    """ Indexes the Results files of one or more data directories in an
+    SQLite database, which records the Procedure class, parameters, status,
+    number of rows and size of each file. Past runs can then be found
+    without opening the files. A :class:`.Recorder` that is given a Catalog
+    keeps the entry of its Results up to date while the data is recorded.
+
+    .. code-block:: python
+
+        catalog = Catalog('catalog.db')
+        catalog.scan('data')
+        filenames = catalog.find('IVProcedure', where={'Temperature': ('<', 4)})
+
+    The status of a file is only known if it was recorded with the Catalog,
+    and is None for files that were added by scanning.
+
+    :param path: Path of the database file, or ':memory:' for a Catalog
+                 that is not stored
+    """
+
+    OPERATORS = ('=', '!=', '<', '<=', '>', '>=')
+
+    def __init__(self, path=':memory:'):
+        self.path = path
+        self._lock = RLock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.executescript(SCHEMA)
+
+    def close(self):
+        """ Closes the database """
+        with self._lock:
+            self._connection.close()
+
+    def _execute(self, *statements):
+        """ Executes the statements in one transaction and returns the rows
+        of the last one
+        """
+        with self._lock, self._connection:
+            for statement in statements:
+                cursor = self._connection.execute(*statement)
+            return cursor.fetchall()
+
+    def _write(self, filename, module, procedure, parameters, status, rows):
+        """ Inserts or replaces the entry of a file, where parameters is a
+        dictionary of the (value, units) of each parameter
+        """
+        stat = os.stat(filename)
+        with self._lock, self._connection:
+            # INSERT OR IGNORE and UPDATE, rather than an upsert, which
+            # needs SQLite 3.24
+            self._connection.execute(
+                "INSERT OR IGNORE INTO runs (filename, directory) VALUES (?, ?)",
+                (filename, os.path.dirname(filename)))
+            self._connection.execute(
+                "UPDATE runs SET module=?, procedure=?, status=COALESCE(?, status), "
+                "rows=?, size=?, mtime=? WHERE filename=?",
+                (module, procedure, status, rows, stat.st_size, stat.st_mtime, filename))
+            self._connection.execute("DELETE FROM parameters WHERE filename=?", (filename,))
+            self._connection.executemany(
+                "INSERT INTO parameters VALUES (?, ?, ?, ?, ?)",
+                [(filename, name, str(value), _number(value), units)
+                 for name, (value, units) in parameters.items()])
+
+    def add(self, data_filename, status=None):
+        """ Adds a data file to the Catalog, or refreshes its entry, by
+        reading only its header and counting its rows
+
+        :param data_filename: Path of the data file
+        :param status: The status of the Procedure, or None if unknown
+        """
+        filename = os.path.abspath(data_filename)
+        header = Results.read_header(filename)[0]
+        module, procedure, parameters = Results.parse_header_fields(header)
+        rows = count_rows(filename)
+        self._write(filename, module, procedure, parameters, status, rows)
+
+    def record(self, results, status=None):
+        """ Adds the data files of a Results object to the Catalog, using
+        its Procedure instead of reading the files
+
+        :param results: A :class:`.Results` object
+        :param status: The status of the Procedure, or None to use the
+                       current status of the Procedure
+        """
+        procedure = results.procedure
+        if status is None:
+            status = procedure.status
+        parameters = {}
+        for parameter in results.parameters.values():
+            parameters[parameter.name] = (parameter.value, getattr(parameter, 'units', None))
+        cls = results.procedure_class
+        for data_filename in results.data_filenames:
+            self._write(os.path.abspath(data_filename), cls.__module__,
+                        cls.__name__, parameters, status, 0)
+
+    def update(self, data_filename, rows=None, status=None):
+        """ Updates the number of rows, size and status of a file that is
+        already in the Catalog
+
+        :param data_filename: Path of the data file
+        :param rows: The number of rows, or None to count them
+        :param status: The status of the Procedure, or None to keep the
+                       current status
+        """
+        filename = os.path.abspath(data_filename)
+        if rows is None:
+            rows = count_rows(filename)
+        stat = os.stat(filename)
+        self._execute((
+            "UPDATE runs SET rows=?, size=?, mtime=?, status=COALESCE(?, status) "
+            "WHERE filename=?",
+            (rows, stat.st_size, stat.st_mtime, status, filename)))
+
+    def remove(self, data_filename):
+        """ Removes a data file from the Catalog
+
+        :param data_filename: Path of the data file
+        """
+        filename = os.path.abspath(data_filename)
+        self._execute(
+            ("DELETE FROM parameters WHERE filename=?", (filename,)),
+            ("DELETE FROM runs WHERE filename=?", (filename,)))
+
+    def scan(self, directory, pattern=('*.csv', '*.csv.gz'), recursive=False):
+        """ Adds the data files of a directory that are new or have changed
+        since they were cataloged, and removes files that no longer exist.
+        Returns the number of files that were read.
+
+        :param directory: The data directory
+        :param pattern: The pattern, or a tuple of patterns, of the file
+                        names to include
+        :param recursive: Also scan subdirectories if True
+        """
+        directory = os.path.abspath(directory)
+        if isinstance(pattern, str):
+            pattern = (pattern,)
+        query = "SELECT filename, size, mtime FROM runs WHERE directory=?"
+        args = (directory,)
+        if recursive:
+            query += " OR directory LIKE ?"
+            args += (os.path.join(directory, '%'),)
+        known = {row[0]: row[1:] for row in self._execute((query, args))}
+
+        found = set()
+        read = 0
+        for root, directories, files in os.walk(directory):
+            for name in files:
+                if not any(fnmatch(name, p) for p in pattern):
+                    continue
+                filename = os.path.join(root, name)
+                found.add(filename)
+                stat = os.stat(filename)
+                if known.get(filename) == (stat.st_size, stat.st_mtime):
+                    continue
+                try:
+                    self.add(filename)
+                    read += 1
+                except Exception:
+                    log.warning("Could not add '%s' to the catalog", filename, exc_info=True)
+            if not recursive:
+                break
+
+        for filename in set(known) - found:
+            self.remove(filename)
+        return read
+
+    def find(self, procedure=None, status=None, where=None, directory=None):
+        """ Returns the sorted list of file names that match all of the
+        conditions given
+
+        .. code-block:: python
+
+            catalog.find('IVProcedure', where={
+                'Temperature': ('<', 4),
+                'Sample': 'A1',
+            })
+
+        :param procedure: The name of the Procedure class, with or without
+                          its module
+        :param status: The status of the Procedure
+        :param where: A dictionary of conditions on the parameters, which are
+                      keyed by the parameter name. A condition is either a
+                      value to compare to, or a tuple of an operator from
+                      :attr:`.OPERATORS` and a value. Numbers are compared
+                      numerically and other values as text.
+        :param directory: The data directory
+        """
+        query = ["SELECT filename FROM runs WHERE 1"]
+        args = []
+        if procedure is not None:
+            query.append("AND (procedure=? OR module || '.' || procedure=?)")
+            args += [procedure, procedure]
+        if status is not None:
+            query.append("AND status=?")
+            args.append(status)
+        if directory is not None:
+            query.append("AND directory=?")
+            args.append(os.path.abspath(directory))
+        for name, condition in (where or {}).items():
+            if isinstance(condition, tuple):
+                operator, value = condition
+            else:
+                operator, value = '=', condition
+            if operator not in self.OPERATORS:
+                raise ValueError("Invalid operator '%s' for parameter '%s'" % (operator, name))
+            column = 'value' if _number(value) is None else 'number'
+            if column == 'number':
+                value = float(value)
+            else:
+                value = str(value)
+            query.append("AND filename IN (SELECT filename FROM parameters "
+                         "WHERE name=? AND %s %s ?)" % (column, operator))
+            args += [name, value]
+        query.append("ORDER BY filename")
+        return [row[0] for row in self._execute((" ".join(query), args))]
+
+    def parameters(self, data_filename):
+        """ Returns a dictionary of the (value, units) of each parameter of
+        a cataloged file
+
+        :param data_filename: Path of the data file
+        """
+        rows = self._execute((
+            "SELECT name, value, units FROM parameters WHERE filename=?",
+            (os.path.abspath(data_filename),)))
+        return {name: (value, units) for name, value, units in rows}
+
+    def info(self, data_filename):
+        """ Returns a dictionary of the Procedure class, status, number of
+        rows and size of a cataloged file, or None if it is not cataloged
+
+        :param data_filename: Path of the data file
+        """
+        rows = self._execute((
+            "SELECT module, procedure, status, rows, size FROM runs WHERE filename=?",
+            (os.path.abspath(data_filename),)))
+        if not rows:
+            return None
+        return dict(zip(('module', 'procedure', 'status', 'rows', 'size'), rows[0]))
+
+    def __len__(self):
+        return self._execute(("SELECT COUNT(*) FROM runs",))[0][0]
+
+    def __contains__(self, data_filename):
+        return self.info(data_filename) is not None
@@ -0,0 +1,359 @@
+#
+# This file is part of the PyMeasure package.
+#
+# Copyright (c) 2013-2017 PyMeasure Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+
+import io
+import logging
+import os
+import threading
+import time
+import zlib
+
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+COMPRESSED_EXTENSIONS = ('.gz',)
+
+
+def is_compressed(filename):
+    """ Returns True if the data file is compressed, based on its extension """
+    return filename.endswith(COMPRESSED_EXTENSIONS)
+
+
+class MemberReader(io.RawIOBase):
+    """ Reads the decompressed data of a gzip file that consists of
+    independently compressed members. Only complete members are read, so
+    that a member that is still being written, or that was torn by a crash,
+    is skipped. Reading continues from the end of the last complete member,
+    which allows a file to be tailed while it grows.
+
+    The compressed data is read in blocks, which hold many small members,
+    and a block is only read again if a member did not fit in it.
+
+    :param filename: The compressed filename
+    :param offset: The byte offset of the first member to read
+    """
+
+    BLOCK_SIZE = 1 << 14
+
+    def __init__(self, filename, offset=0):
+        super().__init__()
+        self.file = open(filename, 'rb')
+        self.file.seek(offset)
+        self.offset = offset
+        self._compressed = b''  # Data read from the file after the offset
+        self._member = b''
+        self._position = 0
+
+    def readable(self):
+        return True
+
+    def tell(self):
+        """ Returns the byte offset in the compressed file of the end of the
+        last member that was read
+        """
+        return self.offset
+
+    def read_member(self):
+        """ Returns the data of the next complete member, or None """
+        while True:
+            decompressor = zlib.decompressobj(zlib.MAX_WBITS | 16)
+            try:
+                data = decompressor.decompress(self._compressed)
+            except zlib.error:
+                log.warning("Skipping a corrupt member at byte %d of %s",
+                            self.offset, self.file.name)
+                return None
+            if decompressor.eof:
+                self.offset += len(self._compressed) - len(decompressor.unused_data)
+                self._compressed = decompressor.unused_data
+                return data
+            # The member continues past the data that was read, so read at
+            # least as much again, to decompress large members in linear time
+            block = self.file.read(max(self.BLOCK_SIZE, len(self._compressed)))
+            if not block:
+                return None
+            self._compressed += block
+
+    def readinto(self, buffer):
+        while self._position == len(self._member):
+            member = self.read_member()
+            if member is None:
+                return 0
+            self._member, self._position = member, 0
+        size = min(len(buffer), len(self._member) - self._position)
+        buffer[:size] = self._member[self._position:self._position + size]
+        self._position += size
+        return size
+
+    def close(self):
+        self.file.close()
+        super().close()
+
+
+class LineReader(io.RawIOBase):
+    """ Reads the complete lines of a file. A last line without a line
+    break, which is still being written or was torn by a crash, is held
+    back until it is completed.
+
+    :param filename: The filename
+    :param offset: The byte offset of the start of the first line to read
+    """
+
+    BLOCK_SIZE = 1 << 16
+
+    def __init__(self, filename, offset=0):
+        super().__init__()
+        self.file = open(filename, 'rb')
+        self.file.seek(offset)
+        self.offset = offset
+        self._lines = b''
+        self._position = 0
+        self._pending = b''
+
+    def readable(self):
+        return True
+
+    def tell(self):
+        """ Returns the byte offset of the end of the last line that was read """
+        return self.offset
+
+    def readinto(self, buffer):
+        while self._position == len(self._lines):
+            block = self.file.read(self.BLOCK_SIZE)
+            if not block:
+                return 0
+            self._pending += block
+            end = self._pending.rfind(b'\n') + 1
+            self._lines, self._pending = self._pending[:end], self._pending[end:]
+            self._position = 0
+        size = min(len(buffer), len(self._lines) - self._position)
+        buffer[:size] = self._lines[self._position:self._position + size]
+        self._position += size
+        self.offset += size
+        return size
+
+    def close(self):
+        self.file.close()
+        super().close()
+
+
+def open_data(filename, offset=0):
+    """ Returns a binary file object of the complete lines of data in a
+    file, which are decompressed if the file is compressed. The ``raw``
+    attribute of the file object tells the byte offset in the file up to
+    which the data was read.
+
+    :param filename: The data filename
+    :param offset: The byte offset at which to start reading, which must be
+                   the start of a line, or the end of a member for
+                   compressed files
+    """
+    if is_compressed(filename):
+        return io.BufferedReader(MemberReader(filename, offset))
+    return io.BufferedReader(LineReader(filename, offset))
+
+
+def find_last_line(filename, marker, tail=None):
+    """ Returns the last line of a file that starts with the marker, and the
+    byte offset of the end of that line, or (None, None) if it is not found.
+    The file is searched backwards from the end. In compressed files, only
+    lines that were written with :meth:`CompressedFileHandler.write_line`
+    are found.
+
+    :param filename: The data filename
+    :param marker: The bytes that the line starts with
+    :param tail: Maximum number of bytes at the end of the file to search,
+                 or None to search the whole file
+    """
+    compressed = is_compressed(filename)
+    size = os.path.getsize(filename)
+    block = 1 << 16
+    with open(filename, 'rb') as f:
+        while True:
+            start = max(size - block, 0)
+            f.seek(start)
+            data = f.read(size - start)
+            index = len(data)
+            while True:
+                index = data.rfind(marker, 0, index)
+                if index < 0:
+                    break
+                if compressed:
+                    found = _stored_member(data, index)
+                    if found is not None:
+                        return found[0], start + found[1]
+                elif index + start == 0 or data[index - 1:index] == b'\n':
+                    end = data.find(b'\n', index)
+                    if end >= 0:
+                        return data[index:end].decode(), start + end + 1
+            if start == 0 or (tail is not None and block >= tail):
+                return None, None
+            block *= 4
+
+
+def _stored_member(data, index):
+    """ Returns the line of a stored gzip member whose data starts at the
+    index, and the offset of the end of the member, or None
+    """
+    start = index - 15  # The gzip header and the header of the stored block
+    if start < 0:
+        return None
+    decompressor = zlib.decompressobj(zlib.MAX_WBITS | 16)
+    try:
+        line = decompressor.decompress(data[start:])
+    except zlib.error:
+        return None
+    if not decompressor.eof or not line.endswith(b'\n'):
+        return None
+    return line[:-1].decode(), len(data) - len(decompressor.unused_data)
+
+
+def compress_member(data, compresslevel=6):
+    """ Returns the bytes of a gzip member of the data, with a 10 byte
+    header without a file name or modification time. Unlike gzip.compress,
+    which only accepts the modification time from Python 3.8, the member
+    is the same every time.
+    """
+    compressor = zlib.compressobj(compresslevel, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+    return compressor.compress(data) + compressor.flush()
+
+
+def write_member(filename, text, mode='ab', compresslevel=6):
+    """ Writes text to a compressed file as a new member """
+    with open(filename, mode) as f:
+        f.write(compress_member(text.encode(), compresslevel))
+
+
+class CompressedFileHandler(logging.Handler):
+    """ Writes formatted records to a compressed file. The records are
+    buffered and written as a separate gzip member, so that the file stays
+    readable up to the last member if the process stops unexpectedly.
+
+    A member is written when rows records are buffered, and on a timer that
+    checks the buffer every interval seconds, when it holds at least
+    member_size bytes or a record has been buffered for max_delay seconds.
+    The minimum size keeps the overhead of the gzip header and trailer of
+    each member small when records arrive slowly. All of the buffered
+    records are written by :meth:`.flush` and :meth:`.close`.
+
+    :param filename: The compressed filename
+    :param rows: Maximum number of records in a member
+    :param interval: Time in seconds between checks of the buffer
+    :param member_size: Minimum size in bytes of the text of a member
+                        that is written on the timer
+    :param max_delay: Maximum time in seconds that a record is buffered
+    :param compresslevel: The gzip compression level
+    """
+
+    terminator = '\n'
+
+    def __init__(self, filename, rows=1000, interval=1., member_size=1 << 12, max_delay=10.,
+                 compresslevel=6):
+        super().__init__()
+        self.filename = filename
+        self.stream = open(filename, 'ab')
+        self.rows = rows
+        self.interval = interval
+        self.member_size = member_size
+        self.max_delay = max_delay
+        self.compresslevel = compresslevel
+        self._lines = []
+        self._size = 0
+        self._buffered = None  # Time at which the first buffered record arrived
+        self._timer = None
+
+    def emit(self, record):
+        try:
+            line = self.format(record) + self.terminator
+        except Exception:
+            self.handleError(record)
+            return
+        self._lines.append(line)
+        self._size += len(line)
+        if len(self._lines) >= self.rows:
+            self.flush()
+        elif self._buffered is None:
+            self._buffered = time.monotonic()
+            self._start_timer(self.interval)
+
+    def _start_timer(self, delay):
+        self._timer = threading.Timer(delay, self._check)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _check(self):
+        """ Writes the buffered records if they fill a member or have waited
+        for max_delay, and otherwise checks again later
+        """
+        self.acquire()
+        try:
+            if self._buffered is None or self.stream.closed:
+                return
+            waited = time.monotonic() - self._buffered
+            if self._size >= self.member_size or waited >= self.max_delay:
+                self.flush()
+            else:
+                self._start_timer(min(self.interval, self.max_delay - waited))
+        finally:
+            self.release()
+
+    def flush(self):
+        self.acquire()
+        try:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if self._lines:
+                self._write(''.join(self._lines), self.compresslevel)
+                self._lines = []
+            self._size = 0
+            self._buffered = None
+        finally:
+            self.release()
+
+    def _write(self, text, compresslevel):
+        self.stream.write(compress_member(text.encode(), compresslevel))
+        self.stream.flush()
+
+    def write_line(self, line):
+        """ Writes a line, such as a comment, as a separate member that is
+        stored without compression, so that :func:`find_last_line` can find
+        it without decompressing the file
+        """
+        self.acquire()
+        try:
+            self.flush()
+            self._write(line + self.terminator, 0)
+        finally:
+            self.release()
+
+    def close(self):
+        self.acquire()
+        try:
+            if not self.stream.closed:
+                self.flush()
+                self.stream.close()
+        finally:
+            self.release()
+        super().close()
@@ -0,0 +1,265 @@
+#
+# This file is part of the PyMeasure package.
+#
+# Copyright (c) 2013-2017 PyMeasure Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+
+import logging
+import operator
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from glob import glob
+from importlib import import_module
+from itertools import islice
+
+import pandas as pd
+
+from .compression import open_data
+from .procedure import Procedure
+from .results import Results
+
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+OPERATORS = {
+    '=': operator.eq, '!=': operator.ne,
+    '<': operator.lt, '<=': operator.le,
+    '>': operator.gt, '>=': operator.ge,
+}
+
+
+def _value(text):
+    """ Returns the number in a header value, or the text if it is not a
+    number
+    """
+    try:
+        return float(text)
+    except (TypeError, ValueError):
+        return text
+
+
+def matches(fields, procedure=None, where=None):
+    """ Returns True if the header fields of a file, as returned by
+    :meth:`Results.parse_header_fields`, match the conditions
+
+    :param fields: A tuple of the Procedure module, class and parameters
+    :param procedure: The name of the Procedure class, with or without
+                      its module
+    :param where: A dictionary of conditions on the parameters, as
+                  described in :meth:`.Catalog.find`
+    """
+    module, cls, parameters = fields
+    if procedure is not None and procedure not in (cls, "%s.%s" % (module, cls)):
+        return False
+    for name, condition in (where or {}).items():
+        if name not in parameters:
+            return False
+        if isinstance(condition, tuple):
+            symbol, expected = condition
+        else:
+            symbol, expected = '=', condition
+        if symbol not in OPERATORS:
+            raise ValueError("Invalid operator '%s' for parameter '%s'" % (symbol, name))
+        value, expected = _value(parameters[name][0]), _value(expected)
+        if isinstance(value, float) != isinstance(expected, float):
+            value, expected = str(value), str(expected)
+        if not OPERATORS[symbol](value, expected):
+            return False
+    return True
+
+
+class Dataset(object):
+    """ Reads many Results files together, as one DataFrame with the
+    parameters of each run as extra columns. Runs are selected on their
+    header parameters, so that the data of the other files is never read,
+    and only the requested columns and rows of each file are parsed. The
+    files are read in parallel on a pool of threads.
+
+    .. code-block:: python
+
+        dataset = Dataset('data/IV*.csv').select(
+            'IVProcedure', where={'Temperature': ('<', 4)})
+        data = dataset.read(columns=['Voltage (V)', 'Current (A)'],
+                            parameters=['Temperature'])
+
+    If a :class:`.Catalog` is given, runs are selected by querying it instead
+    of reading the headers, so it should be up to date with the files.
+
+    :param filenames: A list of data filenames, or a glob pattern
+    :param threads: Maximum number of files that are read at once
+    :param catalog: An optional :class:`.Catalog` of the files
+    """
+
+    RUN = 'Run'
+
+    def __init__(self, filenames, threads=4, catalog=None):
+        if isinstance(filenames, str):
+            filenames = sorted(glob(filenames))
+        self.filenames = [os.path.abspath(filename) for filename in filenames]
+        self.threads = threads
+        self.catalog = catalog
+        self._fields = {}
+        self._classes = {}
+
+    def __len__(self):
+        return len(self.filenames)
+
+    def __iter__(self):
+        return iter(self.filenames)
+
+    def fields(self):
+        """ Returns a dictionary of the header fields of each file, as
+        returned by :meth:`Results.parse_header_fields`. Each header is
+        only read once.
+        """
+        missing = [filename for filename in self.filenames if filename not in self._fields]
+        if missing:
+            with ThreadPoolExecutor(self.threads) as pool:
+                for filename, header in zip(missing, pool.map(Results.read_header, missing)):
+                    self._fields[filename] = Results.parse_header_fields(header[0])
+        return {filename: self._fields[filename] for filename in self.filenames}
+
+    def select(self, procedure=None, where=None):
+        """ Returns a Dataset of the runs that match all of the conditions,
+        as described in :meth:`.Catalog.find`
+
+        :param procedure: The name of the Procedure class, with or without
+                          its module
+        :param where: A dictionary of conditions on the parameters
+        """
+        if self.catalog is not None:
+            found = set(self.catalog.find(procedure, where=where))
+            selected = [filename for filename in self.filenames if filename in found]
+        else:
+            selected = [filename for filename, fields in self.fields().items()
+                        if matches(fields, procedure, where)]
+        dataset = Dataset(selected, self.threads, self.catalog)
+        dataset._fields = self._fields
+        dataset._classes = self._classes
+        return dataset
+
+    def procedure_class(self, filename):
+        """ Returns the Procedure class of a file, which declares the data
+        types of its columns, or :class:`.Procedure` if it can not be
+        imported. Each class is only imported once, and no Procedure is
+        constructed.
+
+        :param filename: The data filename
+        """
+        fields = self._fields.get(filename)
+        if fields is None:
+            fields = Results.parse_header_fields(Results.read_header(filename)[0])
+            self._fields[filename] = fields
+        module, name = fields[0], fields[1]
+        cls = self._classes.get((module, name))
+        if cls is None:
+            try:
+                cls = getattr(import_module(module), name)
+            except (ImportError, AttributeError, TypeError, ValueError):
+                log.warning("Unknown Procedure '%s.%s' in '%s'", module, name, filename)
+                cls = Procedure
+            self._classes[(module, name)] = cls
+        return cls
+
+    def read_run(self, filename, columns=None, rows=None, parameters=None):
+        """ Returns a DataFrame of the data of one file, with the run
+        parameters as extra columns
+
+        :param filename: The data filename
+        :param columns: A list of the columns to read, or None for all
+        :param rows: A tuple of the first and the end row to read, where the
+                     end may be None, or None for all rows
+        :param parameters: A list of the parameter names to add as columns,
+                           or None for all of the parameters
+        """
+        cls = self.procedure_class(filename)
+        start, stop = rows or (0, None)
+        comment = Results.COMMENT.encode()
+        with open_data(filename) as f:
+            line = f.readline()
+            while line.startswith(comment):
+                line = f.readline()
+            names = line.decode().strip().split(Results.DELIMITER)
+            options = Results.read_options(cls, columns, names)
+            if start:
+                # Rows are counted while reading, since the skiprows of pandas
+                # also counts comment lines, such as checkpoints
+                frames, position = [], 0
+                reader = pd.read_csv(f, header=None, names=names, comment=Results.COMMENT,
+                                     chunksize=Results.CHUNK_SIZE, **options)
+                for chunk in reader:
+                    end = position + len(chunk)
+                    if end > start:
+                        frames.append(chunk.iloc[max(start - position, 0):
+                                                 None if stop is None else stop - position])
+                    position = end
+                    if stop is not None and position >= stop:
+                        break
+                data = Results.concat_frames(cls, frames) if frames else \
+                    Results.empty_frame(cls, options.get('usecols', names))
+            else:
+                if stop is not None:
+                    options['nrows'] = stop
+                data = pd.read_csv(f, header=None, names=names, comment=Results.COMMENT,
+                                   **options)
+        if columns is not None:
+            data = data.reindex(columns=columns)
+        if len(data) == 0:
+            data = Results.empty_frame(cls, list(data.columns))
+
+        values = self._fields[filename][2]
+        for name in (values if parameters is None else parameters):
+            if name not in data.columns:
+                data[name] = _value(values[name][0]) if name in values else None
+        data[self.RUN] = os.path.basename(filename)
+        return data
+
+    def frames(self, columns=None, rows=None, parameters=None):
+        """ Returns a generator of the DataFrame of each run, in the order
+        of the files. At most as many files as threads are read ahead.
+        The arguments are those of :meth:`.read_run`.
+        """
+        def read(filename):
+            return self.read_run(filename, columns, rows, parameters)
+
+        filenames = iter(self.filenames)
+        with ThreadPoolExecutor(self.threads) as pool:
+            pending = deque(pool.submit(read, f) for f in islice(filenames, self.threads))
+            while pending:
+                data = pending.popleft().result()
+                pending.extend(pool.submit(read, f) for f in islice(filenames, 1))
+                yield data
+
+    def read(self, columns=None, rows=None, parameters=None):
+        """ Returns one DataFrame of the data of all of the runs, with the
+        run parameters and the file name as extra columns. The arguments
+        are those of :meth:`.read_run`.
+        """
+        frames = list(self.frames(columns, rows, parameters))
+        if not frames:
+            return pd.DataFrame(columns=(columns or []) + [self.RUN])
+        data = pd.concat(frames, ignore_index=True)
+        for column in data.columns:
+            if data[column].dtype != 'category' and any(
+                    frame[column].dtype == 'category' for frame in frames if column in frame):
+                data[column] = data[column].astype('category')
+        return data
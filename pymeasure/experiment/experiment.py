@@ -27,18 +27,18 @@ import logging
 log = logging.getLogger()
 log.addHandler(logging.NullHandler())
 
-try:
-    from IPython import display
-except ImportError:
-    log.warning("IPython could not be imported")
-
 from .results import unique_filename
 from .config import get_config, set_mpl_rcparams
 from pymeasure.log import setup_logging, console_log
 from pymeasure.experiment import Results, Worker
+from .sharedbuffer import RowBuffer
+from .analysis import FrameBuffer, Pipeline
 from .parameters import Measurable
+from .grid import BinnedGrid
+from .liveplot import LiveLine, LivePlot
 import time, signal
 import numpy as np
+import pandas as pd
 import tempfile
 import gc
 
@@ -99,18 +99,35 @@ class Experiment(object):
     :param analyse: Post-analysis function, which takes a pandas dataframe as input and
         returns it with added (analysed) columns. The analysed results are accessible via
         experiment.data, as opposed to experiment.results.data for the 'raw' data.
+    :param incremental: If True, the analyse function is only called on the rows that
+        are new since the last call, which requires it to treat each row independently.
+        If False, all data is analysed again on each update. By default, only a
+        :class:`~pymeasure.experiment.analysis.Pipeline`, whose stages keep the state
+        they need between blocks, analyses the new rows incrementally.
+    :param fps: Maximum number of frames per second of the live plots
+    :param buffer_size: Number of rows of a
+        :class:`~pymeasure.experiment.sharedbuffer.RowBuffer` through which the
+        live data of the Worker thread is read, or None to read the data file
     :param _data_timeout: Time limit for how long live plotting should wait for datapoints.
     """
 
-    def __init__(self, title, procedure, analyse=(lambda x: x)):
+    def __init__(self, title, procedure, analyse=(lambda x: x), incremental=None, fps=10.,
+                 buffer_size=None):
         self.title = title
         self.procedure = procedure
         self.measlist = []
         self.port = 5888
         self.plots = []
         self.figs = []
-        self._data = []
+        self._data = pd.DataFrame()
+        self._analysed = FrameBuffer()
+        self._rows = 0
+        self._plotted = 0
         self.analyse = analyse
+        if incremental is None:
+            incremental = isinstance(analyse, Pipeline)
+        self.incremental = incremental
+        self.live_plot = LivePlot(fps=fps)
         self._data_timeout = 10
 
         config = get_config()
@@ -127,6 +144,11 @@ class Experiment(object):
         self.results = Results(self.procedure, self.filename)
         log.info("Set up Results")
 
+        self.buffer = None
+        if buffer_size:
+            self.buffer = RowBuffer(self.procedure.DATA_COLUMNS, buffer_size)
+            self.results.attach_buffer(self.buffer)
+
         self.worker = Worker(self.results, self.scribe.queue, logging.DEBUG)
         log.info("Create worker")
 
@@ -139,9 +161,33 @@ class Experiment(object):
     def data(self):
         """Data property which returns analysed data, if an analyse function
         is defined, otherwise returns the raw data."""
-        self._data = self.analyse(self.results.data.copy())
+        self._analyse_new()
+        if len(self._analysed) > 0:
+            self._data = self._analysed.frame
         return self._data
 
+    def _analyse_new(self):
+        """Analyses the raw rows that were added since the last call, and returns
+        True if all data was analysed again from the start."""
+        raw = self.results.data
+        reanalysed = not self.incremental or len(raw) < self._rows
+        if reanalysed:
+            self._analysed.clear()
+            self._rows = 0
+            if hasattr(self.analyse, 'reset'):
+                self.analyse.reset()
+        if len(raw) > self._rows:
+            new = self.analyse(raw.iloc[self._rows:].copy())
+            self._rows = len(raw)
+            if len(new) > 0:
+                self._analysed.append(new)
+        return reanalysed
+
+    def new_data(self, start):
+        """Returns the analysed rows from the start index onwards, without
+        copying the earlier rows."""
+        return self._analysed.tail(start)
+
     def wait_for_data(self):
         """Wait for the data attribute to fill with datapoints."""
         t = time.time()
@@ -161,6 +207,9 @@ class Experiment(object):
                 self.plot(*args, **kwargs)
             while not self.worker.should_stop():
                 self.update_plot()
+            self.update_plot()
+            self.live_plot.draw(force=True)
+            from IPython import display
             display.clear_output(wait=True)
             if self.worker.is_alive():
                 self.worker.terminate()
@@ -171,8 +220,20 @@ class Experiment(object):
         plots in a plots list attribute."""
         if self.wait_for_data():
             kwargs['title'] = self.title
-            ax = self.data.plot(*args, **kwargs)
-            self.plots.append({'type': 'plot', 'args': args, 'kwargs': kwargs, 'ax': ax})
+            data = self.data
+            ax = data.plot(*args, **kwargs)
+            x, y = args[0], args[1]
+            if type(y) == str:
+                y = [y]
+            lines = []
+            for yname, line in zip(y, ax.lines[-len(y):]):
+                live_line = LiveLine(line, x, yname, capacity=2 * len(data))
+                # Later rows are appended on the next update, with the other plots
+                live_line.append(data.iloc[:self._plotted])
+                self.live_plot.add_line(live_line)
+                lines.append(live_line)
+            self.plots.append({'type': 'plot', 'args': args, 'kwargs': kwargs, 'ax': ax,
+                               'lines': lines})
             if ax.get_figure() not in self.figs:
                 self.figs.append(ax.get_figure())
             self._user_interrupt = False
@@ -184,32 +245,34 @@ class Experiment(object):
             pl.close()
         self.figs = []
         self.plots = []
+        self.live_plot = LivePlot(fps=1. / self.live_plot.interval)
         gc.collect()
 
     def update_plot(self):
-        """Update the plots in the plots list with new data from the experiment.data
-        pandas dataframe."""
+        """Update the plots in the plots list with the new rows of the experiment.data
+        pandas dataframe, and redraw them when the next frame is due."""
         try:
-            tasks = []
-            self.data
+            if self._analyse_new():
+                self._plotted = 0
+                self.live_plot.clear()
+                for plot in self.plots:
+                    if plot['type'] == 'image':
+                        plot['grid'].clear()
+            new = self.new_data(self._plotted)
+            self._plotted = len(self._analysed)
+            self.live_plot.append(new)
             for plot in self.plots:
-                ax = plot['ax']
-                if plot['type'] == 'plot':
-                    x, y = plot['args'][0], plot['args'][1]
-                    if type(y) == str:
-                        y = [y]
-                    for yname, line in zip(y, ax.lines):
-                        self.update_line(ax, line, x, yname)
                 if plot['type'] == 'pcolor':
+                    self.data
                     x, y, z = plot['x'], plot['y'], plot['z']
-                    update_pcolor(ax, x, y, z)
-
-            display.clear_output(wait=True)
-            display.display(*self.figs)
-            time.sleep(0.1)
+                    self.update_pcolor(plot['ax'], x, y, z)
+                    self.live_plot.invalidate(plot['ax'])
+                if plot['type'] == 'image' and len(new) > 0:
+                    self.update_image(plot, new)
+            self.live_plot.draw()
+            time.sleep(max(self.live_plot.time_to_next_frame(), 0.01))
         except KeyboardInterrupt:
-            display.clear_output(wait=True)
-            display.display(*self.figs)
+            self.live_plot.draw(force=True)
             self._user_interrupt = True
 
     def pcolor(self, xname, yname, zname, *args, **kwargs):
@@ -246,6 +309,46 @@ class Experiment(object):
         ax.set_ylabel(yname)
         ax.invert_yaxis()
 
+    def image(self, xname, yname, zname, x_range, y_range, shape, ax=None, **kwargs):
+        """Plot the results from the experiment.data pandas dataframe as an image,
+        onto which the (x, y) points are binned as they arrive. The points do not
+        need to lie on a regular grid. Store the plot in the plots list attribute.
+
+        :param x_range: Tuple of the lower and upper x limits
+        :param y_range: Tuple of the lower and upper y limits
+        :param shape: Tuple of the number of pixels along x and y
+        :param ax: Matplotlib axes to plot in, or None for a new figure
+        """
+        import matplotlib.pyplot as plt
+        if self.wait_for_data():
+            grid = BinnedGrid(x_range, y_range, shape)
+            if ax is None:
+                ax = plt.figure().gca()
+            x0, y0, width, height = grid.rect
+            kwargs.setdefault('interpolation', 'nearest')
+            kwargs.setdefault('aspect', 'auto')
+            artist = ax.imshow(grid.values.T, origin='lower',
+                               extent=(x0, x0 + width, y0, y0 + height), **kwargs)
+            ax.get_figure().colorbar(artist, ax=ax, label=zname)
+            ax.set_title(self.title)
+            ax.set_xlabel(xname)
+            ax.set_ylabel(yname)
+            plot = {'type': 'image', 'x': xname, 'y': yname, 'z': zname, 'grid': grid,
+                    'artist': artist, 'ax': ax}
+            self.plots.append(plot)
+            if ax.get_figure() not in self.figs:
+                self.figs.append(ax.get_figure())
+            self.update_image(plot, self.data.iloc[:self._plotted])
+            self.live_plot.add_artist(artist)
+
+    def update_image(self, plot, data):
+        """Update an image with rows of data that were added since the last update."""
+        grid = plot['grid']
+        grid.add(data[plot['x']], data[plot['y']], data[plot['z']])
+        plot['artist'].set_data(grid.values.T)
+        if grid.levels is not None:
+            plot['artist'].set_clim(*grid.levels)
+
     def update_line(self, ax, hl, xname, yname):
         """Update a line in a matplotlib graph with new data."""
         del hl._xorig, hl._yorig
@@ -253,7 +356,6 @@ class Experiment(object):
         hl.set_ydata(self._data[yname])
         ax.relim()
         ax.autoscale()
-        gc.collect()
 
     def __del__(self):
         self.scribe.stop()
@@ -261,3 +363,6 @@ class Experiment(object):
             self.worker.recorder_queue.put(None)
             self.worker.monitor_queue.put(None)
             self.worker.stop()
+        elif self.buffer is not None:
+            self.results.detach_buffer()
+            self.buffer.close()
@@ -0,0 +1,114 @@
+#
+# This file is part of the PyMeasure package.
+#
+# Copyright (c) 2013-2017 PyMeasure Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+
+import logging
+
+import numpy as np
+
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+
+class BinnedGrid(object):
+    """ Preallocated 2D grid of pixels, onto which (x, y, z) points are
+    binned as they arrive. Each pixel holds the mean of the z values of
+    the points that fall into it, and pixels without points are NaN.
+    Since points are binned, they do not need to lie on a uniform grid.
+
+    Only the pixels of the added points are recalculated, so adding
+    points costs time proportional to their number, independent of the
+    number of points added previously.
+
+    .. code-block:: python
+
+        grid = BinnedGrid((-1, 1), (0, 5), shape=(200, 100))
+        grid.add(data['Field (T)'], data['Gate Voltage (V)'], data['Resistance (Ohm)'])
+        grid.values  # array of shape (200, 100), indexed as [x, y]
+
+    :param x_range: Tuple of the lower and upper x limits
+    :param y_range: Tuple of the lower and upper y limits
+    :param shape: Tuple of the number of pixels along x and y
+
+    :ivar values: Array of the pixel values, indexed as [x, y]
+    :ivar levels: Tuple of the lowest and highest pixel values that have
+                  occurred, which is tracked without scanning the grid
+    """
+
+    def __init__(self, x_range, y_range, shape):
+        self.x_range = (float(min(x_range)), float(max(x_range)))
+        self.y_range = (float(min(y_range)), float(max(y_range)))
+        self.shape = tuple(int(n) for n in shape)
+        self.clear()
+
+    def clear(self):
+        """ Removes all points from the grid """
+        self._sum = np.zeros(self.shape)
+        self._count = np.zeros(self.shape, dtype=np.int64)
+        self.values = np.full(self.shape, np.nan)
+        self.levels = None
+
+    @property
+    def rect(self):
+        """ Tuple of the (x, y, width, height) covered by the grid """
+        return (self.x_range[0], self.y_range[0],
+                self.x_range[1] - self.x_range[0],
+                self.y_range[1] - self.y_range[0])
+
+    def _index(self, values, limits, size):
+        lower, upper = limits
+        scale = size / (upper - lower) if upper > lower else 0.
+        index = np.floor((values - lower) * scale).astype(np.int64)
+        # Points on the upper limit belong to the last pixel
+        index[values == upper] = size - 1
+        return index
+
+    def add(self, x, y, z):
+        """ Bins points onto the grid, ignoring points that lie outside
+        of it or have a NaN value
+
+        :param x: Array-like of x coordinates
+        :param y: Array-like of y coordinates
+        :param z: Array-like of values
+        """
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        z = np.asarray(z, dtype=float)
+        ix = self._index(x, self.x_range, self.shape[0])
+        iy = self._index(y, self.y_range, self.shape[1])
+        valid = ((ix >= 0) & (ix < self.shape[0]) &
+                 (iy >= 0) & (iy < self.shape[1]) & ~np.isnan(z))
+        if not np.any(valid):
+            return
+        ix, iy, z = ix[valid], iy[valid], z[valid]
+
+        np.add.at(self._sum, (ix, iy), z)
+        np.add.at(self._count, (ix, iy), 1)
+        changed = self._sum[ix, iy] / self._count[ix, iy]
+        self.values[ix, iy] = changed
+
+        lower, upper = np.min(changed), np.max(changed)
+        if self.levels is not None:
+            lower = min(lower, self.levels[0])
+            upper = max(upper, self.levels[1])
+        self.levels = (lower, upper)
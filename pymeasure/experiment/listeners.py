@@ -23,22 +23,18 @@
 #
 
 import logging
+import os
+import time
 from logging import StreamHandler, FileHandler
 
+from .compression import is_compressed, CompressedFileHandler
+from .results import Results
 from ..log import QueueListener
 from ..thread import StoppableThread
 
 log = logging.getLogger(__name__)
 log.addHandler(logging.NullHandler())
 
-try:
-    import zmq
-    import cloudpickle
-except ImportError:
-    zmq = None
-    cloudpickle = None
-    log.warning("ZMQ and cloudpickle are required for TCP communication")
-
 
 class Monitor(QueueListener):
     def __init__(self, results, queue):
@@ -65,6 +61,9 @@ class Listener(StoppableThread):
 
         self.port = port
         self.topic = topic
+        import zmq  # Imported when needed, since it is slow to import
+        import cloudpickle
+        self._loads = cloudpickle.loads
         self.context = zmq.Context()
         log.debug("%s has ZMQ Context: %r" % (self.__class__.__name__, self.context))
         self.subscriber = self.context.socket(zmq.SUB)
@@ -78,7 +77,7 @@ class Listener(StoppableThread):
         self.timeout = timeout
 
     def receive(self, flags=0):
-        topic, record = self.subscriber.recv_serialized(deserialize=cloudpickle.loads, flags=flags)
+        topic, record = self.subscriber.recv_serialized(deserialize=self._loads, flags=flags)
         return topic, record
 
     def message_waiting(self):
@@ -93,17 +92,114 @@ class Recorder(QueueListener):
     """ Recorder loads the initial Results for a filepath and
     appends data by listening for it over a queue. The queue
     ensures that no data is lost between the Recorder and Worker.
+
+    The data is synced to disk every checkpoint_interval seconds. When the
+    status changes, and when a sweep point is completed after at least
+    checkpoint_interval seconds, a checkpoint line with the status, progress
+    and number of completed points is also written, from which an
+    interrupted run can be resumed (see :meth:`.Results.resume`).
+
+    If a :class:`.Catalog` is given, the Results are added to it when the
+    Recorder is constructed, and the number of rows, size and status are
+    updated at most every interval seconds and when the Recorder stops.
     """
 
-    def __init__(self, results, queue, **kwargs):
+    def __init__(self, results, queue, catalog=None, interval=1., checkpoint_interval=5.,
+                 **kwargs):
         """ Constructs a Recorder to record the Procedure data into
         the file path, by waiting for data on the subscription port
         """
         handlers = []
         for filename in results.data_filenames:
-            fh = FileHandler(filename=filename, **kwargs)
+            if is_compressed(filename):
+                fh = CompressedFileHandler(filename)
+            else:
+                fh = FileHandler(filename=filename, **kwargs)
             fh.setFormatter(results.formatter)
             fh.setLevel(logging.NOTSET)
             handlers.append(fh)
 
         super().__init__(queue, *handlers)
+
+        self.results = results
+        self.catalog = catalog
+        self.interval = interval
+        self.checkpoint_interval = checkpoint_interval
+        resumed = results.resumed or {}
+        self.rows = resumed.get('rows', 0)
+        self.progress = resumed.get('progress', 0.)
+        self.point = resumed.get('point', 0)
+        self._cataloged = self._synced = self._checkpointed = time.monotonic()
+        if catalog is not None:
+            catalog.record(results)
+
+    def handle(self, record):
+        super().handle(record)
+        self.rows += 1
+        now = time.monotonic()
+        if now - self._synced > self.checkpoint_interval:
+            self.sync()
+        if self.catalog is not None and now - self._cataloged > self.interval:
+            self.update_catalog()
+
+    def update(self, topic, record):
+        """ Updates the state of the run from a status, progress or point
+        message of the Worker, and writes a checkpoint if needed
+        """
+        if topic == 'progress':
+            self.progress = record
+        elif topic == 'point':
+            self.point = record
+            if time.monotonic() - self._checkpointed > self.checkpoint_interval:
+                self.checkpoint()
+        elif topic == 'status':
+            self.checkpoint()
+
+    def sync(self, line=None):
+        """ Writes the buffered records, and an optional comment line, and
+        waits until they are stored on disk
+        """
+        for handler in self.handlers:
+            handler.acquire()
+            try:
+                if line is not None and isinstance(handler, CompressedFileHandler):
+                    handler.write_line(line)
+                elif line is not None:
+                    handler.stream.write(line + handler.terminator)
+                handler.flush()
+                os.fsync(handler.stream.fileno())
+            finally:
+                handler.release()
+        self._synced = time.monotonic()
+
+    def checkpoint(self):
+        """ Writes a checkpoint with the status, progress, number of
+        completed points and number of rows, and syncs it to disk
+        """
+        self.sync(Results.format_checkpoint(
+            status=self.results.procedure.status, progress=self.progress,
+            point=self.point, rows=self.rows))
+        self._checkpointed = time.monotonic()
+
+    def dequeue(self, block):
+        record = super().dequeue(block)
+        if record is self._sentinel:
+            for handler in self.handlers:
+                handler.flush()  # Write the buffered records
+            if self.catalog is not None:
+                self.update_catalog()
+        return record
+
+    def update_catalog(self):
+        """ Updates the number of rows, size and status of the Results in the
+        catalog. The records that compressed files still buffer are counted
+        as rows, but they are not written, so that the members keep the size
+        that the CompressedFileHandler chooses.
+        """
+        for handler in self.handlers:
+            if not isinstance(handler, CompressedFileHandler):
+                handler.flush()
+        for filename in self.results.data_filenames:
+            self.catalog.update(filename, rows=self.rows,
+                                status=self.results.procedure.status)
+        self._cataloged = time.monotonic()
@@ -0,0 +1,226 @@
+#
+# This file is part of the PyMeasure package.
+#
+# Copyright (c) 2013-2017 PyMeasure Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+
+import logging
+import time
+
+import numpy as np
+
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+
+class LiveLine(object):
+    """ Wraps a matplotlib line, whose data is appended to a growing buffer
+    instead of being replaced, so that only the new points are converted
+    from the DataFrame and checked against the data limits.
+
+    :param line: The matplotlib Line2D
+    :param x: The column name of the x data
+    :param y: The column name of the y data
+    :param capacity: The initial number of points in the buffer
+    """
+
+    def __init__(self, line, x, y, capacity=1024):
+        self.line = line
+        self.x, self.y = x, y
+        self._buffer = np.empty((max(int(capacity), 1), 2))
+        self._size = 0
+        self.limits = None
+
+    def __len__(self):
+        return self._size
+
+    def clear(self):
+        """ Removes all points from the line """
+        self._size = 0
+        self.limits = None
+        self.line.set_data(self._buffer[:0, 0], self._buffer[:0, 1])
+
+    def append(self, data):
+        """ Appends the rows of a DataFrame to the line, and returns True
+        if any points were added
+        """
+        count = len(data)
+        if count == 0:
+            return False
+        size = self._size + count
+        if size > len(self._buffer):
+            buffer = np.empty((max(size, 2 * len(self._buffer)), 2))
+            buffer[:self._size] = self._buffer[:self._size]
+            self._buffer = buffer
+        x = np.asarray(data[self.x], dtype=float)
+        y = np.asarray(data[self.y], dtype=float)
+        self._buffer[self._size:size, 0] = x
+        self._buffer[self._size:size, 1] = y
+        self._size = size
+        self.line.set_data(self._buffer[:size, 0], self._buffer[:size, 1])
+
+        with np.errstate(invalid='ignore'):
+            limits = [np.nanmin(x), np.nanmax(x), np.nanmin(y), np.nanmax(y)]
+        if self.limits is not None:
+            limits = [np.nanmin([limits[0], self.limits[0]]),
+                      np.nanmax([limits[1], self.limits[1]]),
+                      np.nanmin([limits[2], self.limits[2]]),
+                      np.nanmax([limits[3], self.limits[3]])]
+        self.limits = tuple(limits)
+        return True
+
+
+class LivePlot(object):
+    """ Redraws matplotlib figures with live data at a limited frame rate.
+
+    On canvases that support blitting (e.g. the notebook and widget
+    backends), the figure background is drawn once and only the live
+    artists are redrawn on each frame. The background is only redrawn when
+    the data exceeds the axes limits, which are then extended with a
+    margin so that this happens rarely. Other canvases (e.g. the inline
+    backend) are redisplayed in full, at the same limited frame rate.
+
+    :param fps: The maximum number of frames per second
+    :param margin: The fraction of the data range added to the axes
+                   limits when they are extended
+    """
+
+    def __init__(self, fps=10., margin=0.25):
+        self.interval = 1. / fps
+        self.margin = margin
+        self.lines = []
+        self.artists = []
+        self.figures = []
+        self._backgrounds = {}
+        self._invalid = set()
+        self._last_draw = None
+
+    @staticmethod
+    def supports_blit(figure):
+        return bool(getattr(figure.canvas, 'supports_blit', False))
+
+    def _add_figure(self, artist):
+        if self.supports_blit(artist.axes.get_figure()):
+            # Animated artists are excluded from the background
+            artist.set_animated(True)
+        self.invalidate(artist.axes)
+
+    def add_line(self, live_line):
+        """ Adds a :class:`.LiveLine` that is redrawn on each frame """
+        self.lines.append(live_line)
+        self._add_figure(live_line.line)
+
+    def add_artist(self, artist):
+        """ Adds an artist with fixed extent (e.g. an image) that is redrawn
+        on each frame
+        """
+        self.artists.append(artist)
+        self._add_figure(artist)
+
+    def invalidate(self, ax):
+        """ Marks the axes to be drawn in full on the next frame """
+        figure = ax.get_figure()
+        if figure not in self.figures:
+            self.figures.append(figure)
+        self._invalid.add(ax)
+
+    def append(self, data):
+        """ Appends new rows of data to all lines, extending the axes
+        limits where the new points do not fit
+        """
+        for live_line in self.lines:
+            if live_line.append(data):
+                self._extend_limits(live_line)
+
+    def clear(self):
+        for live_line in self.lines:
+            live_line.clear()
+            self.invalidate(live_line.line.axes)
+
+    def _extend_limits(self, live_line):
+        ax = live_line.line.axes
+        xmin, xmax, ymin, ymax = live_line.limits
+        if ax.get_autoscalex_on():
+            limits = self._extended(ax.get_xlim(), xmin, xmax)
+            if limits is not None:
+                ax.set_xlim(*limits)
+                self.invalidate(ax)
+        if ax.get_autoscaley_on():
+            limits = self._extended(ax.get_ylim(), ymin, ymax)
+            if limits is not None:
+                ax.set_ylim(*limits)
+                self.invalidate(ax)
+
+    def _extended(self, limits, lower, upper):
+        """ Returns the extended limits, or None if the data fits """
+        if not (np.isfinite(lower) and np.isfinite(upper)):
+            return None
+        if limits[0] <= lower and upper <= limits[1]:
+            return None
+        span = (upper - lower) or abs(upper) or 1.
+        return (min(limits[0], lower - self.margin * span),
+                max(limits[1], upper + self.margin * span))
+
+    def time_to_next_frame(self):
+        """ Returns the time in seconds until the next frame is due """
+        if self._last_draw is None:
+            return 0.
+        return max(0., self._last_draw + self.interval - time.perf_counter())
+
+    def draw(self, force=False):
+        """ Draws a frame if one is due, or force is True, and returns
+        True if a frame was drawn
+        """
+        if not force and self.time_to_next_frame() > 0:
+            return False
+        self._last_draw = time.perf_counter()
+
+        redisplay = []
+        for figure in self.figures:
+            if self.supports_blit(figure):
+                self._blit(figure)
+            else:
+                redisplay.append(figure)
+        self._invalid.clear()
+        if redisplay:
+            from IPython import display
+            display.clear_output(wait=True)
+            display.display(*redisplay)
+        return True
+
+    def _blit(self, figure):
+        canvas = figure.canvas
+        axes = [ax for ax in figure.axes if self._artists(ax)]
+        if (any(ax in self._invalid for ax in figure.axes) or
+                any(ax not in self._backgrounds for ax in axes)):
+            canvas.draw()
+            for ax in axes:
+                self._backgrounds[ax] = canvas.copy_from_bbox(ax.bbox)
+        for ax in axes:
+            canvas.restore_region(self._backgrounds[ax])
+            for artist in self._artists(ax):
+                ax.draw_artist(artist)
+            canvas.blit(ax.bbox)
+        canvas.flush_events()
+
+    def _artists(self, ax):
+        return ([l.line for l in self.lines if l.line.axes is ax] +
+                [a for a in self.artists if a.axes is ax])
@@ -0,0 +1,281 @@
+#
+# This file is part of the PyMeasure package.
+#
+# Copyright (c) 2013-2017 PyMeasure Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+
+import logging
+import time
+from collections import OrderedDict, deque
+
+import numpy as np
+
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+
+class ParameterCost(object):
+    """ Models the time it takes to change a parameter, for example to ramp
+    a magnet or to wait for a temperature to stabilize
+
+    .. code-block:: python
+
+        costs = [
+            ParameterCost('field', rate=0.01, settle=30),  # T/s and s
+            ParameterCost('temperature', rate=0.05, settle=300, direction='increasing'),
+        ]
+
+    :param name: The name of the parameter
+    :param rate: The rate of change in units per second, or None if the
+                 time does not depend on the size of the change
+    :param settle: The time in seconds to settle after a change
+    :param direction: 'increasing' or 'decreasing' to only allow changes
+                      in one direction, or None for no constraint
+    """
+
+    DIRECTIONS = {None: 0, 'increasing': 1, 'decreasing': -1}
+
+    def __init__(self, name, rate=None, settle=0., direction=None):
+        if direction not in self.DIRECTIONS:
+            raise ValueError("Invalid direction '%s' for parameter '%s'" % (direction, name))
+        self.name = name
+        self.rate = rate
+        self.settle = settle
+        self.direction = direction
+
+    def time(self, start, end):
+        """ Returns the time in seconds to change the parameter from the start
+        to the end value, which is zero if either value is unknown
+        """
+        if start is None or end is None or start == end:
+            return 0.
+        time = self.settle
+        if self.rate:
+            time += abs(float(end) - float(start)) / self.rate
+        return time
+
+
+def transition_time(costs, start, end):
+    """ Returns the time in seconds to change from the parameter values of
+    start to those of end, as the sum of the time for each parameter
+
+    :param costs: A list of :class:`.ParameterCost` objects
+    :param start: A dictionary of the parameter values, or None if unknown
+    :param end: A dictionary of the parameter values
+    """
+    if start is None:
+        return 0.
+    return sum(cost.time(start.get(cost.name), end.get(cost.name)) for cost in costs)
+
+
+def path_time(costs, points, start=None):
+    """ Returns the total transition time to visit the points in order
+
+    :param costs: A list of :class:`.ParameterCost` objects
+    :param points: A list of dictionaries of the parameter values
+    :param start: The parameter values before the first point, or None
+    """
+    total = 0.
+    for point in points:
+        total += transition_time(costs, start, point)
+        start = point
+    return total
+
+
+def optimize_order(points, costs, start=None, passes=10, neighbours=10, time_limit=1.):
+    """ Returns the indices of the points in an order that reduces the total
+    transition time. Points are grouped by the values of the parameters with
+    a direction, which are visited in that direction, starting from the group
+    of the start point if it is known. Within each group, a nearest neighbour
+    path is improved by 2-opt segment reversals, which only join each point
+    to its nearest neighbours, so that the time grows slowly with the number
+    of points.
+
+    :param points: A list of dictionaries of the parameter values
+    :param costs: A list of :class:`.ParameterCost` objects
+    :param start: The parameter values before the first point, or None
+    :param passes: The maximum number of times each point is examined
+                   for improvements, on average
+    :param neighbours: The number of nearest neighbours of each point
+                       that are considered for improvements
+    :param time_limit: The maximum time in seconds spent on improvements
+    """
+    table = _CostTable(points, costs, start)
+    constrained = [c for c in costs if c.direction is not None]
+
+    def key(point):
+        return tuple(ParameterCost.DIRECTIONS[c.direction] * float(point[c.name])
+                     for c in constrained)
+
+    groups = OrderedDict()
+    for index, point in enumerate(points):
+        groups.setdefault(key(point), []).append(index)
+    keys = sorted(groups)
+    if start is not None and all(start.get(c.name) is not None for c in constrained):
+        # Continue in the direction from the current values, and only go
+        # back for the points that were passed already
+        current = key(start)
+        keys = [k for k in keys if k >= current] + [k for k in keys if k < current]
+
+    deadline = time.perf_counter() + time_limit
+    order = []
+    anchor = table.start
+    for k in keys:
+        path = _nearest_neighbour(table, groups[k], anchor)
+        path = _two_opt(table, path, anchor, passes, neighbours, deadline)
+        order.extend(path)
+        anchor = path[-1]
+    return order
+
+
+class _CostTable(object):
+    """ Holds the values of the parameters of the points as arrays, to
+    calculate the transition times from one point to many at once. The
+    start point is the row after the points, and None stands for an
+    unknown point from which all transitions are free.
+    """
+
+    def __init__(self, points, costs, start=None):
+        rows = list(points)
+        self.start = None
+        if start is not None:
+            self.start = len(rows)
+            rows.append(start)
+        self.columns = []
+        for cost in costs:
+            values = [row.get(cost.name) for row in rows]
+            rate = cost.rate
+            try:
+                column = np.array([np.nan if v is None else float(v) for v in values])
+            except (TypeError, ValueError):
+                # Values that are not numbers can only be compared
+                codes = {}
+                column = np.array([np.nan if v is None else codes.setdefault(v, len(codes))
+                                   for v in values], dtype=float)
+                rate = None
+            self.columns.append((column, column.tolist(), cost.settle, rate))
+
+    def times(self, source, targets):
+        """ Returns an array of the transition times from the source to
+        each of the targets
+        """
+        total = np.zeros(len(targets))
+        if source is None:
+            return total
+        for column, values, settle, rate in self.columns:
+            a = values[source]
+            if a != a:  # NaN, so the value is unknown
+                continue
+            b = column[targets]
+            changed = b != a
+            changed &= ~np.isnan(b)
+            if rate:
+                total += np.where(changed, settle + np.abs(b - a) / rate, 0.)
+            else:
+                total += settle * changed
+        return total
+
+    def time(self, source, target):
+        """ Returns the transition time from the source to the target """
+        if source is None or target is None:
+            return 0.
+        total = 0.
+        for column, values, settle, rate in self.columns:
+            a, b = values[source], values[target]
+            if a != b and a == a and b == b:
+                total += settle
+                if rate:
+                    total += abs(b - a) / rate
+        return total
+
+
+def _nearest_neighbour(table, indices, start):
+    remaining = np.array(indices)
+    path = []
+    current = start
+    while len(remaining):
+        best = int(np.argmin(table.times(current, remaining)))
+        current = int(remaining[best])
+        path.append(current)
+        remaining = np.delete(remaining, best)
+    return path
+
+
+def _two_opt(table, path, start, passes, neighbours, deadline):
+    """ Improves an open path with a fixed start and a free end by reversing
+    segments, which join points to one of their nearest neighbours. Points
+    are examined again only when their edges change.
+    """
+    if len(path) < 3:
+        return path
+    tour = [start] + path
+    position = {node: i for i, node in enumerate(tour)}
+    nodes = np.array(path)
+    count = min(neighbours, len(path) - 1)
+    nearest = {}
+    for node in ([start] if start is not None else []) + path:
+        times = table.times(node, nodes)
+        candidates = np.argpartition(times, count)[:count + 1]
+        nearest[node] = [int(nodes[i]) for i in candidates[np.argsort(times[candidates])]
+                         if nodes[i] != node][:count]
+    transition = table.time
+    pending = deque(tour if start is not None else path)
+    queued = set(pending)
+    budget = passes * len(tour)
+
+    def enqueue(*changed):
+        for node in changed:
+            if node is not None and node not in queued:
+                pending.append(node)
+                queued.add(node)
+
+    while pending and budget > 0:
+        budget -= 1
+        if budget % 64 == 0 and time.perf_counter() > deadline:
+            break
+        a = pending.popleft()
+        queued.discard(a)
+        for c in nearest.get(a, ()):
+            low, high = sorted((position[a], position[c]))
+            x, y = tour[low], tour[high]
+            end = high + 1 < len(tour)
+            # Replace the edges after x and y by (x, y) and their successors
+            sx, sy = tour[low + 1], tour[high + 1] if end else None
+            gain = (transition(x, sx) + transition(y, sy) -
+                    transition(x, y) - transition(sx, sy))
+            if high > low + 1 and gain > 1e-9:
+                tour[low + 1:high + 1] = tour[high:low:-1]
+                for i in range(low + 1, high + 1):
+                    position[tour[i]] = i
+                enqueue(a, x, y, sx, sy)
+                break
+            # Replace the edges before x and y by (x, y) and their predecessors
+            if low > 0:
+                px, py = tour[low - 1], tour[high - 1]
+                gain = (transition(px, x) + transition(py, y) -
+                        transition(px, py) - transition(x, y))
+                if high - 1 > low and gain > 1e-9:
+                    tour[low:high] = tour[high - 1:low - 1:-1]
+                    for i in range(low, high):
+                        position[tour[i]] = i
+                    enqueue(a, x, y, px, py)
+                    break
+    return tour[1:]
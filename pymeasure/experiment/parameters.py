@@ -22,6 +22,8 @@
 # THE SOFTWARE.
 #
 
+from copy import copy
+
 
 class Parameter(object):
     """ Encapsulates the information for an experiment parameter
@@ -351,6 +353,15 @@ class PhysicalParameter(VectorParameter):
         # Uncertainty must be non-negative
         self._value[1] = abs(self._value[1])
 
+    def __copy__(self):
+        # The value list and the uncertainty type are modified in place
+        result = self.__class__.__new__(self.__class__)
+        result.__dict__.update(self.__dict__)
+        if self._value is not None:
+            result._value = list(self._value)
+        result._utype = copy(self._utype)
+        return result
+
     @property
     def uncertainty_type(self):
         return self._utype.value
@@ -399,24 +410,31 @@ class Measurable(object):
     property will return the latest set value of the parameter (or default
     if never set).
 
+    The Measurables of a :class:`.Procedure` class define its data columns,
+    unless DATA_COLUMNS is set explicitly.
+
     :var value: The value of the parameter
 
-    :param name: The parameter name
+    :param name: The parameter name, which is used as the data column
     :param fget: The parameter fget function (e.g. an instrument parameter)
+    :param units: The units of measure for the parameter
+    :param measure: True if the value is part of each datapoint
     :param default: The default value
+    :param dtype: The data type of the column (e.g. 'float32'), or None
+                  for the type to be inferred when the data is read
     """
-    DATA_COLUMNS = []
 
-    def __init__(self, name, fget=None, units=None, measure=True, default=None, **kwargs):
+    def __init__(self, name, fget=None, units=None, measure=True, default=None,
+                 dtype=None, **kwargs):
         self.name = name
         self.units = units
         self.measure = measure
+        self.dtype = dtype
         if fget is not None:
             self.fget = fget
             self._value = fget()
         else:
             self._value = default
-        Measurable.DATA_COLUMNS.append(name)
 
     def fget(self):
         return self._value
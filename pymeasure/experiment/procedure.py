@@ -23,9 +23,13 @@
 #
 
 import logging
+import os
 import sys
-from copy import deepcopy
+import time
+from collections import OrderedDict
+from copy import copy
 from importlib.machinery import SourceFileLoader
+from threading import Lock
 
 from .parameters import Parameter, Measurable
 
@@ -51,10 +55,21 @@ class Procedure(object):
     
     If keyword arguments are provided, they are added to the object as
     attributes.
+
+    The data type of each column can be declared in the DATA_TYPES
+    dictionary, with values such as 'float32', 'float64', 'int', 'bool',
+    'category' or 'timestamp', so that the data is read with those types
+    instead of inferring them.
+
+    The Parameter and Measurable attributes of each Procedure class are
+    collected once, when the first instance is constructed, and each
+    instance only holds shallow copies of the Parameters.
     """
 
     DATA_COLUMNS = []
+    DATA_TYPES = {}
     MEASURE = {}
+    resume_point = 0  # Number of sweep points completed before resuming
     FINISHED, FAILED, ABORTED, QUEUED, RUNNING = 0, 1, 2, 3, 4
     STATUS_STRINGS = {
         FINISHED: 'Finished', FAILED: 'Failed', 
@@ -73,19 +88,59 @@ class Procedure(object):
                 log.info('Setting parameter %s to %s' % (key, kwargs[key]))
         self.gen_measurement()
 
+    @classmethod
+    def _schema(cls):
+        """ Returns a tuple of the Parameter and Measurable attributes of the
+        class, as dictionaries by attribute name, which are collected once
+        per class
+        """
+        schema = cls.__dict__.get('_cached_schema')
+        if schema is None:
+            parameters, measurables = OrderedDict(), OrderedDict()
+            for item in dir(cls):
+                attribute = getattr(cls, item, None)
+                if isinstance(attribute, Parameter):
+                    parameters[item] = attribute
+            # Measurables are kept in the order of definition, which is
+            # the order of their data columns
+            for klass in reversed(cls.__mro__):
+                for item, attribute in vars(klass).items():
+                    if isinstance(attribute, Measurable):
+                        measurables[item] = attribute
+                    else:
+                        measurables.pop(item, None)
+            schema = (parameters, measurables)
+            cls._cached_schema = schema
+        return schema
+
+    @classmethod
+    def measurables(cls):
+        """ Returns an ordered dictionary of the measured :class:`.Measurable`
+        attributes of the class by column name
+        """
+        return OrderedDict((m.name, m) for m in cls._schema()[1].values() if m.measure)
+
+    @classmethod
+    def column_dtypes(cls):
+        """ Returns a dictionary of the declared data types by column name,
+        from the Measurables and the DATA_TYPES of the class
+        """
+        dtypes = {name: m.dtype for name, m in cls.measurables().items()
+                  if m.dtype is not None}
+        dtypes.update(cls.DATA_TYPES)
+        return dtypes
+
     def gen_measurement(self):
         """Create MEASURE and DATA_COLUMNS variables for get_datapoint method."""
         # TODO: Refactor measurable-s implementation to be consistent with parameters
 
         self.MEASURE = {}
-        for item in dir(self):
-            parameter = getattr(self, item)
-            if isinstance(parameter, Measurable):
-                if parameter.measure:
-                    self.MEASURE.update({parameter.name: item})
+        for item, measurable in self._schema()[1].items():
+            if measurable.measure:
+                self.MEASURE.update({measurable.name: item})
 
         if not self.DATA_COLUMNS:
-            self.DATA_COLUMNS = Measurable.DATA_COLUMNS
+            self.DATA_COLUMNS = list(self.measurables())
 
     def get_datapoint(self):
         data = {key: getattr(self, self.MEASURE[key]).value for key in self.MEASURE}
@@ -103,14 +158,12 @@ class Procedure(object):
         """
         if not self._parameters:
             self._parameters = {}
-        for item in dir(self):
-            parameter = getattr(self, item)
-            if isinstance(parameter, Parameter):
-                self._parameters[item] = deepcopy(parameter)
-                if parameter.is_set():
-                    setattr(self, item, parameter.value)
-                else:
-                    setattr(self, item, None)
+        for item, parameter in self._schema()[0].items():
+            self._parameters[item] = copy(parameter)
+            if parameter.is_set():
+                setattr(self, item, parameter.value)
+            else:
+                setattr(self, item, None)
 
     def parameters_are_set(self):
         """ Returns True if all parameters are set """
@@ -199,6 +252,53 @@ class Procedure(object):
         """
         pass
 
+    def sweep(self, plan, interval=0.1):
+        """ Generates the points of a sweep plan as dictionaries of the
+        values by axis name, after waiting for the settle time of each point,
+        and emits the progress. The sweep ends early if the procedure
+        should stop.
+
+        .. code-block:: python
+
+            def execute(self):
+                plan = Product(Sweep.linear('field', 0, 1, 0.1, settle=5),
+                               Sweep.linear('gate', -1, 1, 0.01), snake=True)
+                for point in self.sweep(plan):
+                    self.set_field(point['field'])
+                    ...
+
+        The number of completed points is emitted after each point, so
+        that the :class:`.Recorder` can store checkpoints. When the
+        :class:`.Results` of an interrupted run are resumed, the points up
+        to :attr:`resume_point` are skipped, and the first point after them
+        waits for the longest settle time. An adaptive
+        :class:`~pymeasure.experiment.adaptive.Sampler` generates the skipped
+        points without their measured values, unless the rows of the resumed
+        data are passed to its :meth:`~pymeasure.experiment.adaptive.Sampler.feed`
+        method before the sweep.
+
+        :param plan: The :class:`~pymeasure.experiment.sweeps.Plan`
+        :param interval: Maximum time in seconds between checks of
+                         :meth:`.should_stop` while settling
+        """
+        total = len(plan)
+        for index, (point, settle) in enumerate(plan.steps()):
+            if index < self.resume_point:
+                continue  # Completed before the run was interrupted
+            if index and index == self.resume_point:
+                # Plans have a settle time by axis, and samplers a single one
+                settles = plan.settle.values() if isinstance(plan.settle, dict) else [plan.settle]
+                settle = max(settles, default=0.)
+            deadline = time.time() + settle
+            while not self.should_stop() and time.time() < deadline:
+                time.sleep(min(interval, max(deadline - time.time(), 0)))
+            if self.should_stop():
+                log.warning("Sweep stopped at point %d of %d", index, total)
+                return
+            yield point
+            self.emit('point', index + 1)
+            self.emit('progress', 100. * (index + 1) / total)
+
     def emit(self, topic, record):
         raise NotImplementedError('should be monkey patched by a worker')
 
@@ -231,37 +331,73 @@ class UnknownProcedure(Procedure):
         raise NotImplementedError("UnknownProcedure can not be run")
 
 
+_module_lock = Lock()
+_modules = {}
+
+
+def load_module(name, filename):
+    """ Returns the module of a Procedure from its source file. The module
+    is only executed the first time that it is needed and when the file has
+    changed since, as the modules are kept by file path and modification
+    time. A module that is already imported from the same file is used as
+    it is.
+
+    :param name: The name of the module
+    :param filename: The source file of the module
+    """
+    path = os.path.abspath(filename)
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        mtime = None
+    with _module_lock:
+        cached = _modules.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        module = sys.modules.get(name)
+        imported = getattr(module, '__file__', None)
+        if cached is not None or imported is None or os.path.abspath(imported) != path:
+            module = SourceFileLoader(name, filename).load_module()
+        _modules[path] = (mtime, module)
+    return module
+
+
+def procedure_state(procedure):
+    """ Returns a compact picklable form of a procedure, which consists of
+    the module name, source file and class name of the procedure and its
+    parameter values, from which :func:`restore_procedure` constructs it
+
+    :param procedure: The :class:`.Procedure` object
+    """
+    module = sys.modules[procedure.__module__]
+    return (module.__name__, module.__file__, procedure.__class__.__name__,
+            procedure.parameter_values())
+
+
+def restore_procedure(state):
+    """ Returns a new procedure from the form of :func:`procedure_state`
+
+    :param state: The module name, source file, class name and parameter values
+    """
+    name, filename, class_name, parameters = state
+    cls = getattr(load_module(name, filename), class_name)
+    procedure = cls()
+    procedure.set_parameters(parameters)
+    procedure.refresh_parameters()
+    return procedure
+
+
 class ProcedureWrapper(object):
 
     def __init__(self, procedure):
         self.procedure = procedure
 
     def __getstate__(self):
-        # Get all information needed to reconstruct procedure
-        self._parameters = self.procedure.parameter_values()
-        self._class = self.procedure.__class__.__name__
-        module = sys.modules[self.procedure.__module__]
-        self._package = module.__package__
-        self._module = module.__name__
-        self._file = module.__file__
-
+        # Only the class and the parameter values of the procedure are sent
         state = self.__dict__.copy()
-        del state['procedure']
+        state['procedure'] = procedure_state(self.procedure)
         return state
 
     def __setstate__(self, state):
         self.__dict__.update(state)
-
-        # Restore the procedure
-        module = SourceFileLoader(self._module, self._file).load_module()
-        cls = getattr(module, self._class)
-
-        self.procedure = cls()
-        self.procedure.set_parameters(self._parameters)
-        self.procedure.refresh_parameters()
-
-        del self._parameters
-        del self._class
-        del self._package
-        del self._module
-        del self._file
\ No newline at end of file
+        self.procedure = restore_procedure(self.procedure)
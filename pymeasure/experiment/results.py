@@ -26,23 +26,54 @@ import logging
 
 import os
 import re
-import sys
+import time
+from collections import OrderedDict
 from copy import deepcopy
-from importlib.machinery import SourceFileLoader
+from io import BytesIO
 from datetime import datetime
+from threading import Lock
 
 import pandas as pd
 
-from .procedure import Procedure, UnknownProcedure
+from .procedure import Procedure, UnknownProcedure, procedure_state, restore_procedure
 from .parameters import Parameter
+from .compression import is_compressed, open_data, write_member, find_last_line
+from .sharedbuffer import SharedBuffer
+from .rowindex import MappedReader
 
 log = logging.getLogger(__name__)
 log.addHandler(logging.NullHandler())
 
 
+_index_lock = Lock()
+_next_index = {}
+
+
+def _first_free_index(directory, basename, suffix, ext):
+    """ Returns the smallest index for which there is no file named
+    <basename>_<index><suffix>.<ext> in the directory, listing it once
+    """
+    regex = re.compile("%s_(?P<index>\\d+)%s\\.%s$" % (
+        re.escape(basename), re.escape(suffix), re.escape(ext)))
+    used = set()
+    for name in os.listdir(directory):
+        search = regex.match(name)
+        if search is not None:
+            used.add(int(search.group("index")))
+    i = 1
+    while i in used:
+        i += 1
+    return i
+
+
 def unique_filename(directory, prefix='DATA', suffix='', ext='csv',
                     dated_folder=False, index=True, datetimeformat="%Y-%m-%d"):
     """ Returns a unique filename based on the directory and prefix
+
+    The filename has the first free index, as found by listing the directory
+    the first time a base name is used. The last index returned for each
+    base name is remembered, so that later calls only check the files from
+    there on, and do not return an index below it if files are deleted.
     """
     now = datetime.now()
     directory = os.path.abspath(directory)
@@ -51,13 +82,19 @@ def unique_filename(directory, prefix='DATA', suffix='', ext='csv',
     if not os.path.exists(directory):
         os.makedirs(directory)
     if index:
-        i = 1
         basename = "%s%s" % (prefix, now.strftime(datetimeformat))
         basepath = os.path.join(directory, basename)
-        filename = "%s_%d%s.%s" % (basepath, i, suffix, ext)
-        while os.path.exists(filename):
-            i += 1
+        key = (basepath, suffix, ext)
+        with _index_lock:
+            i = _next_index.get(key)
+            if i is None:
+                i = _first_free_index(directory, basename, suffix, ext)
             filename = "%s_%d%s.%s" % (basepath, i, suffix, ext)
+            while os.path.exists(filename):
+                i += 1
+                filename = "%s_%d%s.%s" % (basepath, i, suffix, ext)
+            # The file may never be created, so the same index is checked again
+            _next_index[key] = i
     else:
         basename = "%s%s%s.%s" % (prefix, now.strftime(datetimeformat), suffix, ext)
         filename = os.path.join(directory, basename)
@@ -100,6 +137,13 @@ class Results(object):
     :cvar DELIMITER: The character used to delimit the data (default: ,)
     :cvar LINE_BREAK: The character used for line breaks (default \\n)
     :cvar CHUNK_SIZE: The length of the data chuck that is read
+    :cvar DTYPE_ALIASES: The pandas data types of the names that can be
+                         used in Procedure.DATA_TYPES
+    :cvar CHECKPOINT: The name of the comment lines that store checkpoints
+    :cvar CHECKPOINT_TAIL: Number of bytes at the end of a file in which
+                           the status is looked up when the file is opened
+    :cvar STORE_ROW_INDEX: Whether the row index that :meth:`.read` builds
+                           is stored in a sidecar file next to the data file
 
     :param procedure: Procedure object
     :param data_filename: The data filename where the data is or should be
@@ -110,6 +154,10 @@ class Results(object):
     DELIMITER = ','
     LINE_BREAK = "\n"
     CHUNK_SIZE = 1000
+    DTYPE_ALIASES = {'int': 'int64', 'float': 'float64', 'timestamp': 'datetime64[ns]'}
+    CHECKPOINT = 'Checkpoint'
+    CHECKPOINT_TAIL = 1 << 20
+    STORE_ROW_INDEX = False
 
     def __init__(self, procedure, data_filename):
         if not isinstance(procedure, Procedure):
@@ -129,49 +177,60 @@ class Results(object):
         self.data_filename = data_filename
         self.data_filenames = data_filenames
 
+        self._data = None
+        self._offset = None
+        self.resumed = None
+        self.buffer = None
+        self._buffer_rows = 0
+        self._reader = None
         if os.path.exists(data_filename):  # Assume header is already written
-            self.reload()
-            self.procedure.status = Procedure.FINISHED
-            # TODO: Correctly store and retrieve status
+            # The data is read when it is first requested. The status is
+            # that of the last checkpoint, where RUNNING means that the run
+            # is still being recorded or was interrupted.
+            try:
+                checkpoint, offset = self.last_checkpoint(Results.CHECKPOINT_TAIL)
+            except OSError:
+                checkpoint = None
+            if checkpoint is None:
+                self.procedure.status = Procedure.FINISHED
+            else:
+                self.procedure.status = checkpoint['status']
         else:
             for filename in self.data_filenames:
+                if is_compressed(filename):
+                    write_member(filename, self.header() + self.labels(), mode='wb')
+                    continue
                 with open(filename, 'w') as f:
                     f.write(self.header())
                     f.write(self.labels())
-            self._data = None
 
     def __getstate__(self):
-        # Get all information needed to reconstruct procedure
-        self._parameters = self.procedure.parameter_values()
-        self._class = self.procedure.__class__.__name__
-        module = sys.modules[self.procedure.__module__]
-        self._package = module.__package__
-        self._module = module.__name__
-        self._file = module.__file__
-
+        # The procedure is sent as its class and parameter values, and the
+        # data is read from the file again, unless it comes from a shared
+        # buffer, in which case the file can lag behind
         state = self.__dict__.copy()
-        del state['procedure']
+        state['procedure'] = procedure_state(self.procedure)
         del state['procedure_class']
+        del state['parameters']
+        state['_reader'] = None  # The rows are indexed again when needed
+        if self.buffer is not None and self.buffer.name is not None:
+            state['buffer'] = self.buffer.name
+        else:  # A RowBuffer is not shared with other processes
+            state['buffer'] = None
+            state['_data'] = state['_offset'] = None
         return state
 
     def __setstate__(self, state):
         self.__dict__.update(state)
-
-        # Restore the procedure
-        module = SourceFileLoader(self._module, self._file).load_module()
-        cls = getattr(module, self._class)
-
-        self.procedure = cls()
-        self.procedure.set_parameters(self._parameters)
-        self.procedure.refresh_parameters()
-
-        self.procedure_class = cls
-
-        del self._parameters
-        del self._class
-        del self._package
-        del self._module
-        del self._file
+        self.procedure = restore_procedure(self.procedure)
+        self.procedure_class = self.procedure.__class__
+        self.parameters = self.procedure.parameter_objects()
+        if self.buffer is not None:  # Attach to the shared memory
+            try:
+                self.buffer = SharedBuffer(name=self.buffer)
+            except OSError:  # Closed by the owner, or not supported
+                self.buffer = None
+                self._offset = None
 
     def header(self):
         """ Returns a text header to accompany a datafile so that the procedure
@@ -189,6 +248,70 @@ class Results(object):
         h = [Results.COMMENT + l for l in h]  # Comment each line
         return Results.LINE_BREAK.join(h) + Results.LINE_BREAK
 
+    @staticmethod
+    def format_checkpoint(**values):
+        """ Returns a comment line that stores the values of a checkpoint,
+        such as the status, progress and number of completed points
+        """
+        return "%s%s: %s" % (Results.COMMENT, Results.CHECKPOINT, " ".join(
+            "%s=%s" % (name, value) for name, value in values.items()))
+
+    @staticmethod
+    def parse_checkpoint(line):
+        """ Returns a dictionary of the values of a checkpoint line """
+        values = {}
+        for item in line.split(":", 1)[1].split():
+            name, value = item.split("=", 1)
+            try:
+                values[name] = int(value)
+            except ValueError:
+                values[name] = float(value)
+        return values
+
+    def last_checkpoint(self, tail=None, data_filename=None):
+        """ Returns the values of the last checkpoint in the data file and
+        the byte offset of its end, or (None, None) if there is none
+
+        :param tail: Maximum number of bytes at the end of the file to
+                     search, or None to search the whole file
+        :param data_filename: One of the data filenames, which defaults to
+                              the first
+        """
+        marker = (Results.COMMENT + Results.CHECKPOINT + ":").encode()
+        line, offset = find_last_line(data_filename or self.data_filename, marker, tail)
+        if line is None:
+            return None, None
+        return Results.parse_checkpoint(line), offset
+
+    def resume(self):
+        """ Prepares the data file of an interrupted run to be continued.
+        The rows after the last checkpoint, which belong to a point that was
+        not completed or were torn by the interruption, are removed, and the
+        procedure is set to skip the completed points of its sweep (see
+        :meth:`.Procedure.sweep`). Returns the values of the checkpoint.
+
+        .. code-block:: python
+
+            results = Results.load(filename)
+            results.resume()
+            worker = Worker(results)
+            worker.start()
+        """
+        for filename in self.data_filenames:
+            checkpoint, offset = self.last_checkpoint(data_filename=filename)
+            if checkpoint is None:
+                raise ValueError("The data file %s has no checkpoint to resume from" % filename)
+            with open(filename, 'r+b') as f:
+                f.truncate(offset)
+        log.info("Resuming %s after %d completed points", self.data_filename,
+                 checkpoint.get('point', 0))
+        self.procedure.resume_point = checkpoint.get('point', 0)
+        self.procedure.status = Procedure.QUEUED
+        self.resumed = checkpoint
+        self._data = None
+        self._offset = None
+        return checkpoint
+
     def labels(self):
         """ Returns the columns labels as a string to be written
         to the file
@@ -210,17 +333,32 @@ class Results(object):
         return data
 
     @staticmethod
-    def parse_header(header, procedure_class=None):
-        """ Returns a Procedure object with the parameters as defined in the
-        header text.
+    def read_header(data_filename):
+        """ Returns the commented header of a data file and the number of
+        header lines, without reading any of the data
+
+        :param data_filename: Path of the data file
         """
-        if procedure_class is not None:
-            procedure = procedure_class()
-        else:
-            procedure = None
+        header = ""
+        header_count = 0
+        with open_data(data_filename) as f:
+            for line in f:
+                line = line.decode()
+                if not line.startswith(Results.COMMENT):
+                    break
+                header += line.strip() + Results.LINE_BREAK
+                header_count += 1
+        return header[:-1], header_count
 
+    @staticmethod
+    def parse_header_fields(header):
+        """ Returns the Procedure module, the Procedure class name and a
+        dictionary of the (value, units) of each parameter, as written in
+        the header text. No Procedure is constructed.
+        """
         header = header.split(Results.LINE_BREAK)
         procedure_module = None
+        procedure_class = None
         parameters = {}
         for line in header:
             if line.startswith(Results.COMMENT):
@@ -244,7 +382,21 @@ class Results(object):
                         search.group("value"),
                         search.group("units")
                     )
+        return procedure_module, procedure_class, parameters
+
+    @staticmethod
+    def parse_header(header, procedure_class=None):
+        """ Returns a Procedure object with the parameters as defined in the
+        header text.
+        """
+        if procedure_class is not None:
+            procedure = procedure_class()
+        else:
+            procedure = None
+
+        procedure_module, header_class, parameters = Results.parse_header_fields(header)
         if procedure is None:
+            procedure_class = header_class
             if procedure_class is None:
                 raise ValueError("Header does not contain the Procedure class")
             try:
@@ -284,71 +436,358 @@ class Results(object):
         """ Returns a Results object with the associated Procedure object and
         data
         """
-        header = ""
-        header_read = False
-        header_count = 0
-        with open(data_filename, 'r') as f:
-            while not header_read:
-                line = f.readline()
-                if line.startswith(Results.COMMENT):
-                    header += line.strip() + Results.LINE_BREAK
-                    header_count += 1
-                else:
-                    header_read = True
-        procedure = Results.parse_header(header[:-1], procedure_class)
+        header, header_count = Results.read_header(data_filename)
+        procedure = Results.parse_header(header, procedure_class)
         results = Results(procedure, data_filename)
         results._header_count = header_count
         return results
 
+    def sample(self, max_rows=10000, blocks=10):
+        """ Returns a DataFrame with at most max_rows rows of the data,
+        which are read from evenly spaced blocks of the file. Only a bounded
+        part of the file is read, which makes it suitable for previews.
+
+        :param max_rows: Maximum number of rows to return
+        :param blocks: Number of blocks the rows are taken from
+        """
+        if is_compressed(self.data_filename):
+            return self._sample_stream(max_rows)
+        size = os.path.getsize(self.data_filename)
+        with open(self.data_filename, 'rb') as f:
+            line = f.readline()
+            while line.startswith(Results.COMMENT.encode()):
+                line = f.readline()
+            columns = line.decode().strip().split(Results.DELIMITER)
+            start = f.tell()
+            lines = [f.readline() for i in range(max_rows)]
+            if lines[-1] and f.tell() < size:  # Decimate the larger file
+                block_rows = max(max_rows // blocks, 1)
+                lines = lines[:block_rows]
+                for i in range(1, blocks):
+                    f.seek(start + i * (size - start) // blocks)
+                    f.readline()  # Skip to the start of the next line
+                    lines.extend(f.readline() for j in range(block_rows))
+        lines = [l for l in lines if l.endswith(b'\n') and
+                 not l.startswith(Results.COMMENT.encode())]
+        if not lines:
+            return self.empty_data(columns)
+        return pd.read_csv(BytesIO(b''.join(lines)), header=None, names=columns,
+                           **self.parser_options())
+
+    def _sample_stream(self, max_rows):
+        """ Returns evenly spaced rows of a file that can only be read from
+        the start, such as a compressed file. The whole file is read, but at
+        most twice max_rows rows are kept in memory.
+        """
+        kept, count, step = [], 0, 1
+        for chunk in self.chunks(max_rows):
+            kept.append(chunk.iloc[(-count) % step::step])
+            count += len(chunk)
+            while sum(len(rows) for rows in kept) > max_rows:
+                kept = [self.concat(kept).iloc[::2]]
+                step *= 2
+        if not kept:
+            return self.empty_data()
+        return self.concat(kept)
+
+    def chunks(self, chunksize=None, columns=None, follow=False, interval=0.1,
+               timeout=None, should_stop=None):
+        """ Returns a generator of DataFrames of consecutive blocks of rows,
+        so that a file of any size can be processed in constant memory
+
+        .. code-block:: python
+
+            total = 0
+            for chunk in results.chunks(100000, columns=['Current (A)']):
+                total += chunk['Current (A)'].sum()
+
+        With follow, the file is tailed while it is being written: new
+        complete rows are yielded as they appear, until should_stop returns
+        True or the file has not grown for timeout seconds.
+
+        :param chunksize: Maximum number of rows in a chunk, which defaults
+                          to the CHUNK_SIZE
+        :param columns: A list of the columns to read, or None for all
+        :param follow: Keep reading rows that are appended to the file
+        :param interval: Time in seconds between checks for new rows
+        :param timeout: Time in seconds without new rows after which
+                        following stops, or None to follow until stopped
+        :param should_stop: A function that returns True to stop following
+        """
+        chunksize = chunksize or Results.CHUNK_SIZE
+        comment = Results.COMMENT.encode()
+        with open_data(self.data_filename) as f:
+            line = f.readline()
+            while line.startswith(comment):
+                line = f.readline()
+            names = line.decode().strip().split(Results.DELIMITER)
+            options = self.parser_options(columns, names)
+            if columns is not None:
+                order = [column for column in columns if column in names]
+
+            def parse(source):
+                reader = pd.read_csv(source, header=None, names=names, comment=Results.COMMENT,
+                                     chunksize=chunksize, **options)
+                for chunk in reader:
+                    yield chunk if columns is None else chunk[order]
+
+            if not follow:
+                yield from parse(f)
+                return
+
+            pending = b''
+            last_growth = time.monotonic()
+            while True:
+                block = f.read(1 << 22)
+                if block:
+                    pending += block
+                    end = pending.rfind(b'\n') + 1
+                    if end:
+                        yield from parse(BytesIO(pending[:end]))
+                        pending = pending[end:]
+                    last_growth = time.monotonic()
+                    continue
+                stop = should_stop is not None and should_stop()
+                if stop or (timeout is not None and time.monotonic() - last_growth > timeout):
+                    break
+                time.sleep(interval)
+            pending += f.read()  # Rows written before stopping
+            if pending.strip():
+                yield from parse(BytesIO(pending))
+
+    def empty_data(self, columns=None):
+        """ Returns an empty DataFrame of the data columns, with the data
+        types declared by the procedure
+
+        :param columns: The column names, which default to the DATA_COLUMNS
+        """
+        if columns is None:
+            columns = self.procedure.DATA_COLUMNS
+        return Results.empty_frame(self.procedure_class, columns)
+
+    def parser_options(self, columns=None, names=None):
+        """ Returns the keyword arguments of :func:`pandas.read_csv` that
+        apply the data types declared by the procedure, so that they are
+        not inferred
+
+        :param columns: A list of the columns to read, or None for all
+        :param names: The column names of the file, which are needed to
+                      only read the columns
+        """
+        return Results.read_options(self.procedure_class, columns, names)
+
+    def concat(self, frames):
+        """ Concatenates DataFrames of the data, keeping categorical
+        columns categorical when their categories differ
+        """
+        return Results.concat_frames(self.procedure_class, frames)
+
+    @staticmethod
+    def empty_frame(procedure_class, columns):
+        """ Returns an empty DataFrame of the columns, with the data types
+        declared by the Procedure class, without constructing a Results
+        object
+        """
+        dtypes = procedure_class.column_dtypes()
+        dtypes = {column: Results.DTYPE_ALIASES.get(dtype, dtype)
+                  for column, dtype in dtypes.items()}
+        return pd.DataFrame(OrderedDict(
+            (column, pd.Series(dtype=dtypes.get(column, object))) for column in columns
+        ))
+
+    @staticmethod
+    def read_options(procedure_class, columns=None, names=None):
+        """ Returns the keyword arguments of :func:`pandas.read_csv` that
+        apply the data types declared by the Procedure class, as
+        :meth:`.parser_options` does
+        """
+        dtypes = procedure_class.column_dtypes()
+        if columns is not None:
+            dtypes = {column: dtype for column, dtype in dtypes.items() if column in columns}
+        if names is not None:
+            dtypes = {column: dtype for column, dtype in dtypes.items() if column in names}
+        options = {'dtype': {column: Results.DTYPE_ALIASES.get(dtype, dtype)
+                             for column, dtype in dtypes.items() if dtype != 'timestamp'}}
+        timestamps = [column for column, dtype in dtypes.items() if dtype == 'timestamp']
+        if timestamps:
+            options['parse_dates'] = timestamps
+        if columns is not None and names is not None:
+            # A list rather than a callable, which needs pandas 0.20
+            options['usecols'] = [column for column in names if column in columns]
+        return options
+
+    @staticmethod
+    def concat_frames(procedure_class, frames):
+        """ Concatenates DataFrames of the data of a Procedure class, as
+        :meth:`.concat` does
+        """
+        data = pd.concat(frames, ignore_index=True)
+        for column, dtype in procedure_class.column_dtypes().items():
+            if dtype == 'category' and column in data and data[column].dtype != 'category':
+                data[column] = data[column].astype('category')
+        return data
+
+    def attach_buffer(self, buffer):
+        """ Reads the rows that are appended to a
+        :class:`~pymeasure.experiment.sharedbuffer.RowBuffer` or
+        :class:`~pymeasure.experiment.sharedbuffer.SharedBuffer` from now on,
+        instead of reading them from the data file
+
+        :param buffer: The buffer that the Worker appends to
+        """
+        self.data  # Read the rows that are already in the file
+        self.buffer = buffer
+        self._buffer_rows = buffer.count
+
+    def detach_buffer(self):
+        """ Reads the last rows from the buffer, after which new rows are
+        read from the data file again. The buffer is closed by its owner,
+        once the Worker no longer appends to it.
+        """
+        if self.buffer is None:
+            return
+        self.data
+        if self.buffer is not None:  # All of the rows were in the buffer
+            self.buffer = None
+            self._offset = os.path.getsize(self.data_filename)
+
+    def _read_buffer(self):
+        """ Adds the new rows of the buffer to the data, and returns False if
+        the buffer can not be used
+        """
+        values, count = self.buffer.read(self._buffer_rows)
+        if not self.buffer.valid or values is None:
+            log.info("Reading %s from the file, since the shared buffer "
+                     "is missing rows", self.data_filename)
+            self.buffer = None
+            self._offset = None
+            return False
+        if count > self._buffer_rows:
+            # The values are floats, which are cast to the declared types,
+            # or otherwise to the types of the rows read so far
+            dtypes = {}
+            if self._data is not None and len(self._data) > 0:
+                dtypes.update(self._data.dtypes.items())
+            dtypes.update((column, self.DTYPE_ALIASES.get(dtype, dtype))
+                          for column, dtype in self.procedure.column_dtypes().items())
+            frame = pd.DataFrame(values).astype({
+                column: dtype for column, dtype in dtypes.items() if column in values})
+            if self._data is None or len(self._data) == 0:
+                self._data = frame
+            else:
+                self._data = self.concat([self._data, frame])
+            self._buffer_rows = count
+        return True
+
+    def read(self, columns=None, start=0, stop=None):
+        """ Returns a DataFrame of the rows from start up to stop, which are
+        indexed like a list, of the given columns
+
+        For a finished run in an uncompressed file, whose data has not been
+        read in full, the rows are located with an index of their byte
+        offsets, and only those rows and columns are parsed from a memory
+        map of the file (see :class:`~pymeasure.experiment.rowindex.MappedReader`).
+        Columns of all rows are kept, so that reading them again is
+        immediate. Otherwise, the rows are taken from :attr:`data`, and the
+        DataFrame shares its values rather than copying them.
+
+        :param columns: A list of the columns to read, or None for all
+        :param start: The index of the first row
+        :param stop: The index after the last row, or None for all rows
+        """
+        if self._is_mapped():
+            if self._reader is None:
+                self._reader = MappedReader(self.data_filename, Results.COMMENT,
+                                            Results.DELIMITER, self.STORE_ROW_INDEX)
+            return self._reader.read(columns, start, stop, **self.parser_options(columns))
+        data = self.data
+        if columns is not None:
+            data = pd.DataFrame(OrderedDict(
+                (column, data[column]) for column in columns if column in data), copy=False)
+        return data.iloc[start:stop]
+
+    def _is_mapped(self):
+        """ Returns True if rows are read through the row index, rather
+        than from the data in memory
+        """
+        recording = self.procedure.status in (Procedure.QUEUED, Procedure.RUNNING)
+        if recording or self.buffer is not None or is_compressed(self.data_filename):
+            return False
+        if self._data is not None and self._offset is not None:
+            try:  # The data was read up to the end of the file
+                return self._offset < os.path.getsize(self.data_filename)
+            except OSError:
+                return False
+        return True
+
     @property
     def data(self):
         # Need to update header count for correct referencing
         if self._header_count == -1:
             self._header_count = len(
                 self.header()[-1].split(Results.LINE_BREAK))
-        if self._data is None or len(self._data) == 0:
-            # Data has not been read
+        if self.buffer is not None and self._read_buffer():
+            # The new rows were read from the shared buffer
+            return self._data
+        if self._data is None or len(self._data) == 0 or self._offset is None:
+            # Data has not been read, or it is not known up to where
             try:
                 self.reload()
             except Exception:
                 # Empty dataframe
-                self._data = pd.DataFrame(columns=self.procedure.DATA_COLUMNS)
-        else:  # Concatenate additional data, if any, to already loaded data
-            skiprows = len(self._data) + self._header_count
-            chunks = pd.read_csv(
-                self.data_filename,
-                comment=Results.COMMENT,
-                header=0,
-                names=self._data.columns,
-                chunksize=Results.CHUNK_SIZE, skiprows=skiprows, iterator=True
-            )
-            try:
-                tmp_frame = pd.concat(chunks, ignore_index=True)
+                self._data = self.empty_data()
+        else:  # Read the rows written since, which are only complete rows
+            with open_data(self.data_filename, self._offset) as f:
+                block = f.read()
+                self._offset = f.raw.tell()
+            if block:
+                tmp_frame = pd.read_csv(BytesIO(block), comment=Results.COMMENT, header=None,
+                                        names=self._data.columns, **self.parser_options())
                 # only append new data if there is any
                 # if no new data, tmp_frame dtype is object, which override's
                 # self._data's original dtype - this can cause problems plotting
                 # (e.g. if trying to plot int data on a log axis)
                 if len(tmp_frame) > 0:
-                    self._data = pd.concat([self._data, tmp_frame],
-                                           ignore_index=True)
-            except Exception:
-                pass  # All data is up to date
+                    self._data = self.concat([self._data, tmp_frame])
         return self._data
 
+    @data.setter
+    def data(self, data):
+        self.set_data(data)
+
+    def set_data(self, data, offset=None):
+        """ Uses data that was read elsewhere, for example in a background
+        thread, so that later access only reads the rows after it
+
+        :param data: The DataFrame of the data
+        :param offset: The byte offset in the data file up to which the data
+                       was read, or None to read the file again when the
+                       data is next requested
+        """
+        self._data = data
+        self._offset = offset
+
     def reload(self):
         """ Preforms a full reloading of the file data, neglecting
-        any changes in the comments
+        any changes in the comments. A last row that is incomplete, because
+        it is still being written or was torn by a crash, is not read.
         """
-        chunks = pd.read_csv(
-            self.data_filename,
-            comment=Results.COMMENT,
-            chunksize=Results.CHUNK_SIZE,
-            iterator=True
-        )
-        try:
-            self._data = pd.concat(chunks, ignore_index=True)
-        except Exception:
-            self._data = chunks.read()
+        with open_data(self.data_filename) as f:
+            chunks = pd.read_csv(
+                f,
+                comment=Results.COMMENT,
+                chunksize=Results.CHUNK_SIZE,
+                iterator=True,
+                **self.parser_options()
+            )
+            try:
+                self._data = self.concat(chunks)
+            except Exception:
+                self._data = chunks.read()
+            # Later reads start from the end of the last complete row
+            self._offset = f.raw.tell()
+        if len(self._data) == 0:
+            self._data = self.empty_data(list(self._data.columns))
 
     def __repr__(self):
         return "<{}(filename='{}',procedure={},shape={})>".format(
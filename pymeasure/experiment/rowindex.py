@@ -0,0 +1,245 @@
+#
+# This file is part of the PyMeasure package.
+#
+# Copyright (c) 2013-2017 PyMeasure Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+
+import logging
+import mmap
+import os
+import struct
+from collections import OrderedDict
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+
+class RowIndex(object):
+    """ The byte offsets of the start of each data row of an uncompressed
+    Results file, followed by the offset of the end of the last row, so
+    that the bytes of rows i to j are found from offsets[i] to offsets[j].
+    The offsets are found by scanning the file once, and are kept in memory.
+    The index is rebuilt if the size or the modification time of the data
+    file no longer match those it was built from.
+
+    With store, the offsets are also stored in a sidecar file next to the
+    data file, named with the SUFFIX, from which they are memory-mapped when
+    the file is opened again, so that large files are only scanned once.
+
+    Comment lines, such as checkpoints, and blank lines are not rows, but
+    they may lie within the bytes of a range of rows. A last line without a
+    line break is not indexed until it is complete.
+
+    :param filename: The data filename
+    :param comment: The character that starts a comment line
+    :param store: Whether the offsets are stored in a sidecar file
+    """
+
+    SUFFIX = '.idx'
+    MAGIC = b'PMROWS01'
+    # Magic, data file size, modification time (ns), rows, label line start and end
+    HEADER = struct.Struct('<8sqqqqq')
+    BLOCK_SIZE = 1 << 24
+
+    def __init__(self, filename, comment='#', store=False):
+        self.filename = filename
+        self.index_filename = filename + self.SUFFIX
+        self.comment = ord(comment)
+        self.store = store
+        self.offsets = None
+        self.labels = (0, 0)
+        self._state = None
+        if not (store and self.load()):
+            self.build()
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def state(self):
+        """ Returns the size and modification time of the data file """
+        stat = os.stat(self.filename)
+        return stat.st_size, stat.st_mtime_ns
+
+    def is_stale(self):
+        """ Returns True if the data file changed since it was indexed """
+        return self.state() != self._state
+
+    def load(self):
+        """ Maps the offsets from the sidecar file, and returns False if
+        there is none that matches the data file
+        """
+        try:
+            with open(self.index_filename, 'rb') as f:
+                fields = self.HEADER.unpack(f.read(self.HEADER.size))
+        except (OSError, struct.error):
+            return False
+        magic, size, mtime, rows, label_start, label_end = fields
+        state = self.state()
+        if magic != self.MAGIC or (size, mtime) != state:
+            return False
+        self.offsets = np.memmap(self.index_filename, dtype='<i8', mode='r',
+                                 offset=self.HEADER.size, shape=(rows + 1,))
+        self.labels = (label_start, label_end)
+        self._state = state
+        return True
+
+    def build(self):
+        """ Finds the offsets of the rows by scanning the data file for line
+        breaks, and stores them in the sidecar file if store is set
+        """
+        state = self.state()
+        size = state[0]
+        breaks = []
+        with open(self.filename, 'rb') as f:
+            if size > 0:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as memory:
+                    data = np.frombuffer(memory, np.uint8, size)
+                    for position in range(0, size, self.BLOCK_SIZE):
+                        block = data[position:position + self.BLOCK_SIZE]
+                        breaks.append(np.flatnonzero(block == 10) + position)
+                    ends = np.concatenate(breaks) + 1
+                    starts = np.concatenate([[0], ends[:-1]])[:len(ends)].astype(np.int64)
+                    first = data[np.minimum(starts, size - 1)]
+                    del data, block  # Release the memory map
+            else:
+                starts = ends = first = np.empty(0, np.int64)
+        lines = np.flatnonzero((first != self.comment) & (first != 10) & (first != 13))
+        if len(lines) > 0:  # The first line that is not a comment has the labels
+            self.labels = (int(starts[lines[0]]), int(ends[lines[0]]))
+            lines = lines[1:]
+        end = ends[lines[-1]] if len(lines) > 0 else self.labels[1]
+        self.offsets = np.append(starts[lines], end).astype('<i8')
+        self._state = state
+        if self.store:
+            self._save()
+
+    def _save(self):
+        header = self.HEADER.pack(self.MAGIC, self._state[0], self._state[1],
+                                  len(self), *self.labels)
+        temporary = self.index_filename + '.tmp'
+        try:
+            with open(temporary, 'wb') as f:
+                f.write(header)
+                f.write(self.offsets.tobytes())
+            os.replace(temporary, self.index_filename)
+        except OSError as e:
+            log.info("The row index of %s is not stored: %s", self.filename, e)
+
+
+class MappedReader(object):
+    """ Reads any range of rows and any columns of an uncompressed Results
+    file, by locating the rows with a :class:`.RowIndex` and parsing only
+    their bytes from a memory map of the file. The file is only mapped
+    while rows are read.
+
+    Columns that are read for all of the rows are kept, so that reading
+    them again, for example when the axes of a plot are changed, does not
+    parse the file. The index and the kept columns are renewed when the
+    data file changes.
+
+    .. code-block:: python
+
+        reader = MappedReader('DATA1.csv')
+        data = reader.read(['Voltage (V)', 'Current (A)'])
+        tail = reader.read(start=-100)
+
+    :param filename: The data filename
+    :param comment: The character that starts a comment line
+    :param delimiter: The character between the values of a row
+    :param store_index: Whether the row index is stored in a sidecar file
+    """
+
+    def __init__(self, filename, comment='#', delimiter=',', store_index=False):
+        self.filename = filename
+        self.comment = comment
+        self.delimiter = delimiter
+        self.index = RowIndex(filename, comment, store_index)
+        self._names = None
+        self._columns = {}
+
+    def __len__(self):
+        self.refresh()
+        return len(self.index)
+
+    @property
+    def columns(self):
+        """ The column names of the data file """
+        if self._names is None:
+            start, end = self.index.labels
+            with open(self.filename, 'rb') as f:
+                f.seek(start)
+                labels = f.read(end - start)
+            self._names = labels.decode().strip().split(self.delimiter) if labels else []
+        return self._names
+
+    def refresh(self):
+        """ Reindexes the data file if it has changed, and returns True if
+        it has
+        """
+        if not self.index.is_stale():
+            return False
+        self.index.build()
+        self._names = None
+        self._columns.clear()
+        return True
+
+    def read(self, columns=None, start=0, stop=None, **options):
+        """ Returns a DataFrame of the rows from start up to stop, which are
+        indexed like a list
+
+        :param columns: A list of the columns to read, or None for all
+        :param start: The index of the first row
+        :param stop: The index after the last row, or None for all rows
+        :param options: Keyword arguments of :func:`pandas.read_csv`, such
+                        as the data types of the columns
+        """
+        self.refresh()
+        start, stop, _ = slice(start, stop).indices(len(self.index))
+        if columns is None or start > 0 or stop < len(self.index):
+            return self._parse(columns, start, stop, options)
+        missing = [column for column in columns if column not in self._columns]
+        if missing:
+            self._columns.update(self._parse(missing, start, stop, options).items())
+        names = [column for column in columns if column in self._columns]
+        return pd.DataFrame(OrderedDict((column, self._columns[column]) for column in names),
+                            copy=False)
+
+    def _parse(self, columns, start, stop, options):
+        names = self.columns
+        if columns is not None:
+            columns = [column for column in columns if column in names]
+            options = dict(options, usecols=columns)
+        if stop <= start:
+            data = pd.DataFrame(columns=names if columns is None else columns)
+        else:
+            with open(self.filename, 'rb') as f, \
+                    mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as memory:
+                block = memory[self.index.offsets[start]:self.index.offsets[stop]]
+            if not block.strip():
+                data = pd.DataFrame(columns=names if columns is None else columns)
+            else:
+                data = pd.read_csv(BytesIO(block), header=None, names=names,
+                                   comment=self.comment, **options)
+        return data if columns is None else data[columns]
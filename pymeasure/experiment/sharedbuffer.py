@@ -0,0 +1,206 @@
+#
+# This file is part of the PyMeasure package.
+#
+# Copyright (c) 2013-2017 PyMeasure Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+
+import json
+import logging
+
+import numpy as np
+
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:  # Python < 3.8
+    shared_memory = None
+
+
+class RowBuffer(object):
+    """ A ring buffer of columns of float64 values, to which the
+    :class:`.Worker` appends each row of results, so that the live data can
+    be read without formatting, writing and parsing the data file. The data
+    file remains the complete copy of the data.
+
+    The buffer is held in the memory of the process, so it is read by the
+    threads of that process, such as the :class:`.Manager` that plots the
+    rows of the Worker thread. Readers in other processes need a
+    :class:`.SharedBuffer` instead.
+
+    If a value can not be converted to a float, the buffer is marked as
+    invalid and readers use the data file instead.
+
+    :param columns: The column names
+    :param capacity: The number of rows that the buffer holds
+    """
+
+    HEADER_SIZE = 64
+    # Indices of the header fields
+    COUNT, CAPACITY, COLUMNS, VALID, NAMES = range(5)
+
+    def __init__(self, columns, capacity=100000):
+        self.columns = list(columns)
+        self.capacity = capacity
+        self._header = np.zeros(self.HEADER_SIZE // 8, np.int64)
+        self._header[self.CAPACITY] = capacity
+        self._header[self.COLUMNS] = len(self.columns)
+        self._header[self.VALID] = 1
+        self._values = np.empty((len(self.columns), capacity), np.float64)
+
+    @property
+    def name(self):
+        """ None, since the buffer can not be attached to by other processes """
+        return None
+
+    @property
+    def count(self):
+        """ The total number of rows that were appended """
+        return int(self._header[self.COUNT])
+
+    @property
+    def valid(self):
+        """ False if a row could not be stored, in which case the data file
+        should be read instead
+        """
+        return bool(self._header[self.VALID])
+
+    def append(self, record):
+        """ Appends a row, given as a dictionary of the values by column """
+        if not self.valid:
+            return
+        try:
+            values = [float(record[column]) for column in self.columns]
+        except (KeyError, TypeError, ValueError):
+            log.info("The shared buffer can not store %r, so the data file is used", record)
+            self._header[self.VALID] = 0
+            return
+        count = self.count
+        self._values[:, count % self.capacity] = values
+        self._header[self.COUNT] = count + 1  # Publish the row once it is written
+
+    def read(self, start=0):
+        """ Returns a dictionary of arrays of the rows from start up to the
+        current count, and that count. The arrays are views of the shared
+        memory, unless the rows wrap around the end of the buffer. If some
+        of the rows were already overwritten, None is returned instead of
+        the arrays.
+
+        :param start: The index of the first row, counted from the first row
+                      that was ever appended
+        """
+        count = self.count
+        if count - start > self.capacity or start > count:
+            return None, count
+        first, last = start % self.capacity, count % self.capacity
+        if start == count:
+            values = self._values[:, :0]
+        elif first < last or last == 0:
+            values = self._values[:, first:last or self.capacity]
+        else:
+            values = np.concatenate([self._values[:, first:], self._values[:, :last]], axis=1)
+        if self.count - start > self.capacity:
+            return None, count  # Overwritten while reading
+        return dict(zip(self.columns, values)), count
+
+    def close(self):
+        """ Releases the memory of the buffer """
+        self._values = self._header = None
+
+
+class SharedBuffer(RowBuffer):
+    """ A :class:`.RowBuffer` in shared memory, for readers in other
+    processes than the :class:`.Worker` that appends to it. The data file
+    remains the complete copy of the data.
+
+    The buffer is attached to a :class:`.Results` object with
+    :meth:`.Results.attach_buffer`, after which :attr:`.Results.data` reads
+    new rows from the buffer. A Results object that is pickled to another
+    process, for example by the :class:`.Plotter`, attaches to the same
+    shared memory.
+
+    .. code-block:: python
+
+        results = Results(procedure, filename)
+        results.attach_buffer(SharedBuffer(procedure.DATA_COLUMNS, capacity=100000))
+        plotter = Plotter(results)
+        plotter.start()
+
+    The rows are cast to the types declared in the DATA_TYPES of the
+    procedure, and columns without a declared type are read as floats. If a
+    value can not be converted to a float, the buffer is marked as invalid
+    and readers use the data file instead. Shared memory requires Python 3.8,
+    and an OSError is raised on older versions, so that the data file is
+    read instead.
+
+    :param columns: The column names, when creating a buffer
+    :param capacity: The number of rows that the buffer holds
+    :param name: The name of an existing buffer to attach to, instead of
+                 creating one
+    """
+
+    def __init__(self, columns=None, capacity=100000, name=None):
+        if shared_memory is None:
+            raise OSError("Shared memory requires Python 3.8 or later")
+        self.owner = name is None
+        if self.owner:
+            names = json.dumps(list(columns)).encode()
+            names_size = -(-len(names) // 8) * 8
+            size = self.HEADER_SIZE + names_size + 8 * capacity * max(len(columns), 1)
+            self.memory = shared_memory.SharedMemory(create=True, size=size)
+            self._header = np.ndarray(self.HEADER_SIZE // 8, np.int64, self.memory.buf)
+            self._header[:] = 0
+            self._header[self.CAPACITY] = capacity
+            self._header[self.COLUMNS] = len(columns)
+            self._header[self.VALID] = 1
+            self._header[self.NAMES] = len(names)
+            self.memory.buf[self.HEADER_SIZE:self.HEADER_SIZE + len(names)] = names
+        else:
+            self.memory = shared_memory.SharedMemory(name=name)
+            self._header = np.ndarray(self.HEADER_SIZE // 8, np.int64, self.memory.buf)
+            length = int(self._header[self.NAMES])
+            names = bytes(self.memory.buf[self.HEADER_SIZE:self.HEADER_SIZE + length])
+            columns = json.loads(names.decode())
+            names_size = -(-length // 8) * 8
+        self.columns = list(columns)
+        self.capacity = int(self._header[self.CAPACITY])
+        self._values = np.ndarray((len(self.columns), self.capacity), np.float64,
+                                  self.memory.buf, offset=self.HEADER_SIZE + names_size)
+
+    @property
+    def name(self):
+        """ The name of the shared memory, with which other processes attach """
+        return self.memory.name
+
+    def close(self):
+        """ Detaches from the shared memory, which is removed if this
+        buffer created it
+        """
+        self._values = self._header = None
+        try:
+            self.memory.close()
+        except BufferError:
+            log.warning("The shared buffer %s is still in use", self.name)
+            return
+        if self.owner:
+            self.memory.unlink()
+
@@ -0,0 +1,262 @@
+#
+# This file is part of the PyMeasure package.
+#
+# Copyright (c) 2013-2017 PyMeasure Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+
+import logging
+import math
+
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+
+class Plan(object):
+    """ Base class of the sweep plans, which lazily generate the points of a
+    measurement. A plan iterates over tuples of values in the order of its
+    :attr:`names`, supports :func:`len` and :func:`reversed`, and
+    knows the settle time of each of its axes.
+
+    Inheriting classes should define :meth:`__iter__`, :meth:`__reversed__`
+    and :meth:`__len__`, and set the :attr:`names` and :attr:`settle`
+    attributes. Multiplying two plans nests them in a :class:`.Product`.
+    """
+
+    names = ()
+    settle = {}
+
+    def __iter__(self):
+        raise NotImplementedError("Plans must implement __iter__")
+
+    def __reversed__(self):
+        raise NotImplementedError("Plans must implement __reversed__")
+
+    def __len__(self):
+        raise NotImplementedError("Plans must implement __len__")
+
+    def points(self):
+        """ Generates the points of the plan as dictionaries of the values
+        by axis name
+        """
+        for values in self:
+            yield dict(zip(self.names, values))
+
+    def steps(self):
+        """ Generates tuples of each point and the time in seconds to settle
+        before measuring it, which is the longest settle time of the axes
+        whose values changed since the previous point
+        """
+        settle = [self.settle.get(name, 0.) for name in self.names]
+        previous = None
+        for values in self:
+            if previous is None:
+                wait = max(settle, default=0.)
+            else:
+                wait = max((s for s, v, p in zip(settle, values, previous) if v != p),
+                           default=0.)
+            previous = values
+            yield dict(zip(self.names, values)), wait
+
+    def estimate(self, point_time=0.):
+        """ Returns the estimated duration of the plan in seconds, including
+        the settle times, by iterating over the points without measuring
+
+        :param point_time: The time in seconds to measure each point
+        """
+        return sum(wait for point, wait in self.steps()) + len(self) * point_time
+
+    def __mul__(self, other):
+        return Product(self, other)
+
+
+class _Linear(object):
+    """ Lazy sequence of evenly spaced values, which are the same as those
+    of :func:`~pymeasure.experiment.experiment.get_array`. As in numpy.arange,
+    the values run up to stop + step, so the last value exceeds the stop
+    value when the range is not a multiple of the step.
+    """
+
+    def __init__(self, start, stop, step):
+        if step == 0:
+            raise ValueError("The step of a sweep can not be zero")
+        step = math.copysign(abs(step), stop - start)
+        # The length and spacing are calculated as numpy.arange does
+        self.start, self.step = start, (start + step) - start
+        self.count = max(int(math.ceil(((stop + step) - start) / step)), 1)
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        if not 0 <= index < self.count:
+            raise IndexError("Sweep index out of range")
+        return self.start + index * self.step
+
+    def __iter__(self):
+        return (self.start + i * self.step for i in range(self.count))
+
+    def __reversed__(self):
+        return (self.start + i * self.step for i in reversed(range(self.count)))
+
+
+class Sweep(Plan):
+    """ Sweeps a single axis through a sequence of values
+
+    .. code-block:: python
+
+        field = Sweep.linear('field', -1, 1, step=0.01, settle=2.)
+        gate = Sweep('gate', [0, 0.5, 1, 2, 5])
+
+    :param name: The name of the axis
+    :param values: A sequence of values
+    :param settle: The time in seconds to wait after the value changes
+    """
+
+    def __init__(self, name, values, settle=0.):
+        self.name = name
+        self.values = values
+        self.names = (name,)
+        self.settle = {name: settle}
+
+    @classmethod
+    def linear(cls, name, start, stop, step, settle=0.):
+        """ Returns a Sweep from start to stop in steps of step, which is
+        generated lazily (see :func:`~pymeasure.experiment.experiment.get_array`)
+        """
+        return cls(name, _Linear(start, stop, step), settle)
+
+    @classmethod
+    def steps_between(cls, name, start, stop, numsteps, settle=0.):
+        """ Returns a Sweep from start to stop in numsteps steps (see
+        :func:`~pymeasure.experiment.experiment.get_array_steps`)
+        """
+        return cls.linear(name, start, stop, abs(stop - start) / numsteps, settle)
+
+    def __iter__(self):
+        return ((value,) for value in self.values)
+
+    def __reversed__(self):
+        return ((value,) for value in reversed(self.values))
+
+    def __len__(self):
+        return len(self.values)
+
+
+class Product(Plan):
+    """ Nests an inner plan within each point of an outer plan. With snake
+    ordering, the inner plan is traversed in alternating directions
+    (boustrophedon), which avoids sweeping the inner axes back to the
+    start for each outer point.
+
+    :param outer: The outer (slow) plan
+    :param inner: The inner (fast) plan
+    :param snake: True for snake ordering
+    """
+
+    def __init__(self, outer, inner, snake=False):
+        self.outer, self.inner = outer, inner
+        self.snake = snake
+        self.names = tuple(outer.names) + tuple(inner.names)
+        self.settle = dict(outer.settle)
+        self.settle.update(inner.settle)
+
+    def _inner(self, index, backwards):
+        if self.snake and index % 2 == 1:
+            backwards = not backwards
+        return reversed(self.inner) if backwards else iter(self.inner)
+
+    def __iter__(self):
+        for index, outer in enumerate(self.outer):
+            for inner in self._inner(index, False):
+                yield outer + inner
+
+    def __reversed__(self):
+        last = len(self.outer) - 1
+        for index, outer in enumerate(reversed(self.outer)):
+            for inner in self._inner(last - index, True):
+                yield outer + inner
+
+    def __len__(self):
+        return len(self.outer) * len(self.inner)
+
+
+class Zip(Plan):
+    """ Sweeps several plans of the same length together, point by point
+
+    :param plans: The plans to combine
+    """
+
+    def __init__(self, *plans):
+        if len(set(len(plan) for plan in plans)) > 1:
+            raise ValueError("Zipped plans must have the same length")
+        self.plans = plans
+        self.names = sum((tuple(plan.names) for plan in plans), ())
+        self.settle = {}
+        for plan in plans:
+            self.settle.update(plan.settle)
+
+    def __iter__(self):
+        for values in zip(*self.plans):
+            yield sum(values, ())
+
+    def __reversed__(self):
+        for values in zip(*(reversed(plan) for plan in self.plans)):
+            yield sum(values, ())
+
+    def __len__(self):
+        return len(self.plans[0]) if self.plans else 0
+
+
+class Hysteresis(Plan):
+    """ Sweeps a plan forwards and back again for a number of cycles, without
+    repeating the points at which the direction is reversed
+
+    :param plan: The plan of a single leg
+    :param cycles: The number of forward and backward cycles
+    """
+
+    def __init__(self, plan, cycles=1):
+        self.plan = plan
+        self.cycles = cycles
+        self.names = plan.names
+        self.settle = plan.settle
+
+    def __iter__(self):
+        for cycle in range(self.cycles):
+            forward = iter(self.plan)
+            if cycle > 0:
+                next(forward, None)  # Skip the turning point
+            for values in forward:
+                yield values
+            backward = reversed(self.plan)
+            next(backward, None)
+            for values in backward:
+                yield values
+
+    def __reversed__(self):
+        # Each cycle returns to the start, so the plan is symmetric
+        return iter(self)
+
+    def __len__(self):
+        legs = len(self.plan)
+        if legs == 0:
+            return 0
+        return legs + (2 * self.cycles - 1) * (legs - 1)
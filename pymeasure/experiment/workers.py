@@ -39,28 +39,25 @@ from ..thread import StoppableThread
 log = logging.getLogger(__name__)
 log.addHandler(logging.NullHandler())
 
-try:
-    import zmq
-    import cloudpickle
-except ImportError:
-    zmq = None
-    cloudpickle = None
-    log.warning("ZMQ and cloudpickle are required for TCP communication")
-
 
 class Worker(StoppableThread):
     """ Worker runs the procedure and emits information about
     the procedure and its status over a ZMQ TCP port. In a child
-    thread, a Recorder is run to write the results to
+    thread, a Recorder is run to write the results to. If the results
+    have a buffer attached, each row is also appended to it. If a
+    :class:`.Catalog` is given, the Recorder keeps the entry of the
+    results up to date in it.
     """
 
-    def __init__(self, results, log_queue=None, log_level=logging.INFO, port=None):
+    def __init__(self, results, log_queue=None, log_level=logging.INFO, port=None,
+                 catalog=None):
         """ Constructs a Worker to perform the Procedure
         defined in the file at the filepath
         """
         super().__init__()
 
         self.port = port
+        self.catalog = catalog
         if not isinstance(results, Results):
             raise ValueError("Invalid Results object during Worker construction")
         self.results = results
@@ -92,13 +89,17 @@ class Worker(StoppableThread):
         log.debug("Emitting message: %s %s", topic, record)
 
         try:
-            self.publisher.send_serialized((topic, record), serialize=cloudpickle.dumps)
+            self.publisher.send_serialized((topic, record), serialize=self._dumps)
         except (NameError, AttributeError):
             pass  # No dumps defined
         if topic == 'results':
             self.recorder.handle(record)
+            if self.results.buffer is not None:
+                self.results.buffer.append(record)
         elif topic == 'status' or topic == 'progress':
             self.monitor_queue.put((topic, record))
+        if topic in ('status', 'progress', 'point'):
+            self.recorder.update(topic, record)
 
     def handle_abort(self):
         log.exception("User stopped Worker execution prematurely")
@@ -120,8 +121,8 @@ class Worker(StoppableThread):
         if self.should_stop() and self.procedure.status == Procedure.RUNNING:
             self.update_status(Procedure.ABORTED)
         elif self.procedure.status == Procedure.RUNNING:
-            self.update_status(Procedure.FINISHED)
             self.emit('progress', 100.)
+            self.update_status(Procedure.FINISHED)
 
         self.recorder.enqueue_sentinel()
         self.monitor_queue.put(None)
@@ -137,7 +138,7 @@ class Worker(StoppableThread):
 
         self.procedure = self.results.procedure
 
-        self.recorder = Recorder(self.results, self.recorder_queue)
+        self.recorder = Recorder(self.results, self.recorder_queue, catalog=self.catalog)
         self.recorder.start()
 
         #locals()[self.procedures_file] = __import__(self.procedures_file)
@@ -146,14 +147,20 @@ class Worker(StoppableThread):
         self.procedure.should_stop = self.should_stop
         self.procedure.emit = self.emit
 
-        if self.port is not None and zmq is not None:
+        if self.port is not None:
             try:
+                # Imported when needed, since they are slow to import
+                import zmq
+                import cloudpickle
+                self._dumps = cloudpickle.dumps
                 self.context = zmq.Context()
                 log.debug("Worker ZMQ Context: %r" % self.context)
                 self.publisher = self.context.socket(zmq.PUB)
                 self.publisher.bind('tcp://*:%d' % self.port)
                 log.info("Worker connected to tcp://*:%d" % self.port)
                 time.sleep(0.01)
+            except ImportError:
+                log.warning("ZMQ and cloudpickle are required for TCP communication")
             except Exception:
                 log.exception("couldn't connect to ZMQ context")
 
@@ -22,22 +22,35 @@
 # THE SOFTWARE.
 #
 
+import sys
+from importlib import import_module
+
 from ..errors import RangeError, RangeException
 from .instrument import Instrument
 from .mock import Mock
 from .resources import list_resources
 from .validators import discreteTruncate
 
-from . import agilent
-from . import anritsu
-from . import danfysik
-from . import fwbell
-from . import hp
-from . import keithley
-from . import lakeshore
-from . import parker
-from . import signalrecovery
-from . import srs
-from . import tektronix
-from . import thorlabs
-from . import yokogawa
+# The instruments of each manufacturer are imported when they are first
+# used, for example as pymeasure.instruments.keithley.Keithley2400, so that
+# importing pymeasure.instruments does not import all of their dependencies
+MANUFACTURERS = (
+    'agilent', 'anritsu', 'danfysik', 'fwbell', 'hp', 'keithley', 'lakeshore',
+    'parker', 'signalrecovery', 'srs', 'tektronix', 'thorlabs', 'yokogawa',
+)
+
+
+if sys.version_info < (3, 7):
+    # Module attributes can only be looked up lazily from Python 3.7
+    for _name in MANUFACTURERS:
+        import_module('.' + _name, __name__)
+
+
+def __getattr__(name):
+    if name in MANUFACTURERS:
+        return import_module('.' + name, __name__)
+    raise AttributeError("module '%s' has no attribute '%s'" % (__name__, name))
+
+
+def __dir__():
+    return sorted(list(globals()) + list(MANUFACTURERS))
@@ -0,0 +1,54 @@
+#
+# This file is part of the PyMeasure package.
+#
+# Copyright (c) 2013-2017 PyMeasure Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+
+import logging
+
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+
+async def get_property(instrument, getter):
+    """ Returns the value of a property of an instrument, which is read
+    through its asynchronous adapter
+
+    :param instrument: The :class:`.Instrument`
+    :param getter: The :class:`~pymeasure.instruments.instrument.Getter` of the property
+    """
+    values = await instrument.async_values(getter.command, **getter.kwargs)
+    if getter.check_errors:
+        await instrument.async_check_errors()
+    return getter.process(values)
+
+
+async def set_property(instrument, setter, value):
+    """ Sets the value of a property of an instrument through its
+    asynchronous adapter
+
+    :param instrument: The :class:`.Instrument`
+    :param setter: The :class:`~pymeasure.instruments.instrument.Setter` of the property
+    :param value: The value to set
+    """
+    await instrument.async_write(setter.command(value))
+    if setter.check_errors:
+        await instrument.async_check_errors()
@@ -24,15 +24,19 @@
 
 import logging
 import re
+from collections import namedtuple
 
 import numpy as np
 
 from pymeasure.adapters import FakeAdapter
-from pymeasure.adapters.visa import VISAAdapter
 
 log = logging.getLogger(__name__)
 log.addHandler(logging.NullHandler())
 
+# How the properties of an Instrument are read and set asynchronously
+Getter = namedtuple('Getter', ['command', 'kwargs', 'check_errors', 'process'])
+Setter = namedtuple('Setter', ['command', 'check_errors'])
+
 
 class Instrument(object):
     """ This provides the base class for all Instruments, which is 
@@ -49,6 +53,7 @@ class Instrument(object):
     def __init__(self, adapter, name, includeSCPI=True, **kwargs):
         try:
             if isinstance(adapter, (int, str)):
+                from pymeasure.adapters.visa import VISAAdapter
                 adapter = VISAAdapter(adapter, **kwargs)
         except ImportError:
             raise Exception("Invalid Adapter provided for Instrument since "
@@ -113,6 +118,93 @@ class Instrument(object):
     def binary_values(self, command, header_bytes=0, dtype=np.float32):
         return self.adapter.binary_values(command, header_bytes, dtype)
 
+    # Asynchronous wrapper functions for the Adapter object
+    @property
+    def async_adapter(self):
+        """ The :class:`AsyncAdapter<pymeasure.adapters.AsyncAdapter>` of the
+        asynchronous methods, which is the adapter itself if it is
+        asynchronous, or otherwise a
+        :class:`ThreadedAdapter<pymeasure.adapters.ThreadedAdapter>` that
+        calls the adapter on a thread of its own
+        """
+        from pymeasure.adapters.asynchronous import AsyncAdapter, ThreadedAdapter
+        if isinstance(self.adapter, AsyncAdapter):
+            return self.adapter
+        if getattr(self, '_async_adapter', None) is None:
+            self._async_adapter = ThreadedAdapter(self.adapter)
+        return self._async_adapter
+
+    # The asynchronous methods return coroutines of the asynchronous adapter,
+    # and the coroutines of properties are defined in .asynchronous, which
+    # is only imported when it is used, as it requires Python 3.7
+    def async_ask(self, command):
+        """ Writes the command to the instrument and returns the response,
+        while other coroutines run
+
+        :param command: command string to be sent to the instrument
+        """
+        return self.async_adapter.ask(command)
+
+    def async_write(self, command):
+        """ Writes the command to the instrument, while other coroutines run
+
+        :param command: command string to be sent to the instrument
+        """
+        return self.async_adapter.write(command)
+
+    def async_read(self):
+        """ Reads the response of the instrument, while other coroutines run """
+        return self.async_adapter.read()
+
+    def async_values(self, command, **kwargs):
+        """ Reads a set of values from the instrument, while other coroutines
+        run, passing on any key-word arguments
+        """
+        return self.async_adapter.values(command, **kwargs)
+
+    def async_binary_values(self, command, header_bytes=0, dtype=np.float32):
+        return self.async_adapter.binary_values(command, header_bytes, dtype)
+
+    def async_get(self, name):
+        """ Returns the value of a property that was defined with
+        :meth:`.control` or :meth:`.measurement`, while other coroutines run.
+        Queries to many instruments are made at once with asyncio.gather:
+
+        .. code-block:: python
+
+            async def read_all(meters):
+                return await asyncio.gather(*(meter.async_get('voltage') for meter in meters))
+
+            voltages = asyncio.run(read_all(meters))
+
+        :param name: The name of the property
+        """
+        from .asynchronous import get_property
+        fget = getattr(getattr(type(self), name), 'fget', None)
+        if not hasattr(fget, 'async_get'):
+            raise AttributeError("'%s' can not be read asynchronously" % name)
+        return get_property(self, fget.async_get)
+
+    def async_set(self, name, value):
+        """ Sets the value of a property that was defined with
+        :meth:`.control` or :meth:`.setting`, while other coroutines run
+
+        :param name: The name of the property
+        :param value: The value to set
+        """
+        from .asynchronous import set_property
+        fset = getattr(getattr(type(self), name), 'fset', None)
+        if not hasattr(fset, 'async_set'):
+            raise AttributeError("'%s' can not be set asynchronously" % name)
+        return set_property(self, fset.async_set, value)
+
+    def async_check_errors(self):
+        """ Runs :meth:`.check_errors` through the asynchronous adapter,
+        which calls it on the thread of a blocking adapter. Instruments with
+        an asynchronous adapter should reimplement it.
+        """
+        return self.async_adapter.run(self.check_errors)
+
     @staticmethod
     def control(get_command, set_command, docs,
                 validator=lambda v, vs: v, values=(), map_values=False,
@@ -144,10 +236,7 @@ class Instrument(object):
             # Prepare the inverse values for performance
             inverse = {v: k for k, v in values.items()}
 
-        def fget(self):
-            vals = self.values(get_command, **kwargs)
-            if check_get_errors:
-                self.check_errors()
+        def process(vals):
             if len(vals) == 1:
                 value = get_process(vals[0])
                 if not map_values:
@@ -165,7 +254,7 @@ class Instrument(object):
                 vals = get_process(vals)
                 return vals
 
-        def fset(self, value):
+        def command(value):
             value = set_process(validator(value, values))
             if not map_values:
                 pass
@@ -178,12 +267,23 @@ class Instrument(object):
                     'Values of type `{}` are not allowed '
                     'for Instrument.control'.format(type(values))
                 )
-            self.write(set_command % value)
+            return set_command % value
+
+        def fget(self):
+            vals = self.values(get_command, **kwargs)
+            if check_get_errors:
+                self.check_errors()
+            return process(vals)
+
+        def fset(self, value):
+            self.write(command(value))
             if check_set_errors:
                 self.check_errors()
 
         # Add the specified document string to the getter
         fget.__doc__ = docs
+        fget.async_get = Getter(get_command, kwargs, check_get_errors, process)
+        fset.async_set = Setter(command, check_set_errors)
 
         return property(fget, fset)
 
@@ -212,10 +312,7 @@ class Instrument(object):
             # Prepare the inverse values for performance
             inverse = {v: k for k, v in values.items()}
 
-        def fget(self):
-            vals = self.values(command_process(get_command), **kwargs)
-            if check_get_errors:
-                self.check_errors()
+        def process(vals):
             if len(vals) == 1:
                 value = get_process(vals[0])
                 if not map_values:
@@ -232,8 +329,15 @@ class Instrument(object):
             else:
                 return get_process(vals)
 
+        def fget(self):
+            vals = self.values(command_process(get_command), **kwargs)
+            if check_get_errors:
+                self.check_errors()
+            return process(vals)
+
         # Add the specified document string to the getter
         fget.__doc__ = docs
+        fget.async_get = Getter(command_process(get_command), kwargs, check_get_errors, process)
 
         return property(fget)
 
@@ -267,7 +371,7 @@ class Instrument(object):
         def fget(self):
             raise LookupError("Instrument.setting properties can not be read.")
 
-        def fset(self, value):
+        def command(value):
             value = set_process(validator(value, values))
             if not map_values:
                 pass
@@ -280,12 +384,16 @@ class Instrument(object):
                     'Values of type `{}` are not allowed '
                     'for Instrument.control'.format(type(values))
                 )
-            self.write(set_command % value)
+            return set_command % value
+
+        def fset(self, value):
+            self.write(command(value))
             if check_set_errors:
                 self.check_errors()
 
         # Add the specified document string to the getter
         fget.__doc__ = docs
+        fset.async_set = Setter(command, check_set_errors)
 
         return property(fget, fset)
 
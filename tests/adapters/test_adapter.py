@@ -23,8 +23,12 @@
 #
 
 import logging
+import threading
+import time
 
-from pymeasure.adapters import FakeAdapter
+import serial
+
+from pymeasure.adapters import Adapter, AdapterLock, FakeAdapter, PrologixAdapter
 
 log = logging.getLogger(__name__)
 log.addHandler(logging.NullHandler())
@@ -37,3 +41,52 @@ def test_adapter_values():
     assert a.values("X,Y,Z") == ['X', 'Y', 'Z']
     assert a.values("X,Y,Z", cast=str) == ['X', 'Y', 'Z']
     assert a.values("X.Y.Z", separator='.') == ['X', 'Y', 'Z']
+
+
+class SlowAdapter(Adapter):
+    """ Responds to the last command after a delay, like an instrument """
+
+    def write(self, command):
+        self.command = command
+
+    def read(self):
+        time.sleep(0.001)
+        return self.command
+
+
+def test_adapter_ask_threads():
+    a = SlowAdapter()
+    a.lock = AdapterLock(timed=True)
+    errors = []
+
+    def poll(name):
+        for i in range(20):
+            command = "%s%d" % (name, i)
+            if a.ask(command) != command:
+                errors.append(command)
+
+    threads = [threading.Thread(target=poll, args=(str(n),)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert a.lock.acquisitions == 80
+    assert 0 < a.lock.contentions <= 80
+    assert a.lock.max_wait >= a.lock.mean_wait > 0
+    a.lock.reset()
+    assert a.lock.acquisitions == 0 and a.lock.mean_wait == 0
+
+
+def test_adapter_lock_reentrant():
+    a = FakeAdapter()
+    assert a.lock is a.lock
+    with a.lock:
+        assert a.ask("5") == "5"
+    assert not a.lock.timed and a.lock.acquisitions == 0
+
+
+def test_prologix_gpib_shares_lock():
+    adapter = PrologixAdapter(serial.Serial())
+    assert adapter.gpib(5).lock is adapter.lock
+    assert adapter.gpib(5).lock is adapter.gpib(7).lock
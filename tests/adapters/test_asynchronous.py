@@ -0,0 +1,103 @@
+#
+# This file is part of the PyMeasure package.
+#
+# Copyright (c) 2013-2017 PyMeasure Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+
+import asyncio
+import time
+
+import numpy as np
+import pytest
+
+from pymeasure.adapters import FakeAdapter
+from pymeasure.adapters.asynchronous import AsyncTCPAdapter, ThreadedAdapter
+
+
+class SlowAdapter(FakeAdapter):
+    """ Bounces back commands after a delay """
+
+    def read(self):
+        time.sleep(0.2)
+        return super().read()
+
+
+def test_threaded_adapters_overlap():
+    adapters = [ThreadedAdapter(SlowAdapter()) for i in range(4)]
+
+    async def query():
+        return await asyncio.gather(*(adapter.values("%d,2" % i)
+                                      for i, adapter in enumerate(adapters)))
+
+    start = time.perf_counter()
+    assert asyncio.run(query()) == [[0, 2], [1, 2], [2, 2], [3, 2]]
+    assert time.perf_counter() - start < 0.6  # Instead of 0.8 one by one
+
+
+async def serve(reader, writer):
+    """ Answers SCPI queries like an instrument """
+    while True:
+        line = await reader.readline()
+        if not line:
+            break
+        command = line.decode().strip()
+        if command == '*IDN?':
+            writer.write(b"Fake,Instrument,0,1.0\n")
+        elif command == 'SLOW?':
+            await asyncio.sleep(0.3)
+            writer.write(b"slow\n")
+        elif command == 'DATA?':
+            data = np.arange(4, dtype=np.float32).tobytes()
+            writer.write(b"#216" + data + b"\n")
+        elif command.endswith('?'):
+            await asyncio.sleep(0.05)
+            writer.write(b"1.5,2.5\n")
+        await writer.drain()
+    writer.close()
+
+
+def test_tcp_adapter():
+    async def run():
+        server = await asyncio.start_server(serve, '127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        adapter = AsyncTCPAdapter('127.0.0.1', port, timeout=1)
+        try:
+            assert await adapter.ask("*IDN?") == "Fake,Instrument,0,1.0"
+            data = await adapter.binary_values("DATA?")
+            assert list(data) == [0, 1, 2, 3]
+            # Queries on one connection are not interleaved
+            results = await asyncio.gather(*(adapter.values("VOLT?") for i in range(3)))
+            assert results == [[1.5, 2.5]] * 3
+            await adapter.write("VOLT 1")
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(adapter.read(), 0.1)
+            # The late response of a query that timed out is not read
+            adapter.timeout = 0.1
+            with pytest.raises(asyncio.TimeoutError):
+                await adapter.ask("SLOW?")
+            adapter.timeout = 1
+            assert await adapter.ask("FAST?") == "1.5,2.5"
+        finally:
+            await adapter.close()
+            server.close()
+            await server.wait_closed()
+
+    asyncio.run(run())
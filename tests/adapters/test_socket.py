@@ -0,0 +1,136 @@
+#
+# This file is part of the PyMeasure package.
+#
+# Copyright (c) 2013-2017 PyMeasure Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+
+import socket
+import socketserver
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from pymeasure.adapters import SocketAdapter
+from pymeasure.adapters.socket import ResponseBuffer
+
+
+class FakeSCPIHandler(socketserver.StreamRequestHandler):
+    """ Answers SCPI queries like a LAN instrument """
+
+    def handle(self):
+        for line in self.rfile:
+            command = line.decode().strip()
+            if command == '*IDN?':
+                self.wfile.write(b"Fake,Instrument,0,1.0\n")
+            elif command == 'DATA?':
+                data = np.arange(300, dtype=np.float64).tobytes()
+                self.wfile.write(b"#42400" + data + b"\n")
+            elif command == 'VOLT?':
+                self.wfile.write(b"1.5,2.5\n")
+            elif command == 'BYE':
+                return  # Drops the connection
+            elif command == 'SLOW?':
+                time.sleep(0.3)
+                self.wfile.write(b"1\n")
+
+
+COMMANDS = {'*IDN?': "Fake,Instrument,0,1.0", 'VOLT?': "1.5,2.5"}
+
+
+@pytest.fixture
+def server():
+    server = socketserver.ThreadingTCPServer(('127.0.0.1', 0), FakeSCPIHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_queries(server):
+    adapter = SocketAdapter('127.0.0.1', server.server_address[1], timeout=1)
+    assert adapter.ask("*IDN?") == "Fake,Instrument,0,1.0"
+    assert adapter.values("VOLT?") == [1.5, 2.5]
+    assert list(adapter.binary_values("DATA?", dtype=np.float64)) == list(range(300))
+    assert adapter.connection.getsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY)
+
+    start = time.perf_counter()
+    for i in range(200):
+        adapter.ask("*IDN?")
+    assert (time.perf_counter() - start) / 200 < 0.005  # One round trip each
+    adapter.close()
+
+
+def test_threads(server):
+    adapter = SocketAdapter('127.0.0.1', server.server_address[1], timeout=1)
+    errors = []
+
+    def poll(command):
+        for i in range(50):
+            if adapter.ask(command) != COMMANDS[command]:
+                errors.append(command)
+
+    threads = [threading.Thread(target=poll, args=(command,)) for command in COMMANDS]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    adapter.close()
+
+
+def test_reconnect(server):
+    adapter = SocketAdapter('127.0.0.1', server.server_address[1], timeout=1)
+    assert adapter.ask("*IDN?").startswith("Fake")
+    connection = adapter.connection
+    adapter.write("BYE")
+    time.sleep(0.05)
+    assert adapter.ask("*IDN?").startswith("Fake")  # On a new connection
+    assert adapter.connection is not connection
+    adapter.close()
+
+
+def test_timeout(server):
+    adapter = SocketAdapter('127.0.0.1', server.server_address[1], timeout=0.1)
+    with pytest.raises(socket.timeout):
+        adapter.ask("SLOW?")
+    assert adapter.connection is None  # The late response is not read
+    adapter.timeout = 1
+    assert adapter.ask("*IDN?").startswith("Fake")
+    adapter.close()
+
+
+def test_response_buffer():
+    buffer = ResponseBuffer(b'\r\n')
+    buffer.feed(b'1.5\r')
+    assert buffer.response() is None
+    buffer.feed(b'\n#14')
+    assert buffer.response() == '1.5'
+    assert buffer.block() is None
+    buffer.feed(b'abcd\r\nnext')
+    assert buffer.block() == b'abcd'
+    assert buffer.read_bytes(4) == b'next'
+    buffer.feed(b'no block\r\n')
+    with pytest.raises(ValueError):
+        buffer.block()
@@ -0,0 +1,85 @@
+#
+# This file is part of the PyMeasure package.
+#
+# Copyright (c) 2013-2017 PyMeasure Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+
+
+import os
+import tempfile
+
+import numpy as np
+
+from pymeasure.display.curves import ResultsCurve, ResultsImage
+from pymeasure.experiment import Procedure, IntegerParameter, BinnedGrid
+from pymeasure.experiment.results import Results
+
+
+class CurveProcedure(Procedure):
+    iterations = IntegerParameter('Loop Iterations', default=10)
+    DATA_COLUMNS = ['x', 'y', 'z']
+
+
+class TestResultsCurve:
+
+    def test_stale_only_when_file_changes(self, qtbot):
+        filename = tempfile.mktemp()
+        results = Results(CurveProcedure(), filename)
+        curve = ResultsCurve(results, 'x', 'y')
+        assert curve.is_stale()
+
+        with open(filename, 'a') as f:
+            f.write("1,2,0\n")
+        curve.update()
+        assert not curve.is_stale()
+        assert len(curve.xData) == 1
+
+        with open(filename, 'a') as f:
+            f.write("2,4,0\n")
+        assert curve.is_stale()
+        curve.update()
+        assert not curve.is_stale()
+        assert len(curve.xData) == 2
+        os.remove(filename)
+
+
+class TestResultsImage:
+
+    def test_only_new_rows_are_binned(self, qtbot):
+        filename = tempfile.mktemp()
+        results = Results(CurveProcedure(), filename)
+        grid = BinnedGrid((0, 2), (0, 2), shape=(2, 2))
+        image = ResultsImage(results, 'x', 'y', 'z', grid)
+
+        with open(filename, 'a') as f:
+            f.write("0.5,0.5,1\n1.5,0.5,2\n")
+        image.update_results()
+        assert image.image[0, 0] == 1
+        assert image.image[1, 0] == 2
+        assert np.isnan(image.image[0, 1])
+
+        with open(filename, 'a') as f:
+            f.write("0.6,0.4,3\n")
+        assert image.is_stale()
+        image.update_results()
+        assert image.image[0, 0] == 2  # Mean of 1 and 3
+        assert grid.levels == (1, 2)
+        os.remove(filename)
@@ -0,0 +1,81 @@
+#
+# This file is part of the PyMeasure package.
+#
+# Copyright (c) 2013-2017 PyMeasure Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+
+import logging
+
+from pymeasure.display.log import LogHandler
+
+
+class TestLogHandler:
+
+    def _logger(self, handler):
+        logger = logging.getLogger('pymeasure.test_log_handler')
+        logger.propagate = False
+        logger.setLevel(logging.DEBUG)
+        logger.addHandler(handler)
+        return logger
+
+    def test_records_are_emitted_in_batches(self, qtbot):
+        handler = LogHandler(interval=10000)
+        handler.setFormatter(logging.Formatter(fmt='%(message)s'))
+        logger = self._logger(handler)
+        try:
+            for i in range(100):
+                logger.info("record %d", i)
+            with qtbot.waitSignal(handler.record) as blocker:
+                handler.flush_records()
+        finally:
+            logger.removeHandler(handler)
+        lines = blocker.args[0].split("\n")
+        assert lines == ["record %d" % i for i in range(100)]
+
+    def test_oldest_records_are_dropped(self, qtbot):
+        handler = LogHandler(interval=10000, max_records=10)
+        handler.setFormatter(logging.Formatter(fmt='%(message)s'))
+        logger = self._logger(handler)
+        try:
+            for i in range(25):
+                logger.info("record %d", i)
+            with qtbot.waitSignal(handler.record) as blocker:
+                handler.flush_records()
+        finally:
+            logger.removeHandler(handler)
+        lines = blocker.args[0].split("\n")
+        assert len(lines) == 11
+        assert "15 log records dropped" in lines[0]
+        assert lines[-1] == "record 24"
+
+    def test_message_is_merged_when_logged(self, qtbot):
+        handler = LogHandler(interval=10000)
+        handler.setFormatter(logging.Formatter(fmt='%(message)s'))
+        logger = self._logger(handler)
+        values = [1]
+        try:
+            logger.info("values %s", values)
+            values.append(2)
+            with qtbot.waitSignal(handler.record) as blocker:
+                handler.flush_records()
+        finally:
+            logger.removeHandler(handler)
+        assert blocker.args[0] == "values [1]"
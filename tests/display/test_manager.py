@@ -0,0 +1,177 @@
+#
+# This file is part of the PyMeasure package.
+#
+# Copyright (c) 2013-2017 PyMeasure Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+
+
+import pytest
+from unittest import mock
+
+import pyqtgraph as pg
+
+from pymeasure.display.Qt import QtCore
+from pymeasure.display.browser import Browser, BrowserItem
+from pymeasure.display.manager import Experiment, ExperimentQueue, Manager
+from pymeasure.experiment import Procedure, Parameter, FloatParameter
+from pymeasure.experiment.ordering import ParameterCost
+
+
+class BrowserProcedure(Procedure):
+    seed = Parameter('Random Seed', default='12345')
+    field = FloatParameter('Field', default=0.)
+    DATA_COLUMNS = ['x', 'y']
+
+
+def make_experiment(filename, status=Procedure.QUEUED, **parameters):
+    results = mock.MagicMock()
+    results.data_filename = filename
+    results.procedure = BrowserProcedure(**parameters)
+    results.procedure.status = status
+    curve = mock.MagicMock(opts={'pen': pg.mkPen(color='r')})
+    browser_item = BrowserItem(results, curve)
+    return Experiment(results, curve, browser_item)
+
+
+class TestExperimentQueue:
+
+    def test_lookups(self):
+        queue = ExperimentQueue()
+        experiments = [make_experiment('/data/DATA_%d.csv' % i) for i in range(3)]
+        for experiment in experiments:
+            queue.append(experiment)
+
+        assert len(queue) == 3
+        assert experiments[1] in queue
+        assert 'DATA_2.csv' in queue
+        assert 'DATA_3.csv' not in queue
+        assert queue.with_browser_item(experiments[2].browser_item) is experiments[2]
+
+    def test_next_follows_status(self):
+        queue = ExperimentQueue()
+        first = make_experiment('DATA_1.csv')
+        second = make_experiment('DATA_2.csv')
+        queue.append(first)
+        queue.append(second)
+        assert queue.next() is first
+
+        first.procedure.status = Procedure.RUNNING
+        queue.update_status(first)
+        assert queue.next() is second
+        assert queue.with_status(Procedure.RUNNING) == [first]
+
+        # Status changes without an update are picked up lazily
+        second.procedure.status = Procedure.FINISHED
+        assert not queue.has_next()
+
+    def test_remove(self):
+        queue = ExperimentQueue()
+        experiment = make_experiment('DATA_1.csv')
+        queue.append(experiment)
+        last = make_experiment('DATA_2.csv', Procedure.FINISHED)
+        queue.append(last)
+        queue.remove(experiment)
+        assert list(queue) == [last] and queue[0] is last
+        assert experiment not in queue
+        assert 'DATA_1.csv' not in queue
+        assert not queue.has_next()
+        with pytest.raises(Exception):
+            queue.remove(experiment)
+
+    def test_reorder(self):
+        queue = ExperimentQueue()
+        experiments = [make_experiment('DATA_%d.csv' % i) for i in range(4)]
+        experiments[0].procedure.status = Procedure.FINISHED
+        for experiment in experiments:
+            queue.append(experiment)
+        queue.reorder([experiments[3], experiments[1], experiments[2]])
+        assert list(queue) == [experiments[0], experiments[3], experiments[1], experiments[2]]
+        assert queue.with_status(Procedure.QUEUED) == [experiments[3], experiments[1], experiments[2]]
+        assert queue.next() is experiments[3]
+
+
+class TestBrowser:
+
+    def test_add_and_remove(self, qtbot):
+        browser = Browser(BrowserProcedure, ['seed'], ['x', 'y'], sort_by_filename=True)
+        qtbot.addWidget(browser)
+        model = browser.model()
+        experiments = [make_experiment('DATA_%d.csv' % i) for i in (2, 3, 1)]
+        for experiment in experiments:
+            browser.add(experiment)
+
+        assert model.rowCount() == 3
+        assert [model.index(row, 1).data() for row in range(3)] == [
+            'DATA_1.csv', 'DATA_2.csv', 'DATA_3.csv']
+        assert model.index(0, 4).data() == '12345'
+
+        browser.remove(experiments[0])
+        assert [item.text(1) for item in browser.items()] == ['DATA_1.csv', 'DATA_3.csv']
+
+    def test_item_updates(self, qtbot):
+        browser = Browser(BrowserProcedure, [], ['x', 'y'])
+        qtbot.addWidget(browser)
+        experiment = make_experiment('DATA_1.csv')
+        item = browser.add(experiment)
+        model = browser.model()
+
+        item.setStatus(Procedure.RUNNING)
+        item.setProgress(50.)
+        assert model.index(0, 3).data() == 'Running'
+        assert model.index(0, 2).data(QtCore.Qt.UserRole) == 50.
+
+        with qtbot.waitSignal(browser.itemChanged) as blocker:
+            model.setData(model.index(0, 0), QtCore.Qt.Unchecked, QtCore.Qt.CheckStateRole)
+        assert blocker.args == [item, 0]
+        assert item.checkState(0) == QtCore.Qt.Unchecked
+
+    def test_reorder(self, qtbot):
+        browser = Browser(BrowserProcedure, [], ['x', 'y'])
+        qtbot.addWidget(browser)
+        model = browser.model()
+        experiments = [make_experiment('DATA_%d.csv' % i) for i in range(4)]
+        for experiment in experiments:
+            browser.add(experiment)
+
+        with qtbot.waitSignal(model.layoutChanged):
+            browser.reorder([experiments[3], experiments[1], experiments[2]])
+        assert [model.index(row, 1).data() for row in range(4)] == [
+            'DATA_0.csv', 'DATA_3.csv', 'DATA_1.csv', 'DATA_2.csv']
+        experiments[1].browser_item.setProgress(50.)
+        assert model.index(2, 2).data(QtCore.Qt.UserRole) == 50.
+
+
+class TestManager:
+
+    def test_optimize_queue(self, qtbot):
+        manager = Manager(mock.MagicMock(), mock.MagicMock())
+        experiments = [make_experiment('DATA_%d.csv' % i, field=field)
+                       for i, field in enumerate((0, 2, 1, 3))]
+        for experiment in experiments:
+            manager.experiments.append(experiment)
+        costs = [ParameterCost('field', rate=1)]
+
+        with qtbot.waitSignal(manager.optimized, timeout=5000) as blocker:
+            manager.optimize_queue(costs, wait=False)
+        assert blocker.args == [5., 3.]
+        assert list(manager.experiments) == [experiments[i] for i in (0, 2, 1, 3)]
+        manager.browser.reorder.assert_called_once_with(list(manager.experiments))
+        assert manager.optimize_queue(costs) == (3., 3.)
@@ -0,0 +1,69 @@
+#
+# This file is part of the PyMeasure package.
+#
+# Copyright (c) 2013-2017 PyMeasure Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+
+from unittest import mock
+
+import numpy as np
+
+from pymeasure.experiment import Procedure
+from pymeasure.experiment.adaptive import Adaptive1D, Adaptive2D
+
+
+def test_adaptive_1d_refines_step():
+    sampler = Adaptive1D('x', (0, 1), 'y', initial=10, budget=60)
+    for point in sampler:
+        sampler.tell(point, np.tanh((point['x'] - 0.3) * 200))
+    x = np.array(sampler.x)
+    assert len(x) == 60
+    # Half of the points resolve the step, which spans 5% of the range
+    assert np.sum(np.abs(x - 0.3) < 0.05) > 25
+
+
+def test_adaptive_1d_stops_at_tolerance():
+    sampler = Adaptive1D('x', (0, 1), 'y', budget=1000, tolerance=0.05)
+    for point in sampler:
+        sampler.tell(point, point['x'] ** 2)
+    assert 10 < len(sampler.x) < 100
+
+
+def test_adaptive_2d_refines_peak():
+    sampler = Adaptive2D(('x', 'y'), ((-1, 1), (-1, 1)), 'z', budget=200)
+    for point in sampler:
+        sampler.tell(point, np.exp(-((point['x'] - 0.5) ** 2 + point['y'] ** 2) / 0.01))
+    points = np.array(list(sampler.values))
+    assert len(points) == 200
+    assert np.sum(np.hypot(points[:, 0] - 0.5, points[:, 1]) < 0.25) > 50
+
+
+def test_attached_sampler_is_fed_by_emit():
+    procedure = Procedure()
+    emit = procedure.emit = mock.MagicMock()
+    procedure.should_stop = mock.MagicMock(return_value=False)
+    sampler = Adaptive1D('x', (0, 1), 'y', initial=3, budget=5)
+    sampler.attach(procedure)
+    for point in procedure.sweep(sampler):
+        procedure.emit('results', {'x': point['x'], 'y': point['x'] ** 2})
+    assert len(sampler.x) == 5
+    assert not sampler.pending
+    emit.assert_called_with('progress', 100.)
@@ -0,0 +1,76 @@
+#
+# This file is part of the PyMeasure package.
+#
+# Copyright (c) 2013-2017 PyMeasure Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+
+import numpy as np
+import pandas as pd
+
+from pymeasure.experiment.analysis import Derived, FrameBuffer, Rolling, Pipeline
+
+
+def make_pipeline():
+    return Pipeline(
+        Derived('R', lambda data: data['V'] / data['I']),
+        Rolling('R', window=3)
+    )
+
+
+def test_pipeline_blocks_match_full_analysis():
+    data = pd.DataFrame({'V': np.arange(10.), 'I': np.full(10, 2.)})
+    full = make_pipeline()(data.copy())
+
+    pipeline = make_pipeline()
+    blocks = [pipeline(data.iloc[a:b].copy()) for a, b in [(0, 1), (1, 5), (5, 10)]]
+    incremental = pd.concat(blocks, ignore_index=True)
+    assert np.allclose(incremental['R mean'], full['R mean'])
+    assert np.allclose(full['R mean'].iloc[3:], np.arange(2, 9) / 2.)
+
+
+def test_pipeline_update_only_analyses_new_rows():
+    calls = []
+    pipeline = Pipeline(Derived('x2', lambda data: calls.append(len(data)) or 2 * data['x']))
+    pipeline.update(pd.DataFrame({'x': [1, 2]}))
+    data = pipeline.update(pd.DataFrame({'x': [1, 2, 3]}))
+    assert calls == [2, 1]
+    assert list(data['x2']) == [2, 4, 6]
+
+    data = pipeline.update(pd.DataFrame({'x': [5]}))  # Replaced data
+    assert list(data['x2']) == [10]
+
+
+def test_frame_buffer_appends_blocks():
+    buffer = FrameBuffer(capacity=2)
+    buffer.append(pd.DataFrame({'x': [1, 2], 'name': ['a', 'b']}))
+    buffer.append(pd.DataFrame({'x': [2.5], 'name': ['c']}))  # Grows and casts
+    frame = buffer.frame
+    assert list(frame['x']) == [1, 2, 2.5]
+    assert frame['x'].dtype == np.float64
+    assert frame['name'].dtype == pd.DataFrame({'name': ['a']})['name'].dtype
+    assert list(frame.index) == [0, 1, 2]
+    assert list(buffer.tail(2)['name']) == ['c']
+
+    buffer.append(pd.DataFrame({'x': [4.], 'name': ['d'], 'y': [1.]}))
+    assert list(buffer.frame.columns) == ['x', 'name', 'y']
+    assert len(buffer) == 4
+    buffer.clear()
+    assert buffer.frame.empty
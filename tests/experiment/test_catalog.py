@@ -0,0 +1,109 @@
+#
+# This file is part of the PyMeasure package.
+#
+# Copyright (c) 2013-2017 PyMeasure Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+
+import os
+from queue import Queue
+
+from pymeasure.experiment.catalog import Catalog
+from pymeasure.experiment.listeners import Recorder
+from pymeasure.experiment.procedure import Procedure
+from pymeasure.experiment.results import Results
+
+from data.procedure_for_testing import RandomProcedure
+
+
+def write_results(directory, name, rows, **parameters):
+    procedure = RandomProcedure()
+    for key, value in parameters.items():
+        setattr(procedure, key, value)
+    results = Results(procedure, os.path.join(directory, name))
+    with open(results.data_filename, 'a') as f:
+        for i in range(rows):
+            f.write(results.format({'Iteration': i, 'Random Number': 0.5}))
+            f.write(Results.LINE_BREAK)
+    return results
+
+
+def test_scan_and_find(tmpdir):
+    directory = str(tmpdir)
+    for i, delay in enumerate([0.5, 2, 5]):
+        write_results(directory, 'DATA_%d.csv' % i, rows=i + 1, delay=delay, iterations=10 * i)
+    catalog = Catalog()
+    assert catalog.scan(directory) == 3
+    assert catalog.scan(directory) == 0  # Nothing changed
+    assert len(catalog) == 3
+
+    names = lambda filenames: [os.path.basename(f) for f in filenames]
+    assert names(catalog.find('RandomProcedure')) == ['DATA_0.csv', 'DATA_1.csv', 'DATA_2.csv']
+    assert catalog.find('IVProcedure') == []
+    assert names(catalog.find(where={'Delay Time': ('<', 4)})) == ['DATA_0.csv', 'DATA_1.csv']
+    assert names(catalog.find(where={'Delay Time': ('>=', 2), 'Loop Iterations': 20})) == [
+        'DATA_2.csv']
+    assert names(catalog.find(where={'Random Seed': '12345'})) == names(catalog.find())
+
+    filename = os.path.join(directory, 'DATA_2.csv')
+    assert catalog.info(filename)['rows'] == 3
+    assert catalog.info(filename)['size'] == os.path.getsize(filename)
+    assert catalog.parameters(filename)['Delay Time'] == ('5', 's')
+
+    os.remove(filename)
+    catalog.scan(directory)
+    assert filename not in catalog
+
+
+def test_recorder_updates_catalog(tmpdir):
+    catalog = Catalog(str(tmpdir.join('catalog.db')))
+    results = Results(RandomProcedure(), str(tmpdir.join('DATA.csv')))
+    results.procedure.status = Procedure.RUNNING
+    recorder = Recorder(results, Queue(), catalog=catalog, interval=60)
+    assert catalog.info(results.data_filename)['status'] == Procedure.RUNNING
+
+    for i in range(5):
+        recorder.handle({'Iteration': i, 'Random Number': 0.5})
+    results.procedure.status = Procedure.FINISHED
+    recorder.enqueue_sentinel()
+    assert recorder.dequeue(True) is None
+    for handler in recorder.handlers:
+        handler.close()
+
+    info = catalog.info(results.data_filename)
+    assert info['status'] == Procedure.FINISHED
+    assert info['rows'] == 5
+    assert info['size'] == os.path.getsize(results.data_filename)
+    assert catalog.find(status=Procedure.FINISHED) == [results.data_filename]
+
+
+def test_catalog_updates_keep_compressed_records_buffered(tmpdir):
+    catalog = Catalog(str(tmpdir.join('catalog.db')))
+    results = Results(RandomProcedure(), str(tmpdir.join('DATA.csv.gz')))
+    recorder = Recorder(results, Queue(), catalog=catalog, interval=60)
+    size = os.path.getsize(results.data_filename)
+    for i in range(5):
+        recorder.handle({'Iteration': i, 'Random Number': 0.5})
+    recorder.update_catalog()
+    assert catalog.info(results.data_filename)['rows'] == 5
+    assert os.path.getsize(results.data_filename) == size  # Still buffered
+    for handler in recorder.handlers:
+        handler.close()
+    assert len(Results.load(results.data_filename).data) == 5
@@ -0,0 +1,106 @@
+#
+# This file is part of the PyMeasure package.
+#
+# Copyright (c) 2013-2017 PyMeasure Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+
+import gzip
+import logging
+import os
+import time
+from queue import Queue
+
+from pymeasure.experiment.compression import CompressedFileHandler, MemberReader, \
+    compress_member, open_data
+from pymeasure.experiment.listeners import Recorder
+from pymeasure.experiment.results import Results
+
+from data.procedure_for_testing import RandomProcedure
+
+
+def record(results, rows, start=0):
+    recorder = Recorder(results, Queue())
+    for handler in recorder.handlers:
+        handler.rows = 10
+    for i in range(start, start + rows):
+        recorder.handle({'Iteration': i, 'Random Number': 0.5})
+    recorder.enqueue_sentinel()
+    recorder.dequeue(True)
+
+
+def test_compressed_results(tmpdir):
+    filename = str(tmpdir.join('DATA.csv.gz'))
+    results = Results(RandomProcedure(), filename)
+    record(results, 25)
+    with open(filename, 'rb') as f:
+        assert f.read(2) == b'\x1f\x8b'
+
+    loaded = Results.load(filename)
+    assert loaded.procedure.iterations == 100
+    assert list(loaded.data['Iteration']) == list(range(25))
+    record(results, 5, start=25)  # Read incrementally from the last member
+    assert list(loaded.data['Iteration']) == list(range(30))
+    assert [len(chunk) for chunk in loaded.chunks(20)] == [20, 10]
+    assert len(loaded.sample(max_rows=8)) <= 8
+
+
+def test_torn_member_is_skipped(tmpdir):
+    filename = str(tmpdir.join('DATA.csv.gz'))
+    results = Results(RandomProcedure(), filename)
+    record(results, 20)
+    size = os.path.getsize(filename)
+    record(results, 10, start=20)
+    with open(filename, 'r+b') as f:
+        f.truncate(size + (os.path.getsize(filename) - size) // 2)
+
+    assert list(Results.load(filename).data['Iteration']) == list(range(20))
+    with open_data(filename) as f:
+        assert f.read().count(b'\n') == results._header_count + 21
+
+
+def test_slow_records_are_written_in_large_members(tmpdir):
+    filename = str(tmpdir.join('DATA.csv.gz'))
+    handler = CompressedFileHandler(filename, interval=0.01, member_size=200, max_delay=0.2)
+    handler.setFormatter(logging.Formatter('%(msg)s'))
+    for i in range(40):
+        handler.handle(logging.makeLogRecord({'msg': '%d,0.123456' % i}))
+        time.sleep(0.002)
+    time.sleep(0.3)  # The last records are written by the timer
+    reader = MemberReader(filename)
+    members = []
+    while True:
+        member = reader.read_member()
+        if member is None:
+            break
+        members.append(member)
+    reader.close()
+    handler.close()
+    assert b''.join(members).count(b'\n') == 40
+    assert all(len(member) >= 200 for member in members[:-1])
+    assert len(members) < 10
+
+
+def test_compress_member():
+    for level in (0, 6):
+        member = compress_member(b"1,0.5\n", level)
+        assert member[:4] == b'\x1f\x8b\x08\x00'  # No file name or other fields
+        assert member[4:8] == b'\x00' * 4  # No modification time
+        assert gzip.decompress(member) == b"1,0.5\n"
@@ -0,0 +1,85 @@
+#
+# This file is part of the PyMeasure package.
+#
+# Copyright (c) 2013-2017 PyMeasure Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+
+import os
+
+from pymeasure.experiment.catalog import Catalog
+from pymeasure.experiment.dataset import Dataset
+from pymeasure.experiment.results import Results
+
+from data.procedure_for_testing import RandomProcedure
+
+
+def write_runs(directory):
+    for i, delay in enumerate([0.5, 2, 5]):
+        procedure = RandomProcedure()
+        procedure.delay = delay
+        results = Results(procedure, os.path.join(directory, 'DATA_%d.csv' % i))
+        with open(results.data_filename, 'a') as f:
+            for j in range(10):
+                f.write(results.format({'Iteration': j, 'Random Number': i + j / 10.}))
+                f.write(Results.LINE_BREAK)
+
+
+def test_read_selected_runs(tmpdir):
+    write_runs(str(tmpdir))
+    dataset = Dataset(str(tmpdir.join('*.csv')), threads=2)
+    assert len(dataset) == 3
+
+    selected = dataset.select('RandomProcedure', where={'Delay Time': ('>', 1)})
+    assert [os.path.basename(f) for f in selected] == ['DATA_1.csv', 'DATA_2.csv']
+    assert len(dataset.select(where={'Delay Time': 1})) == 0
+
+    data = selected.read(columns=['Random Number'], rows=(2, 5), parameters=['Delay Time'])
+    assert list(data.columns) == ['Random Number', 'Delay Time', Dataset.RUN]
+    assert len(data) == 6
+    assert list(data['Random Number'][:3]) == [1.2, 1.3, 1.4]
+    assert list(data['Delay Time'].unique()) == [2, 5]
+    assert list(data[Dataset.RUN].unique()) == ['DATA_1.csv', 'DATA_2.csv']
+
+
+def test_select_with_catalog(tmpdir):
+    write_runs(str(tmpdir))
+    catalog = Catalog()
+    catalog.scan(str(tmpdir))
+    dataset = Dataset(str(tmpdir.join('*.csv')), catalog=catalog)
+    selected = dataset.select(where={'Delay Time': ('<', 4)})
+    assert len(selected) == 2
+    data = selected.read()
+    assert len(data) == 20
+    assert set(data.columns) >= {'Iteration', 'Random Number', 'Loop Iterations', 'Random Seed'}
+    assert len(Dataset([]).read(columns=['Iteration'])) == 0
+
+
+def test_read_run_does_not_load_results(tmpdir, monkeypatch):
+    write_runs(str(tmpdir))
+    dataset = Dataset(str(tmpdir.join('*.csv')))
+
+    def load(*args, **kwargs):
+        raise AssertionError("Results.load should not be called")
+
+    monkeypatch.setattr(Results, 'load', load)
+    data = dataset.read(columns=['Iteration'], rows=(8, None))
+    assert list(data['Iteration']) == [8, 9] * 3
+    assert dataset.procedure_class(dataset.filenames[0]) is RandomProcedure
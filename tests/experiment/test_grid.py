@@ -0,0 +1,43 @@
+#
+# This file is part of the PyMeasure package.
+#
+# Copyright (c) 2013-2017 PyMeasure Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+
+import numpy as np
+
+from pymeasure.experiment.grid import BinnedGrid
+
+
+def test_binned_grid_averages_points_in_pixels():
+    grid = BinnedGrid((0, 1), (0, 10), shape=(4, 2))
+    grid.add([0.1, 0.2, 1.0, 0.9], [1, 2, 10, 9], [1, 3, 5, 7])
+    assert grid.values[0, 0] == 2
+    assert grid.values[3, 1] == 6
+    assert np.isnan(grid.values[1, 0])
+    assert grid.levels == (2, 6)
+
+
+def test_binned_grid_ignores_points_outside():
+    grid = BinnedGrid((0, 1), (0, 1), shape=(2, 2))
+    grid.add([-0.1, 1.1, 0.5], [0.5, 0.5, 0.5], [1, 1, np.nan])
+    assert np.all(np.isnan(grid.values))
+    assert grid.levels is None
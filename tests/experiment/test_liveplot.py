@@ -0,0 +1,84 @@
+#
+# This file is part of the PyMeasure package.
+#
+# Copyright (c) 2013-2017 PyMeasure Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from pymeasure.experiment.liveplot import LiveLine, LivePlot
+
+
+def mock_line(supports_blit=True):
+    figure = mock.MagicMock()
+    figure.canvas.supports_blit = supports_blit
+    ax = mock.MagicMock()
+    ax.get_figure.return_value = figure
+    ax.get_xlim.return_value = (0, 1)
+    ax.get_ylim.return_value = (0, 1)
+    figure.axes = [ax]
+    line = mock.MagicMock()
+    line.axes = ax
+    return line
+
+
+def test_live_line_appends_to_buffer():
+    line = mock_line()
+    live_line = LiveLine(line, 'x', 'y', capacity=2)
+    live_line.append(pd.DataFrame({'x': [0, 1, 2], 'y': [3, 4, 5]}))
+    live_line.append(pd.DataFrame({'x': [3], 'y': [np.nan]}))
+    x, y = line.set_data.call_args[0]
+    assert list(x) == [0, 1, 2, 3]
+    assert len(live_line) == 4
+    assert live_line.limits == (0, 3, 3, 5)
+
+
+def test_live_plot_blits_until_limits_are_exceeded():
+    line = mock_line()
+    ax, canvas = line.axes, line.axes.get_figure().canvas
+    live_plot = LivePlot(fps=1000)
+    live_plot.add_line(LiveLine(line, 'x', 'y'))
+    line.set_animated.assert_called_with(True)
+
+    assert live_plot.draw(force=True)
+    assert canvas.draw.call_count == 1  # The background is drawn once
+
+    live_plot.append(pd.DataFrame({'x': [0.5], 'y': [0.5]}))
+    live_plot.draw(force=True)
+    assert canvas.draw.call_count == 1
+    assert canvas.blit.call_count == 2
+    ax.draw_artist.assert_called_with(line)
+
+    live_plot.append(pd.DataFrame({'x': [2.], 'y': [0.5]}))
+    ax.set_xlim.assert_called_with(0, 2.375)  # With a margin of the range
+    live_plot.draw(force=True)
+    assert canvas.draw.call_count == 2
+
+
+def test_live_plot_limits_frame_rate():
+    live_plot = LivePlot(fps=0.01)
+    live_plot.add_line(LiveLine(mock_line(), 'x', 'y'))
+    assert live_plot.draw()
+    assert not live_plot.draw()
+    assert live_plot.time_to_next_frame() > 0
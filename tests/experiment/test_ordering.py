@@ -0,0 +1,74 @@
+#
+# This file is part of the PyMeasure package.
+#
+# Copyright (c) 2013-2017 PyMeasure Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+
+import random
+
+from pymeasure.experiment.ordering import ParameterCost, optimize_order, path_time
+
+
+def test_order_reduces_transition_time():
+    random.seed(1)
+    costs = [ParameterCost('field', rate=0.1, settle=1), ParameterCost('angle', rate=10)]
+    points = [{'field': random.uniform(-1, 1), 'angle': random.uniform(0, 90)}
+              for i in range(30)]
+    order = optimize_order(points, costs)
+    assert sorted(order) == list(range(30))
+    ordered = [points[i] for i in order]
+    assert path_time(costs, ordered) < 0.5 * path_time(costs, points)
+
+
+def test_order_respects_direction():
+    costs = [ParameterCost('temperature', rate=1, direction='decreasing'),
+             ParameterCost('field', rate=1)]
+    points = [{'temperature': t, 'field': f} for f in (1, -1, 0) for t in (4, 300, 10)]
+    ordered = [points[i] for i in optimize_order(points, costs, start={'field': 0})]
+    temperatures = [point['temperature'] for point in ordered]
+    assert temperatures == sorted(temperatures, reverse=True)
+    assert [point['field'] for point in ordered[:3]] == [0, -1, 1] or \
+        [point['field'] for point in ordered[:3]] == [0, 1, -1]
+
+
+def test_order_starts_from_current_group():
+    costs = [ParameterCost('temperature', rate=1, direction='increasing')]
+    points = [{'temperature': t} for t in (4, 10, 300, 77)]
+    ordered = [points[i] for i in optimize_order(points, costs, start={'temperature': 50})]
+    assert [point['temperature'] for point in ordered] == [77, 300, 4, 10]
+
+
+def test_order_of_many_points_is_fast():
+    random.seed(2)
+    costs = [ParameterCost('field', rate=0.1, settle=1), ParameterCost('angle', rate=10)]
+    points = [{'field': random.uniform(-1, 1), 'angle': random.uniform(0, 90)}
+              for i in range(2000)]
+    order = optimize_order(points, costs, time_limit=0.5)
+    assert sorted(order) == list(range(2000))
+    ordered = [points[i] for i in order]
+    assert path_time(costs, ordered) < 0.2 * path_time(costs, points)
+
+
+def test_parameter_cost():
+    cost = ParameterCost('field', rate=0.5, settle=2)
+    assert cost.time(0, 1) == 4
+    assert cost.time(1, 1) == 0
+    assert cost.time(None, 1) == 0
@@ -22,11 +22,12 @@
 # THE SOFTWARE.
 #
 
+import os
 import pytest
 import pickle
 
-from pymeasure.experiment.procedure import Procedure, ProcedureWrapper
-from pymeasure.experiment.parameters import Parameter
+from pymeasure.experiment.procedure import Procedure, ProcedureWrapper, load_module
+from pymeasure.experiment.parameters import Parameter, Measurable
 
 from data.procedure_for_testing import RandomProcedure
 
@@ -44,7 +45,39 @@ def test_parameters():
     assert 'x' in objs
     assert objs['x'].value == p.x
 
-# TODO: Add tests for measureables
+
+def test_parameters_are_copied_per_instance():
+    class TestProcedure(Procedure):
+        x = Parameter('X', default=5)
+
+    first, second = TestProcedure(), TestProcedure()
+    assert '_cached_schema' in TestProcedure.__dict__
+    first.set_parameters({'x': 7})
+    assert first.parameter_objects()['x'].value == 7
+    assert second.parameter_objects()['x'].value == 5
+    assert TestProcedure.x.value == 5
+
+    class SubProcedure(TestProcedure):
+        y = Parameter('Y', default=1)
+
+    assert set(SubProcedure().parameter_values()) == {'x', 'y'}
+    assert set(TestProcedure().parameter_values()) == {'x'}
+
+
+def test_measurables_are_registered_per_class():
+    class FirstProcedure(Procedure):
+        voltage = Measurable('Voltage (V)', units='V', dtype='float32')
+        current = Measurable('Current (A)', units='A')
+        setting = Measurable('Setting', measure=False)
+
+    class SecondProcedure(Procedure):
+        field = Measurable('Field (T)')
+
+    assert FirstProcedure().DATA_COLUMNS == ['Voltage (V)', 'Current (A)']
+    assert SecondProcedure().DATA_COLUMNS == ['Field (T)']
+    assert FirstProcedure.measurables()['Voltage (V)'].units == 'V'
+    assert FirstProcedure.column_dtypes() == {'Voltage (V)': 'float32'}
+    assert not hasattr(Measurable, 'DATA_COLUMNS')
 
 def test_procedure_wrapper():
     assert RandomProcedure.iterations.value == 100
@@ -55,4 +88,30 @@ def test_procedure_wrapper():
     new_wrapper = pickle.loads(pickle.dumps(wrapper))
     assert hasattr(new_wrapper, 'procedure')
     assert new_wrapper.procedure.iterations == 101
-    assert RandomProcedure.iterations.value == 100
\ No newline at end of file
+    assert RandomProcedure.iterations.value == 100
+
+
+def test_load_module_is_cached(tmpdir):
+    filename = str(tmpdir.join('counted_procedure.py'))
+    with open(filename, 'w') as f:
+        f.write("import builtins\n"
+                "builtins.executions = getattr(builtins, 'executions', 0) + 1\n")
+    import builtins
+    first = load_module('counted_procedure', filename)
+    assert load_module('counted_procedure', filename) is first
+    assert builtins.executions == 1
+
+    stat = os.stat(filename)  # The module is loaded again once it changes
+    os.utime(filename, (stat.st_atime, stat.st_mtime + 10))
+    load_module('counted_procedure', filename)
+    assert builtins.executions == 2
+    del builtins.executions
+
+
+def test_procedure_wrapper_state():
+    procedure = RandomProcedure()
+    procedure.iterations = 42
+    state = ProcedureWrapper(procedure).__getstate__()
+    name, filename, class_name, parameters = state['procedure']
+    assert class_name == 'RandomProcedure'
+    assert parameters['iterations'] == 42
@@ -31,8 +31,9 @@ import pickle
 from importlib.machinery import SourceFileLoader
 import pandas as pd
 
-from pymeasure.experiment.results import Results, CSVFormatter
+from pymeasure.experiment.results import Results, CSVFormatter, unique_filename
 from pymeasure.experiment.procedure import Procedure
+from pymeasure.experiment.parameters import Measurable
 
 # Load the procedure, without it being in a module
 #data_path = os.path.join(os.path.dirname(__file__), 'data/procedure_for_testing.py')
@@ -74,12 +75,23 @@ def test_procedure_wrapper():
     assert hasattr(new_results, 'procedure')
     assert new_results.procedure.iterations == 101
     assert RandomProcedure.iterations.value == 100
+    assert type(new_results.procedure) is RandomProcedure  # The module is not loaded again
+
+
+def test_pickle_does_not_include_data(tmpdir):
+    results = Results(RandomProcedure(), str(tmpdir.join('DATA.csv')))
+    with open(results.data_filename, 'a') as f:
+        f.write("1,0.5\n")
+    assert len(results.data) == 1
+    state = results.__getstate__()
+    assert state['_data'] is None and 'parameters' not in state
+    assert len(pickle.loads(pickle.dumps(results)).data) == 1
 
 
 class TestResults:
     # TODO: add a full set of Results tests
 
-    @mock.patch('pymeasure.experiment.results.open', mock.mock_open(), create=True)
+    @mock.patch('pymeasure.experiment.compression.open', mock.mock_open(), create=True)
     @mock.patch('os.path.exists', return_value=True)
     @mock.patch('pymeasure.experiment.results.pd.read_csv')
     def test_regression_attr_data_when_up_to_date_should_retain_dtype(self,
@@ -101,3 +113,122 @@ class TestResults:
 
         assert second_data.iloc[:,0].dtype is not object
         assert first_data.iloc[:,0].dtype is second_data.iloc[:,0].dtype
+
+
+def test_results_set_data_offset():
+    procedure = RandomProcedure()
+    file = tempfile.mktemp()
+    results = Results(procedure, file)
+    with open(file, 'a') as f:
+        f.write(results.format({'Iteration': 0, 'Random Number': 0.5}))
+        f.write(Results.LINE_BREAK)
+    loaded = Results.load(file)
+    data = pd.DataFrame({'Iteration': [0], 'Random Number': [0.5]})
+    loaded.set_data(data, os.path.getsize(file))
+    with open(file, 'a') as f:
+        f.write(results.format({'Iteration': 1, 'Random Number': 0.25}))
+        f.write(Results.LINE_BREAK)
+    with mock.patch('pandas.read_csv', wraps=pd.read_csv) as read_csv:
+        assert list(loaded.data['Iteration']) == [0, 1]
+    assert read_csv.call_count == 1  # Only the new row is parsed
+
+
+def test_results_sample_is_bounded():
+    procedure = RandomProcedure()
+    file = tempfile.mktemp()
+    results = Results(procedure, file)
+    with open(file, 'a') as f:
+        for i in range(1000):
+            f.write(results.format({'Iteration': i, 'Random Number': 0.5}))
+            f.write(Results.LINE_BREAK)
+
+    sample = Results.load(file).sample(max_rows=100, blocks=4)
+    assert list(sample.columns) == RandomProcedure.DATA_COLUMNS
+    assert 0 < len(sample) <= 100
+    assert sample['Iteration'].is_monotonic_increasing
+    assert sample['Iteration'].iloc[-1] > 500  # Spans the whole file
+
+    full = Results.load(file).sample(max_rows=2000)
+    assert len(full) == 1000
+
+
+def test_empty_data_has_declared_dtypes():
+    class TypedProcedure(Procedure):
+        DATA_COLUMNS = ['x', 'y']
+        x = Measurable('x', dtype='float32')
+
+    results = Results(TypedProcedure(), tempfile.mktemp())
+    data = results.data
+    assert list(data.columns) == ['x', 'y']
+    assert data['x'].dtype == 'float32'
+
+
+def test_data_is_read_with_declared_dtypes():
+    class TypedProcedure(Procedure):
+        DATA_COLUMNS = ['t', 'x', 'n', 'state']
+        DATA_TYPES = {'t': 'timestamp', 'x': 'float32', 'n': 'int', 'state': 'category'}
+
+    file = tempfile.mktemp()
+    results = Results(TypedProcedure(), file)
+    with open(file, 'a') as f:
+        f.write("2017-01-01 10:00:00,1.5,1,on\n")
+    assert results.data['state'].dtype == 'category'
+    with open(file, 'a') as f:
+        f.write("2017-01-01 10:00:01,2.5,2,off\n")
+    data = results.data
+    assert len(data) == 2
+    assert data['t'].dtype.kind == 'M'
+    assert data['x'].dtype == 'float32'
+    assert data['n'].dtype == 'int64'
+    assert data['state'].dtype == 'category'
+    assert list(results.sample().dtypes) == list(data.dtypes)
+
+
+def test_unique_filename_counts_up(tmpdir):
+    directory = str(tmpdir)
+    for i in (1, 2, 4):
+        open(os.path.join(directory, 'DATA_%d.csv' % i), 'w').close()
+    first = unique_filename(directory, prefix='DATA', datetimeformat='')
+    assert os.path.basename(first) == 'DATA_3.csv'
+    # The same name is returned until the file is created
+    assert unique_filename(directory, prefix='DATA', datetimeformat='') == first
+    open(first, 'w').close()
+    second = unique_filename(directory, prefix='DATA', datetimeformat='')
+    assert os.path.basename(second) == 'DATA_5.csv'
+    open(os.path.join(directory, 'DATA_5.csv'), 'w').close()  # Written elsewhere
+    assert os.path.basename(unique_filename(directory, prefix='DATA', datetimeformat='')) == \
+        'DATA_6.csv'
+
+
+def test_results_chunks():
+    procedure = RandomProcedure()
+    file = tempfile.mktemp()
+    results = Results(procedure, file)
+    with open(file, 'a') as f:
+        for i in range(25):
+            f.write(results.format({'Iteration': i, 'Random Number': 0.5}))
+            f.write(Results.LINE_BREAK)
+
+    chunks = list(results.chunks(10))
+    assert [len(chunk) for chunk in chunks] == [10, 10, 5]
+    assert list(chunks[-1]['Iteration']) == list(range(20, 25))
+    chunks = list(results.chunks(100, columns=['Random Number']))
+    assert list(chunks[0].columns) == ['Random Number']
+
+
+def test_results_chunks_follow():
+    procedure = RandomProcedure()
+    file = tempfile.mktemp()
+    results = Results(procedure, file)
+    fragments = ["0,0.5\n1,", "0.5\n2,0.5\n3,", "0.5\n4,0.5\n"]
+
+    def write():
+        # Appends rows that are torn between writes
+        with open(file, 'a') as f:
+            f.write(fragments.pop(0))
+        return not fragments
+
+    rows = []
+    for chunk in results.chunks(follow=True, interval=0.001, should_stop=write):
+        rows.extend(chunk['Iteration'])
+    assert rows == [0, 1, 2, 3, 4]
@@ -0,0 +1,112 @@
+#
+# This file is part of the PyMeasure package.
+#
+# Copyright (c) 2013-2017 PyMeasure Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+
+from queue import Queue
+from unittest import mock
+
+import pytest
+
+from pymeasure.experiment.adaptive import Adaptive1D
+from pymeasure.experiment.listeners import Recorder
+from pymeasure.experiment.procedure import Procedure
+from pymeasure.experiment.results import Results
+from pymeasure.experiment.sweeps import Sweep
+
+from data.procedure_for_testing import RandomProcedure
+
+
+def interrupted_run(filename):
+    """ Records three complete points and part of a fourth, as if the
+    process stopped in the middle of writing a row
+    """
+    results = Results(RandomProcedure(), filename)
+    recorder = Recorder(results, Queue(), checkpoint_interval=0)
+    for handler in recorder.handlers:
+        handler.rows = 1  # Write each row of a compressed file at once
+    results.procedure.status = Procedure.RUNNING
+    recorder.update('status', Procedure.RUNNING)
+    for point in range(4):
+        for i in range(2):
+            recorder.handle({'Iteration': 2 * point + i, 'Random Number': 0.5})
+        if point < 3:
+            recorder.update('point', point + 1)
+    recorder.sync()
+    with open(filename, 'ab') as f:
+        f.write(b'8,0.')  # A torn row, or a torn member of a compressed file
+    return results
+
+
+@pytest.mark.parametrize('name', ['DATA.csv', 'DATA.csv.gz'])
+def test_interrupted_run_is_read_and_resumed(tmpdir, name):
+    filename = str(tmpdir.join(name))
+    interrupted_run(filename)
+
+    results = Results.load(filename)
+    assert results.procedure.status == Procedure.RUNNING
+    assert list(results.data['Iteration']) == list(range(8))
+
+    checkpoint = results.resume()
+    assert checkpoint['point'] == 3
+    assert checkpoint['rows'] == 6
+    assert list(results.data['Iteration']) == list(range(6))
+    assert results.procedure.resume_point == 3
+
+    procedure = results.procedure
+    procedure.emit = mock.MagicMock()
+    procedure.should_stop = mock.MagicMock(return_value=False)
+    assert list(procedure.sweep(Sweep('a', [1, 2, 3, 4, 5]))) == [{'a': 4}, {'a': 5}]
+    procedure.emit.assert_any_call('point', 5)
+
+    recorder = Recorder(results, Queue())
+    assert recorder.rows == 6
+    recorder.handle({'Iteration': 6, 'Random Number': 0.5})
+    results.procedure.status = Procedure.FINISHED
+    recorder.update('status', Procedure.FINISHED)
+    assert list(Results.load(filename).data['Iteration']) == list(range(7))
+    assert Results.load(filename).procedure.status == Procedure.FINISHED
+
+
+def test_resumed_sampler_sweep(tmpdir):
+    filename = str(tmpdir.join('DATA.csv'))
+    interrupted_run(filename)
+    results = Results.load(filename)
+    results.resume()
+
+    procedure = results.procedure
+    procedure.emit = mock.MagicMock()
+    procedure.should_stop = mock.MagicMock(return_value=False)
+    sampler = Adaptive1D('x', (0, 4), 'y', initial=5, budget=5, settle=0.01)
+    with mock.patch('time.sleep') as sleep:
+        assert list(procedure.sweep(sampler)) == [{'x': 3.}, {'x': 4.}]
+    assert sleep.called  # Settles before the first point after the resume
+    procedure.emit.assert_any_call('point', 5)
+
+
+def test_results_without_checkpoint_are_finished(tmpdir):
+    filename = str(tmpdir.join('DATA.csv'))
+    Results(RandomProcedure(), filename)
+    results = Results.load(filename)
+    assert results.procedure.status == Procedure.FINISHED
+    with pytest.raises(ValueError):
+        results.resume()
@@ -0,0 +1,109 @@
+#
+# This file is part of the PyMeasure package.
+#
+# Copyright (c) 2013-2017 PyMeasure Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+
+import os
+
+import numpy as np
+
+from pymeasure.experiment import Procedure
+from pymeasure.experiment.results import Results
+from pymeasure.experiment.rowindex import MappedReader, RowIndex
+
+from data.procedure_for_testing import RandomProcedure
+
+
+def write_results(tmpdir, rows):
+    filename = str(tmpdir.join('DATA.csv'))
+    results = Results(RandomProcedure(), filename)
+    with open(filename, 'a') as f:
+        for i in range(rows):
+            f.write("%d,%f\n" % (i, i / 10))
+    return results
+
+
+def test_row_index(tmpdir):
+    results = write_results(tmpdir, 5)
+    filename = results.data_filename
+    with open(filename, 'a') as f:
+        f.write("#Checkpoint: rows=5\n\n5,0.5\n6,0.")  # The last row is torn
+    assert len(RowIndex(filename)) == 6
+    assert not os.path.exists(filename + RowIndex.SUFFIX)  # Only kept in memory
+    index = RowIndex(filename, store=True)
+    assert len(index) == 6
+    assert os.path.exists(filename + RowIndex.SUFFIX)
+    with open(filename, 'rb') as f:
+        data = f.read()
+    assert data[index.labels[0]:index.labels[1]] == b"Iteration,Random Number\n"
+    assert data[index.offsets[5]:index.offsets[6]] == b"5,0.5\n"
+
+    assert RowIndex(filename).load()  # The sidecar is used again
+    with open(filename, 'a') as f:
+        f.write("00000\n")
+    assert index.is_stale()
+    assert len(RowIndex(filename, store=True)) == 7  # Rebuilt, since the sidecar is stale
+
+
+def test_mapped_reader(tmpdir):
+    results = write_results(tmpdir, 20)
+    reader = MappedReader(results.data_filename)
+    assert reader.columns == ['Iteration', 'Random Number']
+    assert len(reader) == 20
+    assert list(reader.read(start=5, stop=8)['Iteration']) == [5, 6, 7]
+    assert list(reader.read(['Iteration'], start=-2)['Iteration']) == [18, 19]
+    assert len(reader.read(start=30)) == 0
+
+    column = reader.read(['Random Number'])
+    assert list(column.columns) == ['Random Number']
+    assert 'Random Number' in reader._columns  # Kept for the next read
+
+    with open(results.data_filename, 'a') as f:
+        f.write("20,2.0\n")
+    assert reader.refresh()
+    assert reader._columns == {}
+    assert list(reader.read(['Iteration'])['Iteration']) == list(range(21))
+
+
+def test_results_read(tmpdir):
+    results = write_results(tmpdir, 10)
+    assert results.procedure.status == Procedure.QUEUED  # Still recording
+    assert list(results.read(['Iteration'], 2, 4)['Iteration']) == [2, 3]
+    assert results._reader is None
+
+    loaded = Results.load(results.data_filename)
+    assert loaded.procedure.status == Procedure.FINISHED
+    data = loaded.read(['Random Number'], start=-3)
+    assert list(data['Random Number']) == [0.7, 0.8, 0.9]
+    assert loaded._reader is not None and loaded._data is None
+    assert not os.path.exists(loaded.data_filename + RowIndex.SUFFIX)
+
+    assert len(loaded.data) == 10  # Read in full, so it is used instead
+    assert not loaded._is_mapped()
+
+
+def test_results_read_shares_data(tmpdir):
+    results = write_results(tmpdir, 10)
+    data = results.read(['Random Number'], start=2)
+    assert list(data.columns) == ['Random Number'] and len(data) == 8
+    assert np.shares_memory(data['Random Number'].values,
+                            results.data['Random Number'].values)
@@ -0,0 +1,154 @@
+#
+# This file is part of the PyMeasure package.
+#
+# Copyright (c) 2013-2017 PyMeasure Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+
+import pickle
+from queue import Queue
+
+import pytest
+
+from pymeasure.experiment import sharedbuffer
+from pymeasure.experiment.listeners import Recorder
+from pymeasure.experiment.results import Results
+from pymeasure.experiment.sharedbuffer import RowBuffer, SharedBuffer
+
+from data.procedure_for_testing import RandomProcedure
+
+requires_shared_memory = pytest.mark.skipif(
+    sharedbuffer.shared_memory is None, reason="Shared memory requires Python 3.8")
+
+
+def test_unsupported_shared_memory(monkeypatch):
+    monkeypatch.setattr(sharedbuffer, 'shared_memory', None)
+    with pytest.raises(OSError):
+        SharedBuffer(['x', 'y'], capacity=4)
+
+
+def test_row_buffer_append_and_read():
+    buffer = RowBuffer(['x', 'y'], capacity=4)
+    assert buffer.name is None
+    for i in range(6):
+        buffer.append({'x': i, 'y': 2 * i})
+    values, count = buffer.read(2)  # Wraps around the end
+    assert count == 6 and list(values['y']) == [4, 6, 8, 10]
+    assert buffer.read(1) == (None, 6)  # Overwritten
+    buffer.close()
+
+
+def test_row_buffer_is_not_pickled(tmpdir):
+    filename = str(tmpdir.join('DATA.csv'))
+    results = Results(RandomProcedure(), filename)
+    buffer = RowBuffer(results.procedure.DATA_COLUMNS, capacity=100)
+    results.attach_buffer(buffer)
+    for i in range(3):
+        buffer.append({'Iteration': i, 'Random Number': i / 10})
+    assert len(results.data) == 3
+    copy = pickle.loads(pickle.dumps(results))
+    assert copy.buffer is None and len(copy.data) == 0  # Read from the file
+
+
+@requires_shared_memory
+def test_append_and_read():
+    buffer = SharedBuffer(['x', 'y'], capacity=4)
+    try:
+        values, count = buffer.read()
+        assert count == 0 and len(values['x']) == 0
+        for i in range(3):
+            buffer.append({'x': i, 'y': 2 * i})
+        values, count = buffer.read(1)
+        assert count == 3
+        assert list(values['x']) == [1, 2] and list(values['y']) == [2, 4]
+
+        other = SharedBuffer(name=buffer.name)  # As in another process
+        assert other.columns == ['x', 'y'] and other.capacity == 4
+        for i in range(3, 6):
+            buffer.append({'x': i, 'y': 2 * i})
+        values, count = other.read(2)  # Wraps around the end
+        assert count == 6 and list(values['x']) == [2, 3, 4, 5]
+        assert other.read(1) == (None, 6)  # Overwritten
+        other.close()
+    finally:
+        buffer.close()
+
+
+@requires_shared_memory
+def test_invalid_value():
+    buffer = SharedBuffer(['x'], capacity=4)
+    try:
+        buffer.append({'x': 'text'})
+        assert not buffer.valid
+        buffer.append({'x': 1})
+        assert buffer.count == 0
+    finally:
+        buffer.close()
+
+
+@requires_shared_memory
+def test_results_data_from_buffer(tmpdir):
+    filename = str(tmpdir.join('DATA.csv'))
+    results = Results(RandomProcedure(), filename)
+    buffer = SharedBuffer(results.procedure.DATA_COLUMNS, capacity=100)
+    results.attach_buffer(buffer)
+    try:
+        recorder = Recorder(results, Queue())
+        for i in range(10):
+            record = {'Iteration': i, 'Random Number': i / 10}
+            buffer.append(record)  # Not yet written to the file
+        data = results.data
+        assert list(data['Iteration']) == list(range(10))
+        assert list(data['Random Number']) == [i / 10 for i in range(10)]
+
+        copy = pickle.loads(pickle.dumps(results))
+        assert copy.buffer.name == buffer.name
+        buffer.append({'Iteration': 10, 'Random Number': 1.})
+        assert len(copy.data) == 11
+        copy.buffer.close()
+
+        for i in range(11):
+            recorder.handle({'Iteration': i, 'Random Number': i / 10})
+        recorder.enqueue_sentinel()
+        recorder.dequeue(True)
+        results.detach_buffer()
+        assert results.buffer is None and len(results.data) == 11
+    finally:
+        buffer.close()
+
+
+@requires_shared_memory
+def test_overwritten_rows_are_read_from_file(tmpdir):
+    filename = str(tmpdir.join('DATA.csv'))
+    results = Results(RandomProcedure(), filename)
+    buffer = SharedBuffer(results.procedure.DATA_COLUMNS, capacity=4)
+    results.attach_buffer(buffer)
+    try:
+        recorder = Recorder(results, Queue())
+        for i in range(10):
+            record = {'Iteration': i, 'Random Number': i / 10}
+            recorder.handle(record)
+            buffer.append(record)
+        recorder.enqueue_sentinel()
+        recorder.dequeue(True)
+        assert list(results.data['Iteration']) == list(range(10))
+        assert results.buffer is None
+    finally:
+        buffer.close()
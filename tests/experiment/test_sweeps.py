@@ -0,0 +1,86 @@
+#
+# This file is part of the PyMeasure package.
+#
+# Copyright (c) 2013-2017 PyMeasure Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+
+from unittest import mock
+
+import numpy as np
+import pytest
+
+from pymeasure.experiment import Procedure
+from pymeasure.experiment.experiment import get_array, get_array_steps
+from pymeasure.experiment.sweeps import Sweep, Product, Zip, Hysteresis
+
+
+@pytest.mark.parametrize("start,stop,step", [
+    (0, 1, 0.3), (0, 0.3, 0.1), (1, -1, 0.25), (-2, 3, 0.7), (0, 1, 2), (0.1, 0.7, 0.2)
+])
+def test_linear_sweep_matches_get_array(start, stop, step):
+    values = [v for v, in Sweep.linear('x', start, stop, step)]
+    assert values == list(get_array(start, stop, step))
+    values = [v for v, in Sweep.steps_between('x', start, stop, 7)]
+    assert values == list(get_array_steps(start, stop, 7))
+
+
+def test_linear_sweep_includes_stop():
+    sweep = Sweep.linear('x', 0, 1, 0.25)
+    assert len(sweep) == 5
+    assert [v for v, in sweep] == [0, 0.25, 0.5, 0.75, 1]
+    assert [v for v, in Sweep.linear('x', 1, 0, 0.5)] == [1, 0.5, 0]
+    assert [v for v, in reversed(Sweep.steps_between('x', 0, 1, 2))] == [1, 0.5, 0]
+
+
+def test_snake_product():
+    plan = Product(Sweep('a', [0, 1, 2]), Sweep('b', [0, 1]), snake=True)
+    assert list(plan) == [(0, 0), (0, 1), (1, 1), (1, 0), (2, 0), (2, 1)]
+    assert list(reversed(plan)) == list(plan)[::-1]
+    assert len(plan) == 6
+    assert list(plan.points())[2] == {'a': 1, 'b': 1}
+
+
+def test_zip_and_hysteresis():
+    plan = Hysteresis(Zip(Sweep('a', [0, 1, 2]), Sweep('b', [3, 4, 5])), cycles=2)
+    values = [a for a, b in plan]
+    assert values == [0, 1, 2, 1, 0, 1, 2, 1, 0]
+    assert len(plan) == len(values)
+    with pytest.raises(ValueError):
+        Zip(Sweep('a', [0]), Sweep('b', [0, 1]))
+
+
+def test_settle_times_and_estimate():
+    plan = Product(Sweep('a', [0, 1], settle=10), Sweep('b', [0, 1, 2], settle=1))
+    waits = [wait for point, wait in plan.steps()]
+    assert waits == [10, 1, 1, 10, 1, 1]
+    assert plan.estimate(point_time=0.5) == 24 + 3
+
+
+def test_procedure_sweep_emits_progress():
+    procedure = Procedure()
+    procedure.emit = mock.MagicMock()
+    procedure.should_stop = mock.MagicMock(return_value=False)
+    points = list(procedure.sweep(Sweep('a', [1, 2, 3, 4])))
+    assert points == [{'a': 1}, {'a': 2}, {'a': 3}, {'a': 4}]
+    procedure.emit.assert_called_with('progress', 100.)
+
+    procedure.should_stop.return_value = True
+    assert list(procedure.sweep(Sweep('a', [1, 2]))) == []
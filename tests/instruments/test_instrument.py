@@ -22,6 +22,8 @@
 # THE SOFTWARE.
 #
 
+import asyncio
+
 import pytest
 from pymeasure.instruments.instrument import Instrument, FakeInstrument
 from pymeasure.instruments.validators import strict_discrete_set, strict_range
@@ -179,3 +181,22 @@ def test_setting_process():
     assert fake.read() == 'OUT 0'
     fake.x = 2
     assert fake.read() == 'OUT 1'
+
+
+def test_async_control():
+    class Fake(FakeInstrument):
+        x = Instrument.control(
+            "", "%d", "",
+            validator=strict_discrete_set,
+            values=[4, 5, 6, 7],
+            map_values=True,
+        )
+
+    async def set_and_get(fake):
+        await fake.async_set('x', 6)
+        return await fake.async_get('x')
+
+    fake = Fake()
+    assert asyncio.run(set_and_get(fake)) == 6
+    with pytest.raises(AttributeError):
+        asyncio.run(fake.async_get('id'))
@@ -0,0 +1,83 @@
+#
+# This file is part of the PyMeasure package.
+#
+# Copyright (c) 2013-2017 PyMeasure Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that are slow to import and should only be imported when used
+SLOW = ('pandas', 'pyvisa', 'serial', 'pkg_resources', 'IPython', 'zmq', 'cloudpickle',
+        'matplotlib')
+
+
+def imported(statement):
+    """ Returns the slow modules that are imported by the statement in a
+    new interpreter
+    """
+    code = ("import sys\n"
+            "%s\n"
+            "print(' '.join(sorted(m for m in sys.modules if m.split('.')[0] in %r)))"
+            % (statement, SLOW))
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    output = subprocess.check_output([sys.executable, '-c', code], env=env, cwd=ROOT)
+    modules = output.decode().splitlines()[-1]
+    return {module.split('.')[0] for module in modules.split()}
+
+
+@pytest.mark.parametrize('statement,allowed', [
+    ('import pymeasure.instruments', set()),
+    ('import pymeasure.adapters', set()),
+    ('import pymeasure.experiment', {'pandas'}),
+])
+def test_slow_modules_are_not_imported(statement, allowed):
+    assert imported(statement) <= allowed
+
+
+def test_lazy_attributes():
+    modules = imported(
+        "import pymeasure.instruments\n"
+        "assert pymeasure.instruments.keithley.Keithley2400\n"
+        "from pymeasure.adapters import SerialAdapter\n"
+        "import pymeasure.experiment\n"
+        "assert pymeasure.experiment.get_array(0, 1, 0.5)[-1] == 1")
+    assert 'serial' in modules
+
+
+@pytest.mark.parametrize('statement', [
+    'from pymeasure.adapters import VISAAdapter, SerialAdapter, PrologixAdapter',
+    'from pymeasure.instruments.fwbell import FWBell5080',
+    'from pymeasure.instruments.parker import ParkerGV6',
+    'from pymeasure.instruments.lakeshore import LakeShore425',
+    'from pymeasure.instruments.keithley import Keithley2000, Keithley2400',
+    'from pymeasure.instruments.ami import AMI430',
+    'from pymeasure.experiment import Experiment, get_array',
+])
+def test_import_by_name(statement):
+    # Each statement runs in a new interpreter, where the names are not yet
+    # imported by other tests
+    imported(statement)